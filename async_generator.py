@@ -0,0 +1,423 @@
+"""
+Asyncio API for rendering, compiling and page counting.
+
+Mirrors compile_latex(), get_pdf_page_count() and generate_resume() from
+resume_generator, but runs pdflatex as asyncio subprocesses. An
+event loop can then drive many resumes concurrently without a thread per job. A
+semaphore bounds how many pdflatex passes run at once. Auto-sizing decisions come
+from the same strategy generators as the synchronous CLI. File work that can take
+a while (writing the .tex file, the PDF cache, the sizing memo and the height
+model) runs on the loop's default executor, so it never stalls the other jobs.
+
+Usage:
+    compiler = AsyncResumeCompiler(max_concurrency=16)
+    results = await asyncio.gather(*(
+        compiler.generate_resume(data, template_module, f"build/{i}/resume.tex")
+        for i, data in enumerate(resumes)
+    ))
+"""
+import asyncio
+import functools
+import os
+import shutil
+import signal
+import tempfile
+import time
+from typing import Any, Callable, Dict, Generator, List, Optional, TypeVar, Union
+
+from height_model import HeightModel, extract_features
+from latex_log import parse_latex_log
+from pdf_cache import PdfCache
+from pdf_reader import read_pdf_page_count
+from sizing_memo import SizingMemo
+from templates import Resume, normalize_resume
+from resume_generator import (
+    DEFAULT_INITIAL_PAGE_HEIGHT_INCHES,
+    DEFAULT_JOB_TIMEOUT_SECONDS,
+    DEFAULT_PASS_TIMEOUT_SECONDS,
+    DEFAULT_SIZE_TOLERANCE_INCHES,
+    LATEX_ENGINE,
+    MAX_LATEX_PASSES,
+    MEASURE_PAGE_HEIGHT_INCHES,
+    RESULT_FAILED,
+    RESULT_MULTI_PAGE,
+    RESULT_SUCCESS,
+    RESULT_TIMEOUT,
+    SIZING_BISECT,
+    SIZING_INCREMENTAL,
+    SIZING_MEASURE,
+    SIZING_SPECULATIVE,
+    CompileTimeoutError,
+    copy_candidate_outputs,
+    decide_speculative_winner,
+    get_aux_file_checksums,
+    get_pass_timeout,
+    get_log_page_count,
+    get_tex_version,
+    make_latex_renderer,
+    make_sizing_steps,
+    page_height_from_measurement,
+    read_content_height,
+    report_auto_size_result,
+    sizing_memo_variant,
+    speculative_candidate_heights,
+)
+
+# Default number of pdflatex passes allowed to run at the same time
+DEFAULT_MAX_CONCURRENCY = os.cpu_count() or 4
+
+T = TypeVar("T")
+
+
+async def _run_blocking(func: Callable[..., T], *args: Any) -> T:
+    """Runs a blocking call (file I/O, a subprocess) on the loop's default executor."""
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+
+def _write_text(path: str, content: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+async def _run_process(cmd: List[str], timeout: Optional[float]) -> tuple[int, str, str]:
+    """
+    Runs cmd as an asyncio subprocess in its own process group.
+
+    Raises:
+        asyncio.TimeoutError: If it exceeded timeout. The process group has been killed by then.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        # Also covers cancellation by the caller: never leave a pdflatex running behind us
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+        await process.wait()
+        raise
+    return process.returncode, stdout.decode("utf-8", errors="replace"), stderr.decode("utf-8", errors="replace")
+
+
+class AsyncResumeCompiler:
+    """
+    Renders, compiles and auto-sizes resumes on the running event loop.
+
+    One instance can be shared by any number of concurrent tasks. At most
+    max_concurrency pdflatex passes run at any time.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        fmt_path: Optional[str] = None,
+        pdf_cache: Optional[PdfCache] = None,
+        pass_timeout: Optional[float] = DEFAULT_PASS_TIMEOUT_SECONDS,
+        job_timeout: Optional[float] = DEFAULT_JOB_TIMEOUT_SECONDS,
+        sizing_memo: Optional[SizingMemo] = None,
+        height_model: Optional[HeightModel] = None
+    ):
+        self.max_concurrency = max_concurrency
+        self.fmt_path = fmt_path
+        self.pdf_cache = pdf_cache
+        self.pass_timeout = pass_timeout
+        self.job_timeout = job_timeout
+        self.sizing_memo = sizing_memo
+        self.height_model = height_model
+        # Created on first use, so it belongs to the loop that actually runs the jobs
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def compile_latex(self, tex_filepath: str, deadline: Optional[float] = None) -> bool:
+        """
+        Async counterpart of resume_generator.compile_latex(): same rerun detection,
+        retry and timeout behavior, with each pass holding the concurrency semaphore.
+
+        Raises:
+            CompileTimeoutError: If a pass exceeded its budget (its processes are killed).
+        """
+        output_dir = os.path.dirname(tex_filepath)
+        filename = os.path.splitext(os.path.basename(tex_filepath))[0]
+        log_file = os.path.join(output_dir, f"{filename}.log")
+        cmd = [LATEX_ENGINE, "-interaction=nonstopmode", f"-output-directory={output_dir}", tex_filepath]
+        if self.fmt_path:
+            cmd.insert(1, f"-fmt={self.fmt_path}")
+
+        aux_checksums = get_aux_file_checksums(output_dir, filename)
+        passes_run = 0
+        while passes_run < MAX_LATEX_PASSES:
+            async with self._get_semaphore():
+                # Budget is computed after acquiring, so queueing does not eat into the pass timeout
+                timeout = get_pass_timeout(self.pass_timeout, deadline)
+                try:
+                    returncode, stdout, stderr = await _run_process(cmd, timeout)
+                except asyncio.TimeoutError:
+                    raise CompileTimeoutError(f"LaTeX pass timed out after {timeout:.1f}s.")
+                except FileNotFoundError:
+                    print(f"Error: LaTeX compiler ({LATEX_ENGINE}) not found. Please ensure LaTeX is installed and in your PATH.")
+                    return False
+            passes_run += 1
+            log = parse_latex_log(log_file)
+
+            if returncode != 0:
+                if passes_run < MAX_LATEX_PASSES and (log is None or not log.errors):
+                    aux_checksums = get_aux_file_checksums(output_dir, filename)
+                    continue
+                print(f"LaTeX compilation of {tex_filepath} failed (log: {log_file}).")
+                print(log.format_errors() if log is not None and log.errors else stderr or stdout)
+                return False
+
+            new_aux_checksums = get_aux_file_checksums(output_dir, filename)
+            rerun_needed = new_aux_checksums != aux_checksums or (log is not None and log.rerun_requested)
+            aux_checksums = new_aux_checksums
+            if not rerun_needed:
+                break
+
+        return os.path.exists(os.path.join(output_dir, f"{filename}.pdf"))
+
+    async def get_pdf_page_count(self, pdf_path: str) -> Optional[int]:
+        """
+        Async counterpart of resume_generator.get_pdf_page_count(). Reading the page tree
+        only touches a few kilobytes, so it runs on the loop directly.
+        """
+        page_count = read_pdf_page_count(pdf_path)
+        if page_count is None:
+            page_count = get_log_page_count(os.path.splitext(pdf_path)[0] + ".log")
+        return page_count
+
+    async def compile_and_count_pages(
+        self,
+        latex_content: str,
+        tex_filepath: str,
+        deadline: Optional[float] = None,
+        use_cache: bool = True
+    ) -> tuple[bool, Optional[int]]:
+        """Async counterpart of resume_generator.compile_and_count_pages()."""
+        pdf_filepath = os.path.splitext(tex_filepath)[0] + ".pdf"
+        await _run_blocking(_write_text, tex_filepath, latex_content)
+
+        cache_key = None
+        if self.pdf_cache is not None and use_cache:
+            # get_tex_version runs the engine once per process; the cache copies files
+            cache_key = self.pdf_cache.make_key(latex_content, await _run_blocking(get_tex_version))
+            cached = await _run_blocking(self.pdf_cache.get, cache_key, pdf_filepath)
+            if cached is not None:
+                return True, cached.get("page_count")
+
+        if not await self.compile_latex(tex_filepath, deadline=deadline):
+            return False, None
+        page_count = await self.get_pdf_page_count(pdf_filepath)
+        if cache_key is not None and page_count is not None:
+            await _run_blocking(self.pdf_cache.put, cache_key, pdf_filepath, page_count)
+        return True, page_count
+
+    async def measure_page_height(
+        self,
+        resume_data: Union[Resume, Dict[str, Any]],
+        template_module: Any,
+        tex_filepath: str,
+        minimum_page_height: float,
+        deadline: Optional[float] = None
+    ) -> Optional[float]:
+        """Async counterpart of resume_generator.measure_page_height()."""
+        if not hasattr(template_module, "page_height_for_content") or not hasattr(template_module, "CONTENT_HEIGHT_LOG_TAG"):
+            return None
+        latex_content = template_module.generate_latex_content(
+            resume_data, page_height=MEASURE_PAGE_HEIGHT_INCHES, report_content_height=True
+        )
+        # The height is read from the log, which a cached PDF does not come with
+        compiled, page_count = await self.compile_and_count_pages(latex_content, tex_filepath, deadline, use_cache=False)
+        if not compiled or page_count != 1:
+            return None
+        content_height = read_content_height(os.path.splitext(tex_filepath)[0] + ".log", template_module.CONTENT_HEIGHT_LOG_TAG)
+        if content_height is None:
+            return None
+        return page_height_from_measurement(template_module, content_height, minimum_page_height)
+
+    async def speculative_sizing(
+        self,
+        render_latex: Callable[[Optional[float]], str],
+        tex_filepath: str,
+        initial_page_height: float,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of resume_generator.speculative_sizing(). Candidates run as tasks
+        (bounded by the concurrency semaphore); undecided ones are cancelled, which kills
+        their pdflatex processes.
+        """
+        heights = speculative_candidate_heights(initial_page_height)
+        filename = os.path.splitext(os.path.basename(tex_filepath))[0]
+        build_dirs = [tempfile.mkdtemp(prefix="resume-candidate-") for _ in heights]
+
+        async def compile_candidate(index: int) -> tuple[int, str, Optional[int]]:
+            latex_content = render_latex(heights[index])
+            candidate_tex = os.path.join(build_dirs[index], f"{filename}.tex")
+            try:
+                compiled, page_count = await self.compile_and_count_pages(latex_content, candidate_tex, deadline)
+            except CompileTimeoutError:
+                return index, RESULT_TIMEOUT, None
+            if not compiled:
+                return index, RESULT_FAILED, page_count
+            return index, RESULT_SUCCESS if page_count is not None and page_count <= 1 else RESULT_MULTI_PAGE, page_count
+
+        statuses: List[Optional[str]] = [None] * len(heights)
+        page_counts: List[Optional[int]] = [None] * len(heights)
+        compiles = 0
+        winner = None
+        tasks = [asyncio.create_task(compile_candidate(i)) for i in range(len(heights))]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, statuses[index], page_counts[index] = await next_done
+                compiles += 1
+                winner = decide_speculative_winner(statuses)
+                if winner is not None:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            if winner is None:
+                return {"status": RESULT_FAILED, "page_height": None, "page_count": None, "compiles": compiles}
+            copy_candidate_outputs(build_dirs[winner], tex_filepath)
+            return {
+                "status": statuses[winner],
+                "page_height": heights[winner],
+                "page_count": page_counts[winner],
+                "compiles": compiles
+            }
+        finally:
+            for build_dir in build_dirs:
+                shutil.rmtree(build_dir, ignore_errors=True)
+
+    async def generate_resume(
+        self,
+        resume_data: Dict[str, Any],
+        template_module: Any,
+        tex_filepath: str,
+        page_height: Optional[float] = None,
+        auto_size: bool = True,
+        sizing: str = SIZING_INCREMENTAL,
+        size_tolerance: float = DEFAULT_SIZE_TOLERANCE_INCHES
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of resume_generator.generate_resume(); returns the same result dict.
+        """
+        deadline = time.monotonic() + self.job_timeout if self.job_timeout else None
+        pdf_filepath = os.path.splitext(tex_filepath)[0] + ".pdf"
+        result = {"status": RESULT_FAILED, "pdf_path": pdf_filepath, "page_height": page_height, "page_count": None, "compiles": 0}
+
+        # Rendering is CPU-only and fast, so it runs on the loop directly
+        resume = normalize_resume(resume_data)
+        render_latex = make_latex_renderer(template_module, resume)
+
+        if not auto_size:
+            latex_content = render_latex(page_height)
+            result["compiles"] = 1
+            try:
+                compiled, result["page_count"] = await self.compile_and_count_pages(latex_content, tex_filepath, deadline)
+            except CompileTimeoutError:
+                result["status"] = RESULT_TIMEOUT
+                return result
+            result["status"] = RESULT_SUCCESS if compiled else RESULT_FAILED
+            return result
+
+        initial_page_height = page_height if page_height is not None else DEFAULT_INITIAL_PAGE_HEIGHT_INCHES
+        memo_key = None
+        remembered = None
+        if self.sizing_memo is not None:
+            # Keyed on the normalized model, as in resume_generator.generate_resume (the key
+            # includes the template's source, which is read from disk)
+            memo_key = await _run_blocking(
+                self.sizing_memo.make_key,
+                resume, template_module, sizing_memo_variant(sizing, initial_page_height, size_tolerance)
+            )
+            remembered = await _run_blocking(self.sizing_memo.get, memo_key)
+
+        features = None
+        predicted_height = None
+        if self.height_model is not None and remembered is None:
+            features = extract_features(render_latex(initial_page_height))
+            if sizing != SIZING_MEASURE:
+                predicted_height = await _run_blocking(self.height_model.predict, template_module.__name__, features)
+
+        if remembered is not None:
+            # As in resume_generator.generate_resume: the requested strategy starts from the remembered height
+            sizing_steps = make_sizing_steps(
+                sizing, initial_page_height, size_tolerance, predicted_page_height=remembered["page_height"]
+            )
+            await self._run_sizing_steps(sizing_steps, render_latex, tex_filepath, deadline, result)
+        elif sizing == SIZING_SPECULATIVE:
+            if predicted_height is not None:
+                initial_page_height = max(initial_page_height, predicted_height)
+            result.update(await self.speculative_sizing(
+                render_latex, tex_filepath, initial_page_height, deadline
+            ))
+        else:
+            if sizing == SIZING_MEASURE:
+                result["compiles"] += 1
+                try:
+                    measured_height = await self.measure_page_height(
+                        resume, template_module, tex_filepath, initial_page_height, deadline
+                    )
+                except CompileTimeoutError:
+                    result["status"] = RESULT_TIMEOUT
+                    report_auto_size_result(result)
+                    return result
+                if measured_height is not None:
+                    initial_page_height = measured_height
+            sizing_steps = make_sizing_steps(sizing, initial_page_height, size_tolerance, predicted_height)
+            await self._run_sizing_steps(sizing_steps, render_latex, tex_filepath, deadline, result)
+
+        if memo_key is not None and result["status"] == RESULT_SUCCESS and \
+                (remembered is None or remembered["page_height"] != result["page_height"]):
+            await _run_blocking(self.sizing_memo.put, memo_key, result["page_height"], result["page_count"])
+        if features is not None and result["status"] == RESULT_SUCCESS and sizing in (SIZING_BISECT, SIZING_MEASURE):
+            await _run_blocking(self.height_model.record, template_module.__name__, features, result["page_height"])
+        report_auto_size_result(result)
+        return result
+
+    async def _run_sizing_steps(
+        self,
+        sizing_steps: Generator[float, Optional[int], None],
+        render_latex: Callable[[Optional[float]], str],
+        tex_filepath: str,
+        deadline: Optional[float],
+        result: Dict[str, Any]
+    ) -> None:
+        """Async counterpart of resume_generator.run_sizing_steps()."""
+        current_page_height = next(sizing_steps)
+        while True:
+            result["page_height"] = current_page_height
+            latex_content = render_latex(current_page_height)
+            result["compiles"] += 1
+            try:
+                compiled, page_count = await self.compile_and_count_pages(latex_content, tex_filepath, deadline)
+            except CompileTimeoutError:
+                result["status"] = RESULT_TIMEOUT
+                break
+            if not compiled:
+                result["status"] = RESULT_FAILED
+                break
+            result["page_count"] = page_count
+            result["status"] = RESULT_SUCCESS if page_count is not None and page_count <= 1 else RESULT_MULTI_PAGE
+            try:
+                current_page_height = sizing_steps.send(page_count)
+            except StopIteration:
+                break
@@ -0,0 +1,237 @@
+"""
+Predicts the page height a resume needs from cheap features of its LaTeX source.
+
+Every precisely sized resume (bisection or measurement) is appended to a JSON
+Lines history file as its template name, a few content features and the final
+page height. A ridge-regularized linear regression is fitted on that history per
+template, in pure Python, and used to pick the height auto-sizing starts from,
+so most resumes fit on the first compile.
+
+The history is read incrementally (only records appended since the last
+prediction) and compacted to the most recent MAX_HISTORY_RECORDS per template
+once it exceeds COMPACT_HISTORY_BYTES, so it neither grows without bound nor is
+re-read in full after every job.
+
+Features are counted on the rendered document body: sections, entry headings,
+bullet items, estimated wrapped lines and escaped characters. They cost one
+string scan and need nothing from the template beyond its macros' names.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Regular expressions counted in the document body, by feature name
+FEATURE_PATTERNS = {
+    "sections": re.compile(r"\\section\*?\{"),
+    "headings": re.compile(r"\\resumeSubheading|\\resumeProjectHeading|\\resumeSubSubheading"),
+    "items": re.compile(r"\\resumeItem\{"),
+}
+# Characters per line assumed when estimating how many lines the body wraps to
+WRAP_WIDTH_CHARS = 95
+
+FEATURE_NAMES = ("sections", "headings", "items", "wrapped_lines", "characters")
+
+# Fewer samples than this (per template) and no prediction is made
+MIN_TRAINING_SAMPLES = 8
+# Only the most recent records of each template are used for fitting (and kept on compaction)
+MAX_HISTORY_RECORDS = 2000
+# The history is compacted when an append makes it larger than this
+COMPACT_HISTORY_BYTES = 4 * 1024 * 1024
+# L2 penalty on the (standardized) feature weights; keeps the fit stable on small histories
+RIDGE_PENALTY = 1e-3
+# Predictions are raised by the training RMS error, but at least this much, so they tend to fit
+MIN_PREDICTION_MARGIN_INCHES = 0.1
+
+
+def extract_features(latex_content: str) -> Dict[str, float]:
+    """Returns the FEATURE_NAMES features of a rendered LaTeX document."""
+    body_start = latex_content.find("\\begin{document}")
+    body = latex_content[body_start:] if body_start >= 0 else latex_content
+    features = {name: float(len(pattern.findall(body))) for name, pattern in FEATURE_PATTERNS.items()}
+    lines = [line.strip() for line in body.splitlines()]
+    features["wrapped_lines"] = float(sum(math.ceil(len(line) / WRAP_WIDTH_CHARS) for line in lines if line))
+    features["characters"] = float(sum(len(line) for line in lines))
+    return features
+
+
+def _solve_linear_system(matrix: List[List[float]], rhs: List[float]) -> Optional[List[float]]:
+    """Solves matrix * x = rhs by Gaussian elimination with partial pivoting; None if singular."""
+    n = len(rhs)
+    rows = [list(matrix[i]) + [rhs[i]] for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, n):
+            factor = rows[r][col] / rows[col][col]
+            if factor:
+                for c in range(col, n + 1):
+                    rows[r][c] -= factor * rows[col][c]
+    solution = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        solution[r] = (rows[r][n] - sum(rows[r][c] * solution[c] for c in range(r + 1, n))) / rows[r][r]
+    return solution
+
+
+def fit_height_regression(samples: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Fits page_height ~ features by ridge regression on standardized features.
+    Args:
+        samples: Dicts with 'features' and 'page_height'.
+    Returns:
+        The fitted model (means, scales, weights, intercept and RMS error), or None if
+        there are too few samples or the system is singular.
+    """
+    if len(samples) < MIN_TRAINING_SAMPLES:
+        return None
+    xs = [[float(s["features"].get(name, 0.0)) for name in FEATURE_NAMES] for s in samples]
+    ys = [float(s["page_height"]) for s in samples]
+    count = len(xs)
+    means = [sum(x[j] for x in xs) / count for j in range(len(FEATURE_NAMES))]
+    scales = [
+        math.sqrt(sum((x[j] - means[j]) ** 2 for x in xs) / count) or 1.0
+        for j in range(len(FEATURE_NAMES))
+    ]
+    y_mean = sum(ys) / count
+    zs = [[(x[j] - means[j]) / scales[j] for j in range(len(FEATURE_NAMES))] for x in xs]
+
+    # Normal equations (Z^T Z + penalty * I) w = Z^T (y - mean); the centered intercept is y_mean
+    size = len(FEATURE_NAMES)
+    matrix = [
+        [sum(z[i] * z[j] for z in zs) + (RIDGE_PENALTY * count if i == j else 0.0) for j in range(size)]
+        for i in range(size)
+    ]
+    rhs = [sum(z[i] * (y - y_mean) for z, y in zip(zs, ys)) for i in range(size)]
+    weights = _solve_linear_system(matrix, rhs)
+    if weights is None:
+        return None
+    residuals = [y - y_mean - sum(w * v for w, v in zip(weights, z)) for z, y in zip(zs, ys)]
+    rms_error = math.sqrt(sum(r * r for r in residuals) / count)
+    return {"means": means, "scales": scales, "weights": weights, "intercept": y_mean, "rms_error": rms_error}
+
+
+class HeightModel:
+    """
+    Usage:
+        model = HeightModel(".cache/height_history.jsonl")
+        features = extract_features(latex_content)
+        start_height = model.predict("classic", features)  # None until enough history exists
+        ...size the resume precisely...
+        model.record("classic", features, final_page_height)
+    """
+
+    def __init__(self, history_path: str):
+        self.history_path = history_path
+        self._fits: Dict[str, Optional[Dict[str, Any]]] = {}
+        # The most recent records of each template, read incrementally from the history
+        self._samples: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._read_offset = 0
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def _read_new_records(self) -> None:
+        """
+        Reads the records appended to the history since the last call, and refits only the
+        templates that got new records. A replaced or truncated file (see _compact) is re-read.
+        """
+        try:
+            stat = os.stat(self.history_path)
+        except OSError:
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._read_offset:
+            self._samples = {}
+            self._fits = {}
+            self._read_offset = 0
+            self._file_id = file_id
+        if stat.st_size == self._read_offset:
+            return
+        try:
+            with open(self.history_path, "rb") as f:
+                f.seek(self._read_offset)
+                data = f.read()
+        except OSError:
+            return
+        # A line still being written by a concurrent writer is read next time
+        complete = data.rfind(b"\n") + 1
+        self._read_offset += complete
+        for line in data[:complete].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # A torn line from a concurrent writer
+            if not isinstance(record, dict) or not isinstance(record.get("features"), dict):
+                continue
+            template_name = record.get("template")
+            samples = self._samples.get(template_name)
+            if samples is None:
+                samples = self._samples[template_name] = deque(maxlen=MAX_HISTORY_RECORDS)
+            samples.append(record)
+            self._fits.pop(template_name, None)
+
+    def _get_fit(self, template_name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._read_new_records()
+            if template_name not in self._fits:
+                self._fits[template_name] = fit_height_regression(list(self._samples.get(template_name, ())))
+            return self._fits[template_name]
+
+    def predict(self, template_name: str, features: Dict[str, float]) -> Optional[float]:
+        """
+        Predicts the page height (inches, rounded up to 0.01) that fits a resume with these
+        features, including a safety margin. None if the history is too small.
+        """
+        fit = self._get_fit(template_name)
+        if fit is None:
+            return None
+        estimate = fit["intercept"] + sum(
+            w * (float(features.get(name, 0.0)) - mean) / scale
+            for name, w, mean, scale in zip(FEATURE_NAMES, fit["weights"], fit["means"], fit["scales"])
+        )
+        estimate += max(fit["rms_error"], MIN_PREDICTION_MARGIN_INCHES)
+        return math.ceil(estimate * 100) / 100
+
+    def record(self, template_name: str, features: Dict[str, float], page_height: float) -> None:
+        """Appends a precisely sized resume to the history."""
+        record = {"template": template_name, "features": features, "page_height": page_height, "time": time.time()}
+        try:
+            directory = os.path.dirname(self.history_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # One short append per record, so concurrent writers do not interleave within a line
+            with open(self.history_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+                size = f.tell()
+            if size > COMPACT_HISTORY_BYTES:
+                self._compact()
+        except OSError as e:
+            print(f"Could not record sizing history: {e}")
+
+    def _compact(self) -> None:
+        """
+        Rewrites the history keeping only the last MAX_HISTORY_RECORDS records per template.
+        A record appended by another process while the file is rewritten may be lost,
+        which only costs the model one sample.
+        """
+        kept: Dict[Any, Deque[Tuple[float, str]]] = {}
+        with open(self.history_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and line.endswith("\n"):
+                    template_lines = kept.setdefault(record.get("template"), deque(maxlen=MAX_HISTORY_RECORDS))
+                    template_lines.append((record.get("time", 0.0), line))
+        lines = [line for _, line in sorted(entry for template_lines in kept.values() for entry in template_lines)]
+        # Write under a temporary name and rename, so readers never see a partial file
+        tmp_path = f"{self.history_path}.tmp{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self.history_path)
@@ -0,0 +1,199 @@
+"""
+Streaming parser for pdflatex .log files.
+
+The log is read in fixed-size chunks and parsed line by line, so memory use does
+not grow with the log. TeX wraps log lines at 79 characters (max_print_line);
+wrapped lines are joined back before matching. The result is a LatexLog with
+the page count and size of the output, errors with their input line numbers,
+overfull/underfull boxes with their amounts, rerun requests, and any
+'<tag>=<value>' lines the caller asked for (e.g. values written with \\typeout).
+
+Usage:
+    log = parse_latex_log("output/resume1.log", tags=("RESUME-CONTENT-HEIGHT",))
+    if log is not None and log.errors:
+        print(log.errors[0].message, log.errors[0].line)
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+# Size of the chunks the log is read in
+LOG_READ_CHUNK_CHARS = 64 * 1024
+# TeX's default max_print_line: longer lines are wrapped at this width
+LOG_LINE_WIDTH = 79
+
+OUTPUT_PATTERN = re.compile(r"Output written on (?P<file>.+?) \((?P<pages>\d+) pages?, (?P<bytes>\d+) bytes\)\.")
+NO_OUTPUT_PATTERN = re.compile(r"^No pages of output\.")
+ERROR_PATTERN = re.compile(r"^! (?P<message>.*)")
+# '<file>:<line>: <message>' errors written with -file-line-error
+FILE_LINE_ERROR_PATTERN = re.compile(r"^(?P<file>[^:\s]+\.\w+):(?P<line>\d+): (?P<message>.*)")
+ERROR_LINE_PATTERN = re.compile(r"^l\.(?P<line>\d+)")
+BOX_PATTERN = re.compile(
+    r"^(?P<kind>Overfull|Underfull) \\(?P<box>[hv]box) "
+    r"\((?:(?P<amount>[\d.]+)pt too (?:wide|high)|badness (?P<badness>\d+))\)"
+    r".*?(?:lines? (?P<first>\d+)(?:--(?P<last>\d+))?)?$"
+)
+# Messages (from LaTeX, hyperref/rerunfilecheck, etc.) asking for another pass
+RERUN_PATTERN = re.compile(r"Rerun to get|Label\(s\) may have changed|Please rerun")
+WARNING_PATTERN = re.compile(r"^(?:LaTeX|Package \S+|Class \S+) Warning:")
+
+
+@dataclass
+class LatexError:
+    """A TeX error ('! ...') and the input line it occurred at, if the log names one."""
+    message: str
+    line: Optional[int] = None
+
+
+@dataclass
+class BoxWarning:
+    """An overfull or underfull box report."""
+    kind: str                      # 'Overfull' or 'Underfull'
+    box: str                       # 'hbox' or 'vbox'
+    amount_pt: Optional[float]     # How far it sticks out (overfull boxes)
+    badness: Optional[int]         # Its badness (underfull boxes)
+    first_line: Optional[int] = None
+    last_line: Optional[int] = None
+
+
+@dataclass
+class LatexLog:
+    """Everything parse_latex_log() extracts from one log."""
+    page_count: Optional[int] = None
+    output_bytes: Optional[int] = None
+    output_file: Optional[str] = None
+    errors: List[LatexError] = field(default_factory=list)
+    boxes: List[BoxWarning] = field(default_factory=list)
+    warning_count: int = 0
+    rerun_requested: bool = False
+    tagged_values: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def overfull_boxes(self) -> List[BoxWarning]:
+        return [b for b in self.boxes if b.kind == "Overfull"]
+
+    @property
+    def underfull_boxes(self) -> List[BoxWarning]:
+        return [b for b in self.boxes if b.kind == "Underfull"]
+
+    def format_errors(self, limit: int = 5) -> str:
+        """Returns the first errors as 'line N: message' lines, for console output."""
+        lines = [
+            f"  line {error.line}: {error.message}" if error.line is not None else f"  {error.message}"
+            for error in self.errors[:limit]
+        ]
+        if len(self.errors) > limit:
+            lines.append(f"  ... and {len(self.errors) - limit} more error(s)")
+        return "\n".join(lines)
+
+
+class LatexLogParser:
+    """
+    Incremental parser: feed() it text as it arrives, then call close() for the result.
+    Lines wrapped by TeX are joined before they are matched.
+    """
+
+    def __init__(self, tags: Iterable[str] = ()):
+        self.log = LatexLog()
+        self._buffer = ""
+        self._pending = ""  # A wrapped line waiting for its continuation
+        self._open_error: Optional[LatexError] = None
+        self._tag_patterns = [(tag, re.compile(re.escape(tag) + r"=(\S+)")) for tag in tags]
+
+    def feed(self, text: str) -> None:
+        self._buffer += text
+        lines = self._buffer.split("\n")
+        self._buffer = lines.pop()
+        for line in lines:
+            self._feed_physical_line(line.rstrip("\r"))
+
+    def close(self) -> LatexLog:
+        if self._buffer:
+            self._feed_physical_line(self._buffer.rstrip("\r"))
+            self._buffer = ""
+        if self._pending:
+            self._handle_line(self._pending)
+            self._pending = ""
+        return self.log
+
+    def _feed_physical_line(self, line: str) -> None:
+        if len(line) == LOG_LINE_WIDTH:
+            self._pending += line
+            return
+        line = self._pending + line
+        self._pending = ""
+        self._handle_line(line)
+
+    def _handle_line(self, line: str) -> None:
+        log = self.log
+        match = ERROR_PATTERN.match(line) or FILE_LINE_ERROR_PATTERN.match(line)
+        if match:
+            line_number = match.groupdict().get("line")
+            error = LatexError(match.group("message").strip(), int(line_number) if line_number else None)
+            log.errors.append(error)
+            # Plain '! ...' errors name their input line a few lines later ('l.<n> ...')
+            self._open_error = error if error.line is None else None
+            return
+        if self._open_error is not None:
+            match = ERROR_LINE_PATTERN.match(line)
+            if match:
+                self._open_error.line = int(match.group("line"))
+                self._open_error = None
+                return
+
+        if line.startswith(("Overfull", "Underfull")):
+            match = BOX_PATTERN.match(line)
+            if match:
+                log.boxes.append(BoxWarning(
+                    kind=match.group("kind"),
+                    box=match.group("box"),
+                    amount_pt=float(match.group("amount")) if match.group("amount") else None,
+                    badness=int(match.group("badness")) if match.group("badness") else None,
+                    first_line=int(match.group("first")) if match.group("first") else None,
+                    last_line=int(match.group("last") or match.group("first")) if match.group("first") else None
+                ))
+            return
+
+        match = OUTPUT_PATTERN.search(line)
+        if match:
+            log.output_file = match.group("file")
+            log.page_count = int(match.group("pages"))
+            log.output_bytes = int(match.group("bytes"))
+            return
+        if NO_OUTPUT_PATTERN.match(line):
+            log.page_count = 0
+            log.output_bytes = 0
+            return
+
+        if WARNING_PATTERN.match(line):
+            log.warning_count += 1
+        if not log.rerun_requested and RERUN_PATTERN.search(line):
+            log.rerun_requested = True
+        for tag, pattern in self._tag_patterns:
+            if tag in line:
+                match = pattern.search(line)
+                if match:
+                    log.tagged_values[tag] = match.group(1)
+
+
+def parse_latex_log(log_file: str, tags: Iterable[str] = ()) -> Optional[LatexLog]:
+    """
+    Parses a pdflatex log file in chunks.
+    Args:
+        log_file: Path to the .log file.
+        tags: Names whose '<tag>=<value>' lines should be collected into tagged_values.
+    Returns:
+        The parsed log, or None if the file cannot be read.
+    """
+    parser = LatexLogParser(tags)
+    try:
+        # TeX writes bytes in the input encoding; latin-1 never fails and keeps ASCII intact
+        with open(log_file, "r", encoding="latin-1", newline="") as f:
+            while True:
+                chunk = f.read(LOG_READ_CHUNK_CHARS)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+    except OSError:
+        return None
+    return parser.close()
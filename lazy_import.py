@@ -0,0 +1,52 @@
+"""
+Deferred module imports for the command-line entry points.
+
+lazy_import(name) returns a stand-in for the module right away and imports the
+module when one of its attributes is first used, so a CLI path that never
+compiles (e.g. --list-data-files) never pays for importing subprocess, the
+template package or the caches. The first use may happen on any thread.
+
+Usage:
+    subprocess = lazy_import("subprocess")
+    ...
+    subprocess.run(cmd)  # the module is imported here
+"""
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule(ModuleType):
+    """Stands in for a module and imports it on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+        self._lazy_module: Optional[ModuleType] = None
+
+    def __getattr__(self, attr: str) -> Any:
+        module = self._lazy_module
+        if module is None:
+            with self._lazy_lock:
+                if self._lazy_module is None:
+                    self._lazy_module = importlib.import_module(self.__name__)
+                module = self._lazy_module
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        state = "imported" if self._lazy_module is not None else "not imported"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns the named module, or a LazyModule importing it on first attribute access
+    (an ImportError is then raised at that point). A module that is already imported
+    is returned as is.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
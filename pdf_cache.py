@@ -0,0 +1,150 @@
+"""
+Content-addressed cache of compiled resume PDFs.
+
+Entries are keyed by a hash of the generated LaTeX source plus the TeX engine
+version, so identical documents (same data, template and page height) are
+compiled once and then served from disk. Each entry is a '<key>.pdf' file and a
+'<key>.json' metadata file holding the page count.
+
+The cache is bounded by total size. Entries are evicted least recently used first,
+using file modification times, which are refreshed on every hit.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, Iterable, Optional, Union
+
+# Default size bound for the cache directory
+DEFAULT_CACHE_MAX_BYTES = 500 * 1024 * 1024
+# Stores between full scans of the cache directory. In between, the size is tracked
+# from this instance's own stores; the scan picks up entries written by other processes.
+RESCAN_INTERVAL_PUTS = 64
+# An eviction frees space down to this fraction of the bound, so the next stores do not
+# cross the bound (and trigger a scan) again right away
+EVICT_TARGET_FRACTION = 0.9
+
+
+class PdfCache:
+    """
+    Usage:
+        cache = PdfCache(".cache/pdf")
+        key = cache.make_key(latex_content, tex_version)
+        entry = cache.get(key, "output/resume1.pdf")  # copies the PDF on a hit
+        if entry is None:
+            ...compile...
+            cache.put(key, "output/resume1.pdf", page_count)
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._total_bytes: Optional[int] = None  # Size at the last scan plus stores since; None before the first scan
+        self._puts_since_scan = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(latex_content: Union[str, Iterable[str]], engine_version: Optional[str]) -> str:
+        """
+        Returns the cache key for a LaTeX document compiled by the given engine version.
+        The document may be given in chunks; the key is that of the joined document.
+        """
+        digest = hashlib.sha256()
+        digest.update((engine_version or "unknown-engine").encode("utf-8"))
+        digest.update(b"\0")
+        for chunk in ((latex_content,) if isinstance(latex_content, str) else latex_content):
+            digest.update(chunk.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.pdf", f"{base}.json"
+
+    def get(self, key: str, pdf_destination: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up a cached PDF and copies it to pdf_destination on a hit.
+        Returns:
+            The entry's metadata (with 'page_count'), or None on a miss.
+        """
+        pdf_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            shutil.copyfile(pdf_path, pdf_destination)
+        except (OSError, ValueError):
+            return None
+        # Refresh recency for LRU eviction
+        for path in (pdf_path, meta_path):
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+        return meta
+
+    def put(self, key: str, pdf_source: str, page_count: Optional[int]) -> None:
+        """
+        Stores a compiled PDF and its page count, then evicts entries over the size bound.
+        The directory is scanned on the first store, when the tracked size exceeds the
+        bound and every RESCAN_INTERVAL_PUTS stores.
+        """
+        pdf_path, meta_path = self._paths(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write under temporary names and rename, so concurrent readers never see partial entries
+            tmp_suffix = f".tmp{os.getpid()}-{threading.get_ident()}"
+            shutil.copyfile(pdf_source, pdf_path + tmp_suffix)
+            with open(meta_path + tmp_suffix, "w") as f:
+                json.dump({"page_count": page_count}, f)
+            os.replace(pdf_path + tmp_suffix, pdf_path)
+            os.replace(meta_path + tmp_suffix, meta_path)
+            entry_bytes = os.path.getsize(pdf_path) + os.path.getsize(meta_path)
+        except OSError as e:
+            print(f"Could not store PDF in cache: {e}")
+            return
+        # Scan the directory only when the bound may have been crossed (or now and then,
+        # for entries other processes stored), not on every store
+        with self._lock:
+            self._puts_since_scan += 1
+            if self._total_bytes is not None:
+                self._total_bytes += entry_bytes
+            scan = (self._total_bytes is None or self._total_bytes > self.max_bytes
+                    or self._puts_since_scan >= RESCAN_INTERVAL_PUTS)
+        if scan:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Deletes least recently used entries until the cache fits in max_bytes (down to
+        EVICT_TARGET_FRACTION of it once the bound is exceeded).
+        """
+        entries = {}
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            key, ext = os.path.splitext(name)
+            if ext not in (".pdf", ".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            size, mtime = entries.get(key, (0, 0.0))
+            entries[key] = (size + stat.st_size, max(mtime, stat.st_mtime))
+
+        total = sum(size for size, _ in entries.values())
+        target = self.max_bytes * EVICT_TARGET_FRACTION if total > self.max_bytes else self.max_bytes
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= target:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+        with self._lock:
+            self._total_bytes = total
+            self._puts_since_scan = 0
@@ -0,0 +1,392 @@
+"""
+Minimal in-process PDF reader that counts pages.
+
+Reads only what it needs: the 'startxref' pointer at the end of the file, the
+cross-reference sections it points to (classic 'xref' tables as well as
+cross-reference streams, following /Prev and /XRefStm), and the catalog and
+page tree root, which may live in compressed object streams. The page count is
+the /Count of the page tree root.
+
+Only the FlateDecode filter (with optional PNG predictors) is supported, which is
+what pdfTeX and most other producers use for these structures.
+"""
+import zlib
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+# Bytes read from the end of the file when looking for 'startxref'
+TAIL_READ_BYTES = 4096
+# Bytes read at an object's offset per step while looking for the end of the object
+OBJECT_READ_BYTES = 4096
+# Guard against cyclic /Prev chains and runaway reads in damaged files
+MAX_XREF_SECTIONS = 64
+MAX_OBJECT_BYTES = 16 * 1024 * 1024
+
+WHITESPACE = b" \t\r\n\f\x00"
+DELIMITERS = b"()<>[]{}/%"
+
+
+class PdfReadError(Exception):
+    """Raised when the PDF structure cannot be parsed."""
+
+
+class Ref:
+    """An indirect object reference ('<num> <gen> R')."""
+    __slots__ = ("num", "gen")
+
+    def __init__(self, num: int, gen: int):
+        self.num = num
+        self.gen = gen
+
+    def __repr__(self) -> str:
+        return f"Ref({self.num}, {self.gen})"
+
+
+class _Parser:
+    """Parses PDF objects from a bytes buffer."""
+
+    def __init__(self, data: bytes, pos: int = 0):
+        self.data = data
+        self.pos = pos
+
+    def skip_whitespace(self) -> None:
+        data = self.data
+        while self.pos < len(data):
+            c = data[self.pos]
+            if c in WHITESPACE:
+                self.pos += 1
+            elif c == 0x25:  # '%' comment up to end of line
+                while self.pos < len(data) and data[self.pos] not in b"\r\n":
+                    self.pos += 1
+            else:
+                break
+
+    def read_token(self) -> bytes:
+        self.skip_whitespace()
+        start = self.pos
+        data = self.data
+        while self.pos < len(data) and data[self.pos] not in WHITESPACE and data[self.pos] not in DELIMITERS:
+            self.pos += 1
+        return data[start:self.pos]
+
+    def parse(self) -> Any:
+        """Parses the next object; integers followed by '<gen> R' become a Ref."""
+        self.skip_whitespace()
+        if self.pos >= len(self.data):
+            raise PdfReadError("Unexpected end of data")
+        data = self.data
+        c = data[self.pos]
+        if data.startswith(b"<<", self.pos):
+            self.pos += 2
+            result = {}
+            while True:
+                self.skip_whitespace()
+                if data.startswith(b">>", self.pos):
+                    self.pos += 2
+                    return result
+                key = self.parse()
+                if not isinstance(key, str) or not key.startswith("/"):
+                    raise PdfReadError("Dictionary key is not a name")
+                result[key[1:]] = self.parse()
+        if c == 0x5B:  # '['
+            self.pos += 1
+            items = []
+            while True:
+                self.skip_whitespace()
+                if self.pos < len(data) and data[self.pos] == 0x5D:  # ']'
+                    self.pos += 1
+                    return items
+                items.append(self.parse())
+        if c == 0x2F:  # '/'
+            self.pos += 1
+            return "/" + self.read_token().decode("latin-1")
+        if c == 0x28:  # '(' literal string, possibly with nested parentheses and escapes
+            depth = 0
+            start = self.pos
+            while self.pos < len(data):
+                ch = data[self.pos]
+                if ch == 0x5C:  # '\\'
+                    self.pos += 2
+                    continue
+                if ch == 0x28:
+                    depth += 1
+                elif ch == 0x29:
+                    depth -= 1
+                    if depth == 0:
+                        self.pos += 1
+                        return data[start + 1:self.pos - 1]
+                self.pos += 1
+            raise PdfReadError("Unterminated string")
+        if c == 0x3C:  # '<' hex string
+            start = self.pos + 1
+            end = data.find(b">", start)
+            if end < 0:
+                raise PdfReadError("Unterminated hex string")
+            self.pos = end + 1
+            return data[start:end]
+        token = self.read_token()
+        if not token:
+            raise PdfReadError(f"Unexpected character {chr(c)!r}")
+        if token == b"true":
+            return True
+        if token == b"false":
+            return False
+        if token == b"null":
+            return None
+        try:
+            if b"." in token:
+                return float(token)
+            number = int(token)
+        except ValueError:
+            return token.decode("latin-1")  # A keyword such as 'obj' or 'stream'
+        # Look ahead for '<gen> R'
+        saved = self.pos
+        gen = self.read_token()
+        if gen.isdigit():
+            if self.read_token() == b"R":
+                return Ref(number, int(gen))
+        self.pos = saved
+        return number
+
+
+def _apply_png_predictor(data: bytes, columns: int) -> bytes:
+    """Undoes PNG row predictors (as used with /Predictor >= 10) for 1-byte-per-pixel rows."""
+    row_length = columns + 1
+    if len(data) % row_length:
+        raise PdfReadError("Predicted data is not a whole number of rows")
+    previous = bytearray(columns)
+    output = bytearray()
+    for start in range(0, len(data), row_length):
+        kind = data[start]
+        row = bytearray(data[start + 1:start + row_length])
+        for i in range(columns):
+            left = row[i - 1] if i else 0
+            up = previous[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + ((left + up) >> 1)) & 0xFF
+            elif kind == 4:
+                upper_left = previous[i - 1] if i else 0
+                estimate = left + up - upper_left
+                pa, pb, pc = abs(estimate - left), abs(estimate - up), abs(estimate - upper_left)
+                nearest = left if pa <= pb and pa <= pc else (up if pb <= pc else upper_left)
+                row[i] = (row[i] + nearest) & 0xFF
+            elif kind != 0:
+                raise PdfReadError(f"Unknown PNG predictor {kind}")
+        output += row
+        previous = row
+    return bytes(output)
+
+
+class PdfPageCounter:
+    """Reads the page count of one PDF file. See read_pdf_page_count()."""
+
+    def __init__(self, f: BinaryIO, file_size: int):
+        self.f = f
+        self.file_size = file_size
+        # Object number -> (1, offset) for plain objects, (2, object stream number, index) for compressed ones
+        self.xref: Dict[int, Tuple[int, ...]] = {}
+        self.trailer: Dict[str, Any] = {}
+        self._object_streams: Dict[int, Tuple[bytes, List[Tuple[int, int]]]] = {}
+
+    def _read_at(self, offset: int, size: int) -> bytes:
+        self.f.seek(offset)
+        return self.f.read(size)
+
+    def _find_startxref(self) -> int:
+        tail_size = min(self.file_size, TAIL_READ_BYTES)
+        tail = self._read_at(self.file_size - tail_size, tail_size)
+        index = tail.rfind(b"startxref")
+        if index < 0:
+            raise PdfReadError("No startxref found")
+        return int(_Parser(tail, index + len(b"startxref")).read_token())
+
+    def _read_object_at(self, offset: int) -> Tuple[Any, Optional[bytes]]:
+        """Reads the indirect object at offset; returns (object, raw stream data or None)."""
+        size = OBJECT_READ_BYTES
+        while True:
+            chunk = self._read_at(offset, size)
+            end = chunk.find(b"endobj")
+            if end >= 0 or len(chunk) < size or size >= MAX_OBJECT_BYTES:
+                break
+            size *= 4
+        parser = _Parser(chunk)
+        parser.parse()  # object number
+        parser.read_token()  # generation
+        if parser.read_token() != b"obj":
+            raise PdfReadError(f"No object at offset {offset}")
+        value = parser.parse()
+        parser.skip_whitespace()
+        if not (isinstance(value, dict) and chunk.startswith(b"stream", parser.pos)):
+            return value, None
+
+        data_start = parser.pos + len(b"stream")
+        if chunk.startswith(b"\r\n", data_start):
+            data_start += 2
+        elif chunk.startswith(b"\n", data_start):
+            data_start += 1
+        length = self.resolve(value.get("Length"))
+        if isinstance(length, int):
+            stream = self._read_at(offset + data_start, length)
+        else:
+            end = chunk.find(b"endstream", data_start)
+            if end < 0:
+                raise PdfReadError(f"Unterminated stream at offset {offset}")
+            stream = chunk[data_start:end].rstrip(b"\r\n")
+        return value, stream
+
+    def _decode_stream(self, stream_dict: Dict[str, Any], data: bytes) -> bytes:
+        filters = self.resolve(stream_dict.get("Filter"))
+        params = self.resolve(stream_dict.get("DecodeParms"))
+        if isinstance(filters, str):
+            filters, params = [filters], [params]
+        for i, name in enumerate(filters or []):
+            if name != "/FlateDecode":
+                raise PdfReadError(f"Unsupported stream filter {name}")
+            data = zlib.decompress(data)
+            param = self.resolve(params[i]) if isinstance(params, list) and i < len(params) else params
+            if isinstance(param, dict) and self.resolve(param.get("Predictor", 1)) >= 10:
+                data = _apply_png_predictor(data, self.resolve(param.get("Columns", 1)))
+        return data
+
+    def _read_xref_table(self, offset: int) -> Dict[str, Any]:
+        """Parses a classic 'xref' table section and the trailer dictionary after it."""
+        size = OBJECT_READ_BYTES
+        while True:
+            chunk = self._read_at(offset, size)
+            trailer_index = chunk.find(b"trailer")
+            # The trailer dictionary must be complete in the chunk as well
+            if trailer_index >= 0 and chunk.find(b">>", trailer_index) >= 0 or len(chunk) < size or size >= MAX_OBJECT_BYTES:
+                break
+            size *= 4
+        if trailer_index < 0:
+            raise PdfReadError("No trailer after xref table")
+        lines = chunk[len(b"xref"):trailer_index].split()
+        i = 0
+        while i + 1 < len(lines):
+            first, count = int(lines[i]), int(lines[i + 1])
+            i += 2
+            for n in range(count):
+                entry_offset, _, kind = lines[i], lines[i + 1], lines[i + 2]
+                i += 3
+                if kind == b"n":
+                    self.xref.setdefault(first + n, (1, int(entry_offset)))
+                else:
+                    self.xref.setdefault(first + n, (0,))
+        trailer = _Parser(chunk, trailer_index + len(b"trailer")).parse()
+        if not isinstance(trailer, dict):
+            raise PdfReadError("Malformed trailer")
+        return trailer
+
+    def _read_xref_stream(self, offset: int) -> Dict[str, Any]:
+        """Parses a cross-reference stream; its dictionary doubles as the trailer."""
+        stream_dict, raw = self._read_object_at(offset)
+        if not isinstance(stream_dict, dict) or stream_dict.get("Type") != "/XRef" or raw is None:
+            raise PdfReadError(f"No cross-reference stream at offset {offset}")
+        data = self._decode_stream(stream_dict, raw)
+        widths = stream_dict["W"]
+        index = stream_dict.get("Index", [0, stream_dict["Size"]])
+        entry_size = sum(widths)
+        position = 0
+        for start, count in zip(index[0::2], index[1::2]):
+            for n in range(count):
+                if position + entry_size > len(data):
+                    raise PdfReadError("Cross-reference stream is truncated")
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(data[position:position + width], "big") if width else None)
+                    position += width
+                kind = 1 if fields[0] is None else fields[0]  # Type defaults to 1 when its width is 0
+                if kind == 1:
+                    self.xref.setdefault(start + n, (1, fields[1]))
+                elif kind == 2:
+                    self.xref.setdefault(start + n, (2, fields[1], fields[2]))
+                else:
+                    self.xref.setdefault(start + n, (0,))
+        return stream_dict
+
+    def load_xref(self) -> None:
+        """Reads every cross-reference section, newest first, so newer entries win."""
+        offset: Optional[int] = self._find_startxref()
+        seen = set()
+        while offset is not None and offset not in seen and len(seen) < MAX_XREF_SECTIONS:
+            seen.add(offset)
+            if self._read_at(offset, 4) == b"xref":
+                section_trailer = self._read_xref_table(offset)
+                # Hybrid files keep their compressed entries in an extra stream
+                if isinstance(section_trailer.get("XRefStm"), int):
+                    self._read_xref_stream(section_trailer["XRefStm"])
+            else:
+                section_trailer = self._read_xref_stream(offset)
+            for key, value in section_trailer.items():
+                self.trailer.setdefault(key, value)
+            previous = section_trailer.get("Prev")
+            offset = previous if isinstance(previous, int) else None
+
+    def _load_object_stream(self, stream_num: int) -> Tuple[bytes, List[Tuple[int, int]]]:
+        if stream_num not in self._object_streams:
+            entry = self.xref.get(stream_num)
+            if not entry or entry[0] != 1:
+                raise PdfReadError(f"Object stream {stream_num} not found")
+            stream_dict, raw = self._read_object_at(entry[1])
+            if raw is None:
+                raise PdfReadError(f"Object {stream_num} is not a stream")
+            data = self._decode_stream(stream_dict, raw)
+            first = self.resolve(stream_dict["First"])
+            header = data[:first].split()
+            pairs = [(int(header[i]), first + int(header[i + 1])) for i in range(0, len(header) - 1, 2)]
+            self._object_streams[stream_num] = (data, pairs)
+        return self._object_streams[stream_num]
+
+    def get_object(self, num: int) -> Any:
+        entry = self.xref.get(num)
+        if not entry or entry[0] == 0:
+            return None
+        if entry[0] == 1:
+            return self._read_object_at(entry[1])[0]
+        data, pairs = self._load_object_stream(entry[1])
+        index = entry[2]
+        if index >= len(pairs) or pairs[index][0] != num:
+            # The index is a hint; fall back to searching the header
+            matches = [i for i, (obj_num, _) in enumerate(pairs) if obj_num == num]
+            if not matches:
+                raise PdfReadError(f"Object {num} missing from object stream {entry[1]}")
+            index = matches[0]
+        return _Parser(data, pairs[index][1]).parse()
+
+    def resolve(self, value: Any) -> Any:
+        """Follows indirect references until a direct object is reached."""
+        depth = 0
+        while isinstance(value, Ref) and depth < 32:
+            value = self.get_object(value.num)
+            depth += 1
+        return value
+
+    def page_count(self) -> int:
+        self.load_xref()
+        catalog = self.resolve(self.trailer.get("Root"))
+        if not isinstance(catalog, dict):
+            raise PdfReadError("No document catalog")
+        pages = self.resolve(catalog.get("Pages"))
+        if not isinstance(pages, dict):
+            raise PdfReadError("No page tree")
+        count = self.resolve(pages.get("Count"))
+        if not isinstance(count, int) or count < 0:
+            raise PdfReadError("Page tree has no valid /Count")
+        return count
+
+
+def read_pdf_page_count(pdf_path: str) -> Optional[int]:
+    """
+    Returns the number of pages of a PDF file, or None if the file is missing or its
+    structure cannot be parsed.
+    """
+    try:
+        with open(pdf_path, "rb") as f:
+            f.seek(0, 2)
+            file_size = f.tell()
+            return PdfPageCounter(f, file_size).page_count()
+    except (OSError, PdfReadError, zlib.error, ValueError, KeyError, IndexError, TypeError):
+        return None
@@ -0,0 +1,178 @@
+"""
+Lazy readers for inputs holding many resumes.
+
+Upstream exports come as JSONL (one JSON object per line) or as one JSON array
+that can be too large to load at once. Both are read incrementally: JSONL line
+by line, arrays element by element with JSONDecoder.raw_decode over a read
+buffer whose consumed part is dropped once it is over half the buffer. Only
+about one record is held at a time, so memory use depends on the largest record
+rather than on the input size.
+
+A record that cannot be used is yielded with an error instead of ending the
+stream. In an array a syntax error cannot be skipped over, so reading stops
+after reporting it.
+
+Usage:
+    for record in open_record_stream("exports/resumes.jsonl"):
+        if record.error:
+            print(f"record {record.index + 1} at offset {record.offset}: {record.error}")
+        else:
+            render(record.data)
+"""
+import codecs
+import json
+import sys
+from typing import IO, Any, Dict, Iterator, NamedTuple, Optional
+
+STREAM_FORMAT_AUTO = "auto"    # An array if the input starts with '[', JSONL otherwise
+STREAM_FORMAT_JSONL = "jsonl"
+STREAM_FORMAT_ARRAY = "array"
+STREAM_FORMATS = (STREAM_FORMAT_AUTO, STREAM_FORMAT_JSONL, STREAM_FORMAT_ARRAY)
+
+# Bytes read at a time from an array input
+READ_CHUNK_SIZE = 64 * 1024
+
+# Path that reads the records from standard input
+STDIN_PATH = "-"
+
+_WHITESPACE = " \t\n\r"
+
+# A decode error this close to the end of the buffer may just be a truncated
+# element (a cut-off literal, number or \uXXXX escape); anything earlier is bad JSON
+_TRUNCATION_MARGIN = 6
+
+
+class StreamRecord(NamedTuple):
+    index: int                      # Position of the record in the input, from 0
+    offset: int                     # Byte offset of its line (JSONL) or character offset of the element (array)
+    data: Optional[Dict[str, Any]]  # None if the record could not be used
+    error: Optional[str] = None
+
+
+def _check_record(index: int, offset: int, data: Any) -> StreamRecord:
+    if not isinstance(data, dict):
+        return StreamRecord(index, offset, None, f"expected a JSON object, got {type(data).__name__}")
+    return StreamRecord(index, offset, data)
+
+
+def iter_jsonl_records(f: IO[bytes]) -> Iterator[StreamRecord]:
+    """Yields the records of a binary JSONL stream; blank lines are skipped."""
+    index = 0
+    offset = 0
+    for line in f:
+        line_offset = offset
+        offset += len(line)
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:  # Includes UnicodeDecodeError
+            yield StreamRecord(index, line_offset, None, f"invalid JSON: {e}")
+        else:
+            yield _check_record(index, line_offset, data)
+        index += 1
+
+
+def iter_json_array_records(f: IO[bytes], chunk_size: int = READ_CHUNK_SIZE) -> Iterator[StreamRecord]:
+    """Yields the elements of a binary stream holding one JSON array, decoding them one at a time."""
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    decoder = json.JSONDecoder()
+    buffer = ""
+    buffer_offset = 0  # Character offset of buffer[0] in the input
+    pos = 0
+    eof = False
+
+    def read_more(min_chars: int = 1) -> bool:
+        """Appends at least min_chars of input to the buffer; False at the end of the input."""
+        nonlocal buffer, buffer_offset, pos, eof
+        if eof:
+            return False
+        if pos > len(buffer) // 2:
+            # Drop the consumed input; copying only past the halfway mark keeps it amortized O(1) per char
+            buffer = buffer[pos:]
+            buffer_offset += pos
+            pos = 0
+        wanted = len(buffer) + min_chars
+        while len(buffer) < wanted and not eof:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer += utf8.decode(chunk, final=eof)
+        return True
+
+    def next_char() -> str:
+        """Skips whitespace and returns the next character ('' at the end of the input)."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not read_more():
+                return ""
+
+    index = 0
+    try:
+        if next_char() != "[":
+            yield StreamRecord(index, buffer_offset + pos, None, "input is not a JSON array")
+            return
+        pos += 1
+        if next_char() == "]":
+            return
+        while True:
+            if not next_char():
+                yield StreamRecord(index, buffer_offset + pos, None, "unexpected end of input")
+                return
+            offset = buffer_offset + pos
+            while True:
+                try:
+                    data, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    truncated = e.pos >= len(buffer) - _TRUNCATION_MARGIN or e.msg.startswith("Unterminated string")
+                    # Read as much again as the element has so far, so a large element is re-decoded
+                    # O(log n) times rather than once per chunk
+                    if truncated and read_more(len(buffer) - pos):
+                        continue
+                    yield StreamRecord(index, offset, None, f"invalid JSON: {e.msg} at offset {buffer_offset + e.pos}")
+                    return
+                # A number at the end of the buffer may continue in the next chunk
+                if end == len(buffer) and not isinstance(data, (dict, list)) and read_more():
+                    continue
+                break
+            yield _check_record(index, offset, data)
+            index += 1
+            pos = end
+            separator = next_char()
+            if separator == "]":
+                return
+            if separator != ",":
+                yield StreamRecord(index, buffer_offset + pos, None, "expected ',' or ']' after an array element")
+                return
+            pos += 1
+    except UnicodeDecodeError as e:
+        yield StreamRecord(index, buffer_offset + pos, None, f"invalid UTF-8: {e}")
+
+
+def _read_and_close(records: Iterator[StreamRecord], f: IO[bytes]) -> Iterator[StreamRecord]:
+    try:
+        yield from records
+    finally:
+        if f is not sys.stdin.buffer:
+            f.close()
+
+
+def open_record_stream(path: str, stream_format: str = STREAM_FORMAT_AUTO) -> Iterator[StreamRecord]:
+    """
+    Opens a multi-record input and returns an iterator over its records; the file is
+    closed when the iterator is exhausted or closed.
+    Args:
+        path: The input file, or STDIN_PATH for standard input.
+        stream_format: One of STREAM_FORMATS.
+    Raises:
+        OSError: If the file cannot be opened.
+    """
+    f = sys.stdin.buffer if path == STDIN_PATH else open(path, "rb")
+    if stream_format == STREAM_FORMAT_AUTO:
+        # peek() does not consume, so the reader still sees the whole input
+        stream_format = STREAM_FORMAT_ARRAY if f.peek(1).lstrip()[:1] == b"[" else STREAM_FORMAT_JSONL
+    records = iter_json_array_records(f) if stream_format == STREAM_FORMAT_ARRAY else iter_jsonl_records(f)
+    return _read_and_close(records, f)
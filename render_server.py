@@ -0,0 +1,346 @@
+"""
+Local HTTP render service.
+
+Serves renders from one long-lived process instead of a fresh interpreter per
+resume. Templates stay imported, their preamble formats are built once, and
+warm TeX workers are optional. Requests are handled by a fixed pool of render
+threads fed through a bounded queue. When the queue is full the server answers
+503 at once, so an overloaded service sheds load instead of queueing without
+bound. Only the standard library is used. The service is meant to listen on
+localhost behind the web tier.
+
+Endpoints:
+    POST /render?template=classic[&page_height=11]   body: resume JSON -> application/pdf
+    GET  /health                                     -> JSON state of the pool and queue
+
+Usage:
+    python resume_generator.py --serve --port 8000 --jobs 4
+    curl --data-binary @data/resume.json "http://127.0.0.1:8000/render?template=classic" -o resume.pdf
+"""
+import concurrent.futures
+import contextlib
+import json
+import math
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import templates
+from resume_generator import (
+    LATEX_ENGINE,
+    MAX_PAGE_HEIGHT_INCHES,
+    RESULT_FAILED,
+    RESULT_MULTI_PAGE,
+    RESULT_SUCCESS,
+    RESULT_TIMEOUT,
+    generate_resume,
+    get_preamble_format,
+    template_supports_engine,
+)
+from tex_worker import TexWorkerPool
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_QUEUE_SIZE = 16
+# Largest request body accepted, in bytes
+MAX_REQUEST_BYTES = 1024 * 1024
+# Seconds an overloaded server asks clients to wait before retrying
+RETRY_AFTER_SECONDS = 1
+
+
+class RenderService:
+    """
+    A fixed pool of render threads fed through a bounded queue.
+
+    Usage:
+        service = RenderService(workers=4, queue_size=16, sizing="bisect")
+        service.start()
+        future = service.submit(resume_data, "classic")  # None when the queue is full
+        result = future.result()  # generate_resume()'s result plus 'pdf' (the PDF bytes or None)
+        service.close()
+
+    page_height is the initial page height of requests that do not give one. Other
+    keyword arguments are passed on to generate_resume(); the pdf_cache, sizing_memo
+    and height_model given there are shared by all render threads, which each of them
+    supports (see their modules).
+    """
+
+    def __init__(self, workers: int, queue_size: int = DEFAULT_QUEUE_SIZE, format_cache: bool = True,
+                 tex_workers: int = 0, page_height: Optional[float] = None, **generate_options: Any):
+        self.workers = max(1, workers)
+        self.page_height = page_height
+        self.queue_size = max(1, queue_size)  # A Queue of size 0 would be unbounded
+        self.format_cache = format_cache
+        self.tex_workers = tex_workers
+        self.generate_options = generate_options
+        self._jobs: "queue.Queue[Optional[Tuple[Dict[str, Any], str, Optional[float], concurrent.futures.Future]]]" = \
+            queue.Queue(maxsize=self.queue_size)
+        self._threads: List[threading.Thread] = []
+        # Per template: the module, its preamble format path and its warm TeX workers
+        self._templates: Dict[str, Tuple[Any, Optional[str], Optional[TexWorkerPool]]] = {}
+        # Guards the two dicts; each template is prepared under its own lock, so a slow format
+        # build does not hold up requests for templates that are already prepared
+        self._templates_lock = threading.Lock()
+        self._template_locks: Dict[str, threading.Lock] = {}
+        self._stats_lock = threading.Lock()
+        self._active = 0
+        self._results = {status: 0 for status in (RESULT_SUCCESS, RESULT_MULTI_PAGE, RESULT_FAILED, RESULT_TIMEOUT)}
+        self._rejected = 0
+        self._started_at = time.time()
+
+    def _template(self, template_name: str) -> Tuple[Any, Optional[str], Optional[TexWorkerPool]]:
+        """
+        Returns the loaded template with its format and worker pool, preparing them on first use.
+        Raises:
+            ImportError: If the template cannot be loaded or does not support the engine.
+        """
+        with self._templates_lock:
+            entry = self._templates.get(template_name)
+            if entry is not None:
+                return entry
+            template_lock = self._template_locks.setdefault(template_name, threading.Lock())
+        with template_lock:
+            with self._templates_lock:
+                entry = self._templates.get(template_name)
+            if entry is not None:
+                return entry  # Prepared by another thread while this one waited
+            template_module = templates.load_template(template_name)
+            if not template_supports_engine(template_name):
+                raise ImportError(f"Template '{template_name}' does not support {LATEX_ENGINE}.")
+            fmt_path = get_preamble_format(template_name, template_module) if self.format_cache else None
+            worker_pool = None
+            if self.tex_workers > 0:
+                worker_pool = TexWorkerPool(self.tex_workers, engine=LATEX_ENGINE, fmt_path=fmt_path)
+                if not worker_pool.start():
+                    print(f"TeX worker pool unavailable for '{template_name}', using one-shot compiles.", file=sys.stderr)
+                    worker_pool = None
+            entry = (template_module, fmt_path, worker_pool)
+            with self._templates_lock:
+                self._templates[template_name] = entry
+            return entry
+
+    def warm(self) -> None:
+        """Prepares every available template, so no request pays for importing one or building its format."""
+        for template_name in templates.get_available_templates():
+            try:
+                self._template(template_name)
+            except ImportError as e:
+                print(f"Template '{template_name}' is unavailable: {e}", file=sys.stderr)
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"render-worker-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, resume_data: Dict[str, Any], template_name: str,
+               page_height: Optional[float] = None) -> Optional[concurrent.futures.Future]:
+        """
+        Queues a render. Returns a Future of its result, or None if the queue is full.
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        try:
+            self._jobs.put_nowait((resume_data, template_name, page_height, future))
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            return None
+        return future
+
+    def _work(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            resume_data, template_name, page_height, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self._stats_lock:
+                self._active += 1
+            try:
+                result = self._render(resume_data, template_name, page_height)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                with self._stats_lock:
+                    self._results[result["status"]] += 1
+                future.set_result(result)
+            finally:
+                with self._stats_lock:
+                    self._active -= 1
+
+    def _render(self, resume_data: Dict[str, Any], template_name: str, page_height: Optional[float]) -> Dict[str, Any]:
+        template_module, fmt_path, worker_pool = self._template(template_name)
+        build_dir = tempfile.mkdtemp(prefix="resume-serve-")
+        try:
+            result = generate_resume(
+                resume_data,
+                template_module,
+                os.path.join(build_dir, "resume.tex"),
+                page_height=page_height if page_height is not None else self.page_height,
+                fmt_path=fmt_path,
+                worker_pool=worker_pool,
+                keep_tex=False,
+                **self.generate_options
+            )
+            result["pdf"] = None
+            if result["status"] in (RESULT_SUCCESS, RESULT_MULTI_PAGE) and os.path.exists(result["pdf_path"]):
+                with open(result["pdf_path"], "rb") as f:
+                    result["pdf"] = f.read()
+            return result
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+    def health(self) -> Dict[str, Any]:
+        with self._templates_lock:
+            template_names = sorted(self._templates)
+        with self._stats_lock:
+            return {
+                "status": "ok",
+                "workers": self.workers,
+                "active": self._active,
+                "queued": self._jobs.qsize(),
+                "queue_size": self.queue_size,
+                "templates": template_names,
+                "results": dict(self._results),
+                "rejected": self._rejected,
+                "uptime_seconds": round(time.time() - self._started_at, 1),
+            }
+
+    def close(self) -> None:
+        """Lets queued renders finish, then stops the threads and the TeX workers."""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        with self._templates_lock:
+            for _, _, worker_pool in self._templates.values():
+                if worker_pool is not None:
+                    worker_pool.close()
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """Serves /render and /health for the RenderService in self.server.service."""
+    protocol_version = "HTTP/1.1"  # Keep-alive, so the web tier can reuse connections
+
+    def _send(self, code: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, code: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(code, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path == "/health":
+            self._send_json(200, self.server.service.health())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Without a usable length the body cannot be skipped, so the connection cannot be reused
+            self.close_connection = True
+            self._send_json(411, {"error": "Content-Length required"})
+            return
+        if length > MAX_REQUEST_BYTES:
+            # The body is not read, so the connection cannot be reused
+            self.close_connection = True
+            self._send_json(413, {"error": f"request body over {MAX_REQUEST_BYTES} bytes"})
+            return
+        body = self.rfile.read(length)
+        if url.path != "/render":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        query = parse_qs(url.query)
+        template_name = query.get("template", [""])[0]
+        if not template_name:
+            self._send_json(400, {"error": "missing 'template' query parameter"})
+            return
+        if templates.get_template_info(template_name) is None:
+            self._send_json(404, {"error": f"no template named '{template_name}'"})
+            return
+        page_height = None
+        if "page_height" in query:
+            try:
+                page_height = float(query["page_height"][0])
+            except ValueError:
+                page_height = math.nan
+            if not (math.isfinite(page_height) and 0 < page_height <= MAX_PAGE_HEIGHT_INCHES):
+                self._send_json(400, {"error": f"page_height must be a number of inches, over 0 and "
+                                               f"at most {MAX_PAGE_HEIGHT_INCHES:g}"})
+                return
+        try:
+            resume_data = json.loads(body)
+        except ValueError as e:
+            self._send_json(400, {"error": f"invalid JSON: {e}"})
+            return
+        if not isinstance(resume_data, dict):
+            self._send_json(400, {"error": "the request body must be a JSON object"})
+            return
+
+        future = self.server.service.submit(resume_data, template_name, page_height)
+        if future is None:
+            self._send_json(503, {"error": "render queue is full"}, {"Retry-After": str(RETRY_AFTER_SECONDS)})
+            return
+        try:
+            result = future.result()
+        except ImportError as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        if result["pdf"] is None:
+            if result["status"] == RESULT_TIMEOUT:
+                self._send_json(504, {"error": "LaTeX compilation timed out"})
+            else:
+                self._send_json(500, {"error": "LaTeX compilation failed"})
+            return
+        headers = {"X-Render-Status": result["status"]}
+        if result["page_height"] is not None:
+            headers["X-Page-Height"] = f"{result['page_height']:.2f}"
+        if result["page_count"] is not None:
+            headers["X-Page-Count"] = str(result["page_count"])
+        self._send(200, result["pdf"], "application/pdf", headers)
+
+
+def serve(service: RenderService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """
+    Runs the HTTP server until interrupted. The generator's progress output is discarded;
+    the server logs requests to stderr.
+    """
+    server = ThreadingHTTPServer((host, port), RenderRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        service.warm()
+        service.start()
+        print(f"Serving resumes on http://{host}:{server.server_port} "
+              f"({service.workers} render thread(s), queue of {service.queue_size})", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.close()
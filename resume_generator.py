@@ -1,25 +1,108 @@
-import argparse
+from __future__ import annotations
+
 import os
 import sys
-import importlib
-import glob
-import re
-import subprocess
-import json
-from typing import Dict, Any, Optional, List
+import math
+import io
+import time
+import contextlib
+import threading
+from typing import Dict, Any, Optional, List, Generator, Callable, Sequence, Union
+
+from lazy_import import lazy_import
+
+# Imported on first use, so short-lived invocations (listing files, argument errors)
+# do not pay for modules only the compile and batch paths need
+argparse = lazy_import("argparse")
+glob = lazy_import("glob")
+subprocess = lazy_import("subprocess")
+json = lazy_import("json")
+hashlib = lazy_import("hashlib")
+shutil = lazy_import("shutil")
+tempfile = lazy_import("tempfile")
+concurrent_futures = lazy_import("concurrent.futures")
+queue = lazy_import("queue")
 
 # Default directory names
 DATA_DIR = "data"
 TEMPLATES_DIR = "templates"
 OUTPUT_DIR = "output"
+CACHE_DIR = ".cache"
+SIZING_MEMO_PATH = os.path.join(CACHE_DIR, "sizing_memo.jsonl")
+HEIGHT_HISTORY_PATH = os.path.join(CACHE_DIR, "height_history.jsonl")
+TEMPLATE_REGISTRY_CACHE_PATH = os.path.join(CACHE_DIR, "template_registry.json")
+
+# LaTeX engine used for all compilations
+LATEX_ENGINE = "pdflatex"
+# Upper bound on pdflatex passes per compilation (extra passes only run when needed)
+MAX_LATEX_PASSES = 2
+
+# Watchdog budgets in seconds: a single pdflatex pass, and a whole resume (all sizing attempts)
+DEFAULT_PASS_TIMEOUT_SECONDS = 60.0
+DEFAULT_JOB_TIMEOUT_SECONDS = 300.0
+# Budget for building a preamble format
+FORMAT_BUILD_TIMEOUT_SECONDS = 120.0
 
 # Default page sizing parameters
 DEFAULT_INITIAL_PAGE_HEIGHT_INCHES = 11.0
 MAX_AUTO_SIZE_ATTEMPTS = 5
 PAGE_HEIGHT_INCREMENT_INCHES = 1.0
+# Bisection sizing: stop once the fitting height is known to within this many inches.
+# The upper limit stays below TeX's largest page dimension (16383.99pt, about 226in).
+DEFAULT_SIZE_TOLERANCE_INCHES = 0.05
+MIN_SIZE_TOLERANCE_INCHES = 0.01
+MAX_PAGE_HEIGHT_INCHES = 200.0
+# First bracketing step around a predicted height (doubled on each further step)
+PREDICTED_HEIGHT_STEP_INCHES = 0.2
+
+# Auto-sizing strategies
+SIZING_INCREMENTAL = "incremental"  # Grow the page in fixed steps until the content fits
+SIZING_MEASURE = "measure"          # Measure the content on one very tall page, then compile at that height
+SIZING_BISECT = "bisect"            # Bracket the fitting height, then bisect it down to a tolerance
+SIZING_SPECULATIVE = "speculative"  # Compile all incremental candidate heights at once, keep the smallest that fits
+SIZING_STRATEGIES = (SIZING_INCREMENTAL, SIZING_MEASURE, SIZING_BISECT, SIZING_SPECULATIVE)
+
+# --template value that generates the resume with every available template
+TEMPLATE_ALL = "all"
+
+# Parsed records waiting for a worker in --stream mode; bounds memory use whatever the input size
+DEFAULT_STREAM_QUEUE_SIZE = 16
+
+# Streamed documents are read by the engine from this path (its standard input);
+# where it does not exist, documents are written to a .tex file as usual
+STREAM_INPUT_PATH = "/dev/stdin"
+
+# Seconds between checks for cancellation while a cancellable pdflatex pass runs
+CANCEL_POLL_INTERVAL_SECONDS = 0.1
+# Files of the winning speculative candidate copied next to the requested .tex path
+CANDIDATE_OUTPUT_EXTENSIONS = (".tex", ".pdf", ".log", ".aux", ".out")
+
+# Measurement sizing: height of the measuring page, and margin added on top of the measured height
+MEASURE_PAGE_HEIGHT_INCHES = 100.0
+MEASURE_SLACK_INCHES = 0.05
+
+# Outcomes reported by generate_resume()
+RESULT_SUCCESS = "success"        # PDF produced (and fits on one page when auto-sizing)
+RESULT_MULTI_PAGE = "multi_page"  # PDF produced, but auto-sizing could not fit it on one page
+RESULT_FAILED = "failed"          # LaTeX compilation failed
+RESULT_TIMEOUT = "timeout"        # A pass or the whole job exceeded its time budget
+
+class CompileTimeoutError(Exception):
+    """Raised when a pdflatex pass or the job's overall deadline runs out of time."""
 
-# Import template loading functions
-from templates import get_available_templates, load_template
+class CompileCancelledError(Exception):
+    """Raised when a compile is abandoned because its result is no longer needed."""
+
+# Project modules, likewise imported on first use
+templates = lazy_import("templates")
+tex_worker = lazy_import("tex_worker")
+pdf_cache_module = lazy_import("pdf_cache")
+sizing_memo_module = lazy_import("sizing_memo")
+height_model_module = lazy_import("height_model")
+pdf_reader = lazy_import("pdf_reader")
+latex_log = lazy_import("latex_log")
+record_stream = lazy_import("record_stream")
+render_server = lazy_import("render_server")
 
 def load_json_data(file_path: str) -> Optional[Dict[str, Any]]:
     """Loads JSON data from the specified file."""
@@ -45,15 +128,292 @@ def get_output_filenames(base_name: str, output_dir: str) -> tuple[str, str, str
             return tex_filename, pdf_filename, json_filename, i
         i += 1
 
-def compile_latex(tex_filepath: str) -> bool:
+# Auxiliary files whose changes between passes mean another pass is needed
+RERUN_CHECKED_EXTENSIONS = (".aux", ".out")
+
+def get_aux_file_checksums(output_dir: str, filename: str) -> Dict[str, Optional[str]]:
+    """
+    Returns checksums of the auxiliary files LaTeX reads back on the next pass.
+    
+    Args:
+        output_dir: Directory holding the compilation outputs.
+        filename: The job name (the .tex file name without extension).
+        
+    Returns:
+        A dict mapping each extension in RERUN_CHECKED_EXTENSIONS to the SHA-256 of the
+        file's contents, or None if the file does not exist.
+    """
+    checksums = {}
+    for ext in RERUN_CHECKED_EXTENSIONS:
+        path = os.path.join(output_dir, f"{filename}{ext}")
+        try:
+            with open(path, 'rb') as f:
+                checksums[ext] = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            checksums[ext] = None
+    return checksums
+
+_tex_version_cache: Dict[str, Optional[str]] = {}
+
+def get_tex_version(engine: str = LATEX_ENGINE) -> Optional[str]:
+    """
+    Returns the first line of '<engine> --version' (memoized per process).
+    
+    Args:
+        engine: The TeX engine executable.
+        
+    Returns:
+        The version banner, or None if the engine could not be run.
+    """
+    if engine not in _tex_version_cache:
+        try:
+            result = subprocess.run(
+                [engine, "--version"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            lines = result.stdout.splitlines()
+            _tex_version_cache[engine] = lines[0].strip() if result.returncode == 0 and lines else None
+        except OSError:
+            _tex_version_cache[engine] = None
+    return _tex_version_cache[engine]
+
+def get_preamble_format(template_name: str, template_module: Any, cache_dir: str = CACHE_DIR) -> Optional[str]:
+    """
+    Returns a precompiled format holding the template's static preamble, building it on first use.
+    
+    The format is keyed by template name, preamble contents and TeX version, so editing
+    the template or upgrading TeX produces a new format instead of reusing a stale one.
+    For a LazyTemplate the preamble hash comes from the registry, so the template module
+    is only imported when the format has to be built.
+    
+    Args:
+        template_name: The name of the template (e.g., 'classic').
+        template_module: The loaded template module (or its LazyTemplate). It must define
+            STATIC_PREAMBLE and PREAMBLE_LOADED_MACRO to support precompiled formats.
+        cache_dir: Root cache directory; formats are stored in its 'formats' subdirectory.
+        
+    Returns:
+        The format path without the .fmt extension (as expected by -fmt), or None if the
+        template does not support formats or the format could not be built.
+    """
+    template_info = getattr(template_module, "template_info", None)
+    if template_info is not None:
+        static_preamble_hash = template_info.preamble_hash
+    else:
+        static_preamble = getattr(template_module, "STATIC_PREAMBLE", None)
+        static_preamble_hash = templates.preamble_hash(static_preamble) if static_preamble else None
+    if not static_preamble_hash:
+        return None
+
+    tex_version = get_tex_version()
+    if tex_version is None:
+        return None
+
+    key_source = "\0".join([template_name, tex_version, static_preamble_hash])
+    key = f"{template_name}-{hashlib.sha256(key_source.encode('utf-8')).hexdigest()[:16]}"
+    fmt_dir = os.path.abspath(os.path.join(cache_dir, "formats"))
+    fmt_base = os.path.join(fmt_dir, key)
+    if os.path.exists(f"{fmt_base}.fmt"):
+        return fmt_base
+
+    static_preamble = getattr(template_module, "STATIC_PREAMBLE", None)
+    loaded_macro = getattr(template_module, "PREAMBLE_LOADED_MACRO", None)
+    if not static_preamble or not loaded_macro:
+        return None
+
+    print(f"Building precompiled preamble format for template '{template_name}'...")
+    os.makedirs(fmt_dir, exist_ok=True)
+    # Build under a per-process job name and rename, so concurrent runs never see a partial format
+    tmp_job = f"{key}-tmp{os.getpid()}"
+    src_path = os.path.join(fmt_dir, f"{tmp_job}.tex")
+    with open(src_path, 'w', encoding='utf-8') as f:
+        f.write(static_preamble)
+        f.write(f"\n\\def{loaded_macro}{{}}\n\\dump\n")
+
+    cmd = [
+        LATEX_ENGINE,
+        "-ini",
+        "-interaction=nonstopmode",
+        f"-jobname={tmp_job}",
+        f"-output-directory={fmt_dir}",
+        f"&{LATEX_ENGINE}",  # Start from the engine's LaTeX format, then dump ours on top
+        src_path
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=FORMAT_BUILD_TIMEOUT_SECONDS
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"Could not build preamble format: {e}")
+        return None
+    finally:
+        if os.path.exists(src_path):
+            os.remove(src_path)
+
+    tmp_fmt = os.path.join(fmt_dir, f"{tmp_job}.fmt")
+    if result.returncode != 0 or not os.path.exists(tmp_fmt):
+        print(f"Could not build preamble format (see {os.path.join(fmt_dir, tmp_job + '.log')}). Compiling without it.")
+        return None
+    os.replace(tmp_fmt, f"{fmt_base}.fmt")
+    tmp_log = os.path.join(fmt_dir, f"{tmp_job}.log")
+    if os.path.exists(tmp_log):
+        os.replace(tmp_log, f"{fmt_base}.log")
+    print(f"Preamble format saved to {fmt_base}.fmt")
+    return fmt_base
+
+def get_pass_timeout(pass_timeout: Optional[float], deadline: Optional[float]) -> Optional[float]:
+    """
+    Returns the time budget for the next pdflatex pass.
+    
+    Args:
+        pass_timeout: Per-pass budget in seconds, or None for no limit.
+        deadline: time.monotonic() value by which the whole job must finish, or None.
+        
+    Returns:
+        Seconds the pass may take (None for no limit).
+        
+    Raises:
+        CompileTimeoutError: If the deadline has already passed.
+    """
+    if deadline is None:
+        return pass_timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise CompileTimeoutError("Job time budget exhausted before the next LaTeX pass.")
+    return remaining if pass_timeout is None else min(pass_timeout, remaining)
+
+def write_input_chunks(write_fd: int, chunks: Sequence[str]) -> None:
+    """Writes chunks to a pipe and closes it; stops quietly if the reader has gone away."""
+    try:
+        with open(write_fd, "wb") as pipe:
+            for chunk in chunks:
+                pipe.write(chunk.encode("utf-8"))
+    except OSError:
+        pass  # pdflatex stopped reading (it failed or was killed); its exit status tells why
+
+def run_latex_pass(
+    cmd: List[str],
+    timeout: Optional[float],
+    cancel_event: Optional[threading.Event] = None,
+    input_chunks: Optional[Sequence[str]] = None
+) -> subprocess.CompletedProcess:
+    """
+    Runs one pdflatex pass in its own process group.
+    
+    Args:
+        input_chunks: Optional document to feed to the engine's standard input, written
+            chunk by chunk from a separate thread while the output is collected.
+    
+    Raises:
+        subprocess.TimeoutExpired: If the pass exceeded timeout. The whole process group
+            (pdflatex and anything it spawned) has been killed by then.
+        CompileCancelledError: If cancel_event was set while the pass ran (killed likewise).
+    """
+    if input_chunks is None:
+        return _run_latex_process(cmd, subprocess.DEVNULL, timeout, cancel_event)
+    
+    read_fd, write_fd = os.pipe()
+    writer = threading.Thread(target=write_input_chunks, args=(write_fd, input_chunks), daemon=True)
+    
+    def start_writer() -> None:
+        # Only pdflatex may hold the read end, so the writer sees a broken pipe once it exits
+        os.close(read_fd)
+        writer.start()
+    
+    try:
+        return _run_latex_process(cmd, read_fd, timeout, cancel_event, on_start=start_writer)
+    finally:
+        if writer.ident is None:
+            # pdflatex could not be started
+            os.close(read_fd)
+            os.close(write_fd)
+        else:
+            writer.join()
+
+def _run_latex_process(
+    cmd: List[str],
+    stdin: Any,
+    timeout: Optional[float],
+    cancel_event: Optional[threading.Event],
+    on_start: Optional[Callable[[], None]] = None
+) -> subprocess.CompletedProcess:
+    """Runs cmd with the given stdin; on_start is called once the process exists."""
+    process = subprocess.Popen(
+        cmd,
+        stdin=stdin,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True
+    )
+    if on_start is not None:
+        on_start()
+    if cancel_event is None:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            tex_worker.kill_process_group(process)
+            raise
+        return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+    
+    # Wait in short slices so a cancellation is noticed promptly
+    pass_deadline = time.monotonic() + timeout if timeout is not None else None
+    while True:
+        if cancel_event.is_set():
+            tex_worker.kill_process_group(process)
+            raise CompileCancelledError("LaTeX pass cancelled.")
+        wait = CANCEL_POLL_INTERVAL_SECONDS
+        if pass_deadline is not None:
+            wait = min(wait, max(0.0, pass_deadline - time.monotonic()))
+        try:
+            stdout, stderr = process.communicate(timeout=wait)
+            return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+        except subprocess.TimeoutExpired:
+            if pass_deadline is not None and time.monotonic() >= pass_deadline:
+                tex_worker.kill_process_group(process)
+                raise subprocess.TimeoutExpired(cmd, timeout)
+
+def compile_latex(
+    tex_filepath: str,
+    fmt_path: Optional[str] = None,
+    worker_pool: Optional[tex_worker.TexWorkerPool] = None,
+    pass_timeout: Optional[float] = DEFAULT_PASS_TIMEOUT_SECONDS,
+    deadline: Optional[float] = None,
+    cancel_event: Optional[threading.Event] = None,
+    latex_chunks: Optional[Sequence[str]] = None
+) -> bool:
     """
     Compiles a .tex file into a PDF using pdflatex.
     
+    A second pass only runs when the first one changed the .aux/.out files or the
+    log asks for a rerun; a failed pass is retried once.
+    
     Args:
-        tex_filepath: The path to the .tex file to compile.
+        tex_filepath: The path to the .tex file to compile. With latex_chunks, it only
+            names the outputs (the job name and directory) and need not exist.
+        fmt_path: Optional precompiled preamble format (see get_preamble_format) to start from.
+        worker_pool: Optional pool of warm TeX workers to run passes on. Passes fall back
+            to a one-shot pdflatex run when the pool cannot take them.
+        pass_timeout: Seconds a single pass may take (None for no limit).
+        deadline: Optional time.monotonic() value by which all passes must be done.
+        cancel_event: Optional event that aborts the compile when set. Passes then always
+            run as one-shot pdflatex processes, since warm workers cannot be interrupted.
+        latex_chunks: Optional document to stream into pdflatex's standard input instead
+            of reading tex_filepath (requires STREAM_INPUT_PATH). Every pass streams it
+            again; passes run as one-shot processes.
         
     Returns:
         True if compilation was successful, False otherwise.
+        
+    Raises:
+        CompileTimeoutError: If a pass exceeded its budget (its processes are killed).
+        CompileCancelledError: If cancel_event was set (its processes are killed).
     """
     # Output directory for the PDF (same as the tex file directory)
     output_dir = os.path.dirname(tex_filepath)
@@ -63,46 +423,81 @@ def compile_latex(tex_filepath: str) -> bool:
     
     # Build the pdflatex command with appropriate options
     cmd = [
-        "pdflatex",
+        LATEX_ENGINE,
         "-interaction=nonstopmode",  # Don't stop for errors
         f"-output-directory={output_dir}",
         tex_filepath
     ]
+    if latex_chunks is not None:
+        # Outputs are named by the job name; the primitive \input reads the document from the pipe
+        cmd[-1:] = [f"-jobname={filename}", f"\\input {STREAM_INPUT_PATH}"]
+    if fmt_path:
+        # Skip re-reading the static preamble; the document guards it with PREAMBLE_LOADED_MACRO
+        cmd.insert(1, f"-fmt={fmt_path}")
+    
+    if latex_chunks is not None:
+        print(f"Compiling LaTeX streamed to {LATEX_ENGINE} as job '{filename}'")
+    else:
+        print(f"Compiling LaTeX file: {tex_filepath}")
     
-    print(f"Compiling LaTeX file: {tex_filepath}")
+    log_file = os.path.join(output_dir, f"{filename}.log")
     
     try:
-        # Run pdflatex twice to handle references, TOC, etc. (may not be needed for resumes)
-        for attempt in range(2):
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+        # A pass only needs repeating if it changed the auxiliary files or LaTeX asked for a rerun
+        aux_checksums = get_aux_file_checksums(output_dir, filename)
+        passes_run = 0
+        while passes_run < MAX_LATEX_PASSES:
+            timeout = get_pass_timeout(pass_timeout, deadline)
+            try:
+                result = None
+                if worker_pool is not None and cancel_event is None and latex_chunks is None:
+                    result = worker_pool.run_pass(tex_filepath, output_dir, timeout=timeout)
+                    if result is None:
+                        print("No warm TeX worker available, falling back to a one-shot compile.")
+                if result is None:
+                    result = run_latex_pass(cmd, timeout, cancel_event, input_chunks=latex_chunks)
+            except subprocess.TimeoutExpired:
+                print(f"LaTeX pass {passes_run + 1} timed out after {timeout:.1f}s; killed pdflatex.")
+                raise CompileTimeoutError(f"LaTeX pass timed out after {timeout:.1f}s.")
+            passes_run += 1
+            
+            log = latex_log.parse_latex_log(log_file)
             
             # Check if compilation was successful
             if result.returncode != 0:
-                print(f"Error during LaTeX compilation (attempt {attempt+1}):")
-                print(result.stderr or result.stdout)
+                print(f"Error during LaTeX compilation (pass {passes_run}):")
+                if log is not None and log.errors:
+                    print(log.format_errors())
+                else:
+                    print(result.stderr or result.stdout)
                 
-                # Try once more with the second attempt
-                if attempt == 0:
+                # Try once more if a pass is left, unless the log shows errors in the
+                # document itself, which another pass would only repeat
+                if passes_run < MAX_LATEX_PASSES and (log is None or not log.errors):
                     print("Retrying compilation...")
+                    aux_checksums = get_aux_file_checksums(output_dir, filename)
                     continue
                 
                 print("LaTeX compilation failed. Please check the .tex file and LaTeX installation.")
                 # Show path to .log file for debugging
-                log_file = os.path.join(output_dir, f"{filename}.log")
                 if os.path.exists(log_file):
                     print(f"LaTeX log file available at: {log_file}")
+                if latex_chunks is not None and not os.path.exists(tex_filepath):
+                    print("The document was streamed; rerun with --keep-tex to keep its .tex file.")
                 return False
             
-            # Success on this attempt - if it's the first, continue to the second run
-            if attempt == 0:
-                print("First pass successful, running second pass...")
+            new_aux_checksums = get_aux_file_checksums(output_dir, filename)
+            rerun_needed = new_aux_checksums != aux_checksums or (log is not None and log.rerun_requested)
+            aux_checksums = new_aux_checksums
+            if not rerun_needed:
+                if passes_run == 1:
+                    print("First pass successful, no rerun needed.")
+                report_box_warnings(log)
+                break
+            if passes_run < MAX_LATEX_PASSES:
+                print(f"Pass {passes_run} successful, rerun needed; running another pass...")
         
-        # If we reached here, both compilations were successful
+        # If we reached here, the last pass was successful
         pdf_path = os.path.join(output_dir, f"{filename}.pdf")
         if os.path.exists(pdf_path):
             print(f"PDF successfully created: {pdf_path}")
@@ -119,94 +514,1152 @@ def compile_latex(tex_filepath: str) -> bool:
         print("  - Windows: Install MiKTeX from https://miktex.org/download")
         return False
     
+    except (CompileTimeoutError, CompileCancelledError):
+        raise
+    
     except Exception as e:
         print(f"Unexpected error during LaTeX compilation: {e}")
         return False
 
-def get_pdf_page_count(pdf_path):
+def get_pdf_page_count(pdf_path: str) -> Optional[int]:
     """
     Get the number of pages in a PDF file.
     
+    The page tree is read in-process (see pdf_reader), touching only the end of the file
+    and the few objects needed. If the PDF cannot be parsed, the page count pdflatex wrote
+    to the log next to it is used instead.
+    
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path: Path to the PDF file
         
     Returns:
-        int or None: Number of pages in the PDF file, or None if not determinable
+        Number of pages in the PDF file, or None if not determinable (auto-sizing then
+        assumes the content did not fit)
     """
     print(f"Checking page count for: {pdf_path}")
     
-    # Method 1: Try using pdfinfo command (faster, less dependencies)
+    page_count = pdf_reader.read_pdf_page_count(pdf_path)
+    if page_count is not None:
+        print(f"PDF has {page_count} page(s)")
+        return page_count
+    
+    print("Could not read the PDF page tree, trying the LaTeX log...")
+    page_count = get_log_page_count(os.path.splitext(pdf_path)[0] + ".log")
+    if page_count is not None:
+        print(f"Found page count in log file: {page_count} page(s)")
+        return page_count
+    
+    print("Could not determine page count.")
+    return None
+
+def get_log_page_count(log_file: str) -> Optional[int]:
+    """Returns the page count from pdflatex's 'Output written on' log line, or None."""
+    log = latex_log.parse_latex_log(log_file)
+    return log.page_count if log is not None else None
+
+def report_box_warnings(log: Optional[latex_log.LatexLog]) -> None:
+    """Prints a one-line summary of the overfull boxes in a compile's log, if any."""
+    if log is None or not log.overfull_boxes:
+        return
+    worst = max(log.overfull_boxes, key=lambda b: b.amount_pt or 0.0)
+    where = f" at line {worst.first_line}" if worst.first_line is not None else ""
+    print(f"Warning: {len(log.overfull_boxes)} overfull box(es); worst is {worst.amount_pt or 0.0:.1f}pt too wide{where}.")
+
+def compile_and_count_pages(
+    latex_content: Union[str, Sequence[str]],
+    tex_filepath: str,
+    fmt_path: Optional[str] = None,
+    worker_pool: Optional[tex_worker.TexWorkerPool] = None,
+    pdf_cache: Optional[pdf_cache_module.PdfCache] = None,
+    pass_timeout: Optional[float] = DEFAULT_PASS_TIMEOUT_SECONDS,
+    deadline: Optional[float] = None,
+    cancel_event: Optional[threading.Event] = None,
+    stream_latex: bool = False,
+    keep_tex: bool = True
+) -> tuple[bool, Optional[int]]:
+    """
+    Writes latex_content to tex_filepath, compiles it and counts the pages of the PDF.
+    
+    With a pdf_cache, a document that was compiled before (same LaTeX source and engine
+    version) is copied from the cache instead of being compiled again.
+    
+    Args:
+        latex_content: The complete LaTeX document, as one string or in chunks.
+        tex_filepath: Where to write the .tex file; the PDF is created next to it.
+        fmt_path: Optional precompiled preamble format passed to compile_latex.
+        worker_pool: Optional warm TeX worker pool passed to compile_latex.
+        pdf_cache: Optional compiled-PDF cache.
+        pass_timeout: Per-pass time budget passed to compile_latex.
+        deadline: Job deadline passed to compile_latex.
+        cancel_event: Cancellation event passed to compile_latex.
+        stream_latex: Pipe the document into pdflatex instead of having it read the
+            .tex file (where STREAM_INPUT_PATH exists).
+        keep_tex: When streaming, still write the .tex file (for inspection only).
+        
+    Returns:
+        (compiled, page_count): whether a PDF was produced, and its page count (None if unknown).
+        
+    Raises:
+        CompileTimeoutError: If compilation ran out of time.
+        CompileCancelledError: If cancel_event was set during compilation.
+    """
+    pdf_filepath = os.path.splitext(tex_filepath)[0] + ".pdf"
+    latex_chunks = [latex_content] if isinstance(latex_content, str) else latex_content
+    stream_latex = stream_latex and os.path.exists(STREAM_INPUT_PATH)
+    
+    # Save .tex file
+    if not stream_latex or keep_tex:
+        with open(tex_filepath, 'w', encoding='utf-8') as f:
+            f.writelines(latex_chunks)
+        print(f"LaTeX content saved to {tex_filepath}")
+    
+    cache_key = None
+    if pdf_cache is not None:
+        cache_key = pdf_cache.make_key(latex_chunks, get_tex_version())
+        cached = pdf_cache.get(cache_key, pdf_filepath)
+        if cached is not None:
+            print(f"Using cached PDF for identical LaTeX content ({cached.get('page_count')} page(s)).")
+            return True, cached.get("page_count")
+    
+    # Compile .tex file
+    if not compile_latex(
+        tex_filepath,
+        fmt_path=fmt_path,
+        worker_pool=worker_pool,
+        pass_timeout=pass_timeout,
+        deadline=deadline,
+        cancel_event=cancel_event,
+        latex_chunks=latex_chunks if stream_latex else None
+    ):
+        return False, None
+    
+    page_count = get_pdf_page_count(pdf_filepath)
+    if cache_key is not None and page_count is not None:
+        pdf_cache.put(cache_key, pdf_filepath, page_count)
+    return True, page_count
+
+def read_content_height(log_file: str, tag: str) -> Optional[float]:
+    """
+    Reads a content height reported by the template (a '<tag>=<dimen>pt' log line).
+    Returns:
+        The height in inches, or None if the log has no such line.
+    """
+    log = latex_log.parse_latex_log(log_file, tags=(tag,))
+    value = log.tagged_values.get(tag) if log is not None else None
+    if value is None or not value.endswith("pt"):
+        return None
     try:
-        result = subprocess.run(
-            ["pdfinfo", pdf_path],
-            capture_output=True,
-            text=True,
-            check=False  # Don't raise exception on non-zero exit
+        return float(value[:-2]) / 72.27  # TeX points per inch
+    except ValueError:
+        return None
+
+def make_latex_renderer(
+    template_module: Any,
+    resume_data: Union[templates.Resume, Dict[str, Any]],
+    chunked: bool = False
+) -> Callable[[Optional[float]], Union[str, List[str]]]:
+    """
+    Returns a function that renders resume_data (preferably already normalized, see
+    templates.normalize_resume) at a given page height.
+    
+    Templates providing generate_latex_body() and assemble_latex_document() have the body
+    rendered once, on first use, and only the page geometry spliced in per call; others
+    fall back to generate_latex_content() on every call.
+    
+    Args:
+        chunked: Return each document as a list of chunks (see the template's
+            iter_latex_document()) rather than one joined string, for streaming.
+    """
+    if not hasattr(template_module, "generate_latex_body") or not hasattr(template_module, "assemble_latex_document"):
+        if chunked:
+            return lambda page_height: [template_module.generate_latex_content(resume_data, page_height=page_height)]
+        return lambda page_height: template_module.generate_latex_content(resume_data, page_height=page_height)
+    body: List[str] = []
+    
+    def render(page_height: Optional[float]) -> Union[str, List[str]]:
+        if not body:
+            body.append(template_module.generate_latex_body(resume_data))
+        if chunked and hasattr(template_module, "iter_latex_document"):
+            return list(template_module.iter_latex_document(body[0], page_height))
+        if chunked:
+            return [template_module.assemble_latex_document(body[0], page_height)]
+        return template_module.assemble_latex_document(body[0], page_height)
+    return render
+
+def page_height_from_measurement(template_module: Any, content_height_inches: float, minimum_page_height: float) -> float:
+    """
+    Converts a measured content height into the page height to compile at: the template's
+    margins plus MEASURE_SLACK_INCHES, rounded up to the 0.01in the templates print, and
+    never below minimum_page_height.
+    """
+    page_height = template_module.page_height_for_content(content_height_inches) + MEASURE_SLACK_INCHES
+    return max(minimum_page_height, math.ceil(page_height * 100) / 100)
+
+def measure_page_height(
+    resume_data: Union[templates.Resume, Dict[str, Any]],
+    template_module: Any,
+    tex_filepath: str,
+    minimum_page_height: float,
+    compile_options: Dict[str, Any]
+) -> Optional[float]:
+    """
+    Compiles the resume once on a MEASURE_PAGE_HEIGHT_INCHES tall page, with the template
+    reporting its content height in the log, and derives the page height that fits it.
+    
+    Args:
+        resume_data: The parsed JSON resume data, or a Resume normalized from it.
+        template_module: The loaded template module. It must provide page_height_for_content()
+            and CONTENT_HEIGHT_LOG_TAG, and accept report_content_height.
+        tex_filepath: Where to write the measuring .tex file.
+        minimum_page_height: Lower bound for the returned height.
+        compile_options: Keyword arguments for compile_and_count_pages().
+        
+    Returns:
+        The page height in inches, or None if the template does not support measuring or
+        the measurement failed.
+        
+    Raises:
+        CompileTimeoutError: If the measuring compile ran out of time.
+    """
+    if not hasattr(template_module, "page_height_for_content") or not hasattr(template_module, "CONTENT_HEIGHT_LOG_TAG"):
+        print("Template does not support content height measurement.")
+        return None
+    
+    print(f"Measuring content height on a {MEASURE_PAGE_HEIGHT_INCHES:.0f}-inch page...")
+    latex_content = template_module.generate_latex_content(
+        resume_data, page_height=MEASURE_PAGE_HEIGHT_INCHES, report_content_height=True
+    )
+    # The height is read from the log, which a cached PDF does not come with
+    compiled, page_count = compile_and_count_pages(latex_content, tex_filepath, **dict(compile_options, pdf_cache=None))
+    if not compiled or page_count != 1:
+        print("Measurement compile did not produce a single page.")
+        return None
+    
+    log_file = os.path.splitext(tex_filepath)[0] + ".log"
+    content_height = read_content_height(log_file, template_module.CONTENT_HEIGHT_LOG_TAG)
+    if content_height is None:
+        print("No content height found in the LaTeX log.")
+        return None
+    page_height = page_height_from_measurement(template_module, content_height, minimum_page_height)
+    print(f"Measured content height: {content_height:.2f} inches -> page height {page_height:.2f} inches")
+    return page_height
+
+def speculative_candidate_heights(initial_page_height: float) -> List[float]:
+    """Returns the page heights incremental_sizing() would try, smallest first."""
+    return [initial_page_height + i * PAGE_HEIGHT_INCREMENT_INCHES for i in range(MAX_AUTO_SIZE_ATTEMPTS)]
+
+def decide_speculative_winner(statuses: List[Optional[str]]) -> Optional[int]:
+    """
+    Picks the candidate whose outcome decides a speculative sizing run, or None while undecided.
+    
+    Candidates are checked in height order, exactly like the incremental loop: the first
+    one that did not come out multi-page decides (it fit, failed or timed out). If every
+    candidate came out multi-page, the tallest decides. A candidate that is still running
+    (None) blocks the decision, since it might fit.
+    
+    Args:
+        statuses: One RESULT_* constant, or None if not finished yet, per candidate.
+    """
+    for index, status in enumerate(statuses):
+        if status is None:
+            return None
+        if status != RESULT_MULTI_PAGE:
+            return index
+    return len(statuses) - 1 if statuses else None
+
+def copy_candidate_outputs(build_dir: str, tex_filepath: str) -> None:
+    """Copies a speculative candidate's .tex/.pdf/.log files from its build_dir next to tex_filepath."""
+    filename = os.path.splitext(os.path.basename(tex_filepath))[0]
+    for ext in CANDIDATE_OUTPUT_EXTENSIONS:
+        src = os.path.join(build_dir, f"{filename}{ext}")
+        if os.path.exists(src):
+            shutil.copy2(src, os.path.join(os.path.dirname(tex_filepath), f"{filename}{ext}"))
+
+def speculative_sizing(
+    render_latex: Callable[[Optional[float]], Union[str, List[str]]],
+    tex_filepath: str,
+    initial_page_height: float,
+    compile_options: Dict[str, Any],
+    max_parallel_compiles: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compiles every candidate height of the incremental strategy at once and keeps the
+    smallest that fits on one page.
+    
+    Each candidate is built in its own scratch directory on a thread pool. As soon as the
+    outcome is decided (see decide_speculative_winner), the remaining candidates are
+    cancelled: queued ones never start and running pdflatex processes are killed. The
+    winner's .tex/.pdf/.log files are then copied to tex_filepath's directory.
+    
+    Args:
+        render_latex: Renders the resume at a page height (see make_latex_renderer).
+        tex_filepath: Where the winning .tex file should end up; the PDF is placed next to it.
+        initial_page_height: The smallest candidate height.
+        compile_options: Keyword arguments for compile_and_count_pages(). A worker pool in
+            them is not used, since warm workers cannot be cancelled.
+        max_parallel_compiles: Candidates compiled at the same time (default: number of CPUs).
+        
+    Returns:
+        The 'status', 'page_height', 'page_count' and 'compiles' fields of a generate_resume() result.
+    """
+    heights = speculative_candidate_heights(initial_page_height)
+    max_workers = max(1, min(max_parallel_compiles or os.cpu_count() or 1, len(heights)))
+    filename = os.path.splitext(os.path.basename(tex_filepath))[0]
+    build_dirs = [tempfile.mkdtemp(prefix="resume-candidate-") for _ in heights]
+    options = dict(compile_options, worker_pool=None)
+    cancel_event = threading.Event()
+    
+    def compile_candidate(index: int) -> tuple[bool, Optional[int]]:
+        if cancel_event.is_set():
+            raise CompileCancelledError("Candidate no longer needed.")
+        latex_content = render_latex(heights[index])
+        candidate_tex = os.path.join(build_dirs[index], f"{filename}.tex")
+        return compile_and_count_pages(latex_content, candidate_tex, cancel_event=cancel_event, **options)
+    
+    print(f"Compiling {len(heights)} candidate page heights "
+          f"({', '.join(f'{h:.2f}' for h in heights)} inches) with {max_workers} parallel compile(s)...")
+    statuses: List[Optional[str]] = [None] * len(heights)
+    page_counts: List[Optional[int]] = [None] * len(heights)
+    compiles = 0
+    winner = None
+    executor = concurrent_futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(compile_candidate, i): i for i in range(len(heights))}
+        for future in concurrent_futures.as_completed(futures):
+            index = futures[future]
+            try:
+                compiled, page_count = future.result()
+            except CompileCancelledError:
+                continue
+            except CompileTimeoutError as e:
+                print(f"Candidate {heights[index]:.2f} inches timed out: {e}")
+                statuses[index] = RESULT_TIMEOUT
+            else:
+                page_counts[index] = page_count
+                if not compiled:
+                    statuses[index] = RESULT_FAILED
+                elif page_count is not None and page_count <= 1:
+                    statuses[index] = RESULT_SUCCESS
+                else:
+                    statuses[index] = RESULT_MULTI_PAGE
+            compiles += 1
+            winner = decide_speculative_winner(statuses)
+            if winner is not None:
+                break
+    finally:
+        cancel_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+    
+    try:
+        if winner is None:
+            return {"status": RESULT_FAILED, "page_height": None, "page_count": None, "compiles": compiles}
+        cancelled = len(heights) - compiles
+        if cancelled:
+            print(f"Outcome decided by the {heights[winner]:.2f}-inch candidate; cancelled {cancelled} other candidate(s).")
+        copy_candidate_outputs(build_dirs[winner], tex_filepath)
+        return {
+            "status": statuses[winner],
+            "page_height": heights[winner],
+            "page_count": page_counts[winner],
+            "compiles": compiles
+        }
+    finally:
+        for build_dir in build_dirs:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+def generate_resume(
+    resume_data: Union[templates.Resume, Dict[str, Any]],
+    template_module: Any,
+    tex_filepath: str,
+    page_height: Optional[float] = None,
+    auto_size: bool = True,
+    fmt_path: Optional[str] = None,
+    worker_pool: Optional[tex_worker.TexWorkerPool] = None,
+    pdf_cache: Optional[pdf_cache_module.PdfCache] = None,
+    pass_timeout: Optional[float] = DEFAULT_PASS_TIMEOUT_SECONDS,
+    job_timeout: Optional[float] = DEFAULT_JOB_TIMEOUT_SECONDS,
+    sizing: str = SIZING_INCREMENTAL,
+    size_tolerance: float = DEFAULT_SIZE_TOLERANCE_INCHES,
+    max_parallel_compiles: Optional[int] = None,
+    sizing_memo: Optional[sizing_memo_module.SizingMemo] = None,
+    height_model: Optional[height_model_module.HeightModel] = None,
+    stream_latex: bool = False,
+    keep_tex: bool = True
+) -> Dict[str, Any]:
+    """
+    Renders resume_data with the template and compiles it, auto-sizing the page if requested.
+    
+    Args:
+        resume_data: The parsed JSON resume data, or the Resume normalized from it.
+        template_module: The loaded template module (see templates.load_template).
+        tex_filepath: Where to write the .tex file; the PDF is created next to it.
+        page_height: Initial page height in inches. None uses the default (or the template's
+            default when auto-sizing is disabled).
+        auto_size: Grow the page height until the content fits on one page.
+        fmt_path: Optional precompiled preamble format passed to compile_latex.
+        worker_pool: Optional warm TeX worker pool passed to compile_latex.
+        pdf_cache: Optional compiled-PDF cache (see compile_and_count_pages).
+        pass_timeout: Seconds a single pdflatex pass may take (None for no limit).
+        job_timeout: Seconds all compilations for this resume may take together (None for no limit).
+        sizing: Auto-sizing strategy (one of SIZING_STRATEGIES). With SIZING_MEASURE the
+            incremental steps start from the measured height and normally end after one compile.
+        size_tolerance: Precision in inches of SIZING_BISECT.
+        max_parallel_compiles: Candidates compiled at the same time by SIZING_SPECULATIVE
+            (default: number of CPUs).
+        sizing_memo: Optional memo of heights that fitted before. On a hit, sizing starts at
+            the remembered height (skipping measuring and speculation) and usually needs
+            one confirming compile; successful results are remembered.
+        height_model: Optional page height predictor. Its prediction seeds the bisection,
+            incremental and speculative strategies, and it learns from bisection and
+            measurement results, whose heights are tight.
+        stream_latex: Pipe each document into pdflatex in chunks instead of writing and
+            re-reading a .tex file (see compile_and_count_pages).
+        keep_tex: When streaming, still write the .tex file.
+        
+    Returns:
+        A dict with 'status' (one of the RESULT_* constants), 'pdf_path',
+        'page_height' (the last height compiled), 'page_count' (None if unknown) and
+        'compiles' (the number of documents compiled or taken from the cache).
+        A timeout ends the job with RESULT_TIMEOUT rather than RESULT_FAILED.
+    """
+    deadline = time.monotonic() + job_timeout if job_timeout else None
+    compile_options = {
+        "fmt_path": fmt_path,
+        "worker_pool": worker_pool,
+        "pdf_cache": pdf_cache,
+        "pass_timeout": pass_timeout,
+        "deadline": deadline,
+        "stream_latex": stream_latex,
+        "keep_tex": keep_tex
+    }
+    pdf_filepath = os.path.splitext(tex_filepath)[0] + ".pdf"
+    initial_page_height = page_height if page_height is not None else DEFAULT_INITIAL_PAGE_HEIGHT_INCHES
+    result = {"status": RESULT_FAILED, "pdf_path": pdf_filepath, "page_height": page_height, "page_count": None, "compiles": 0}
+    
+    print(f"Generating LaTeX content with initial page height: {initial_page_height} inches (auto-sizing: {'enabled' if auto_size else 'disabled'})")
+    
+    # Key variants are resolved once here; every render of this resume reuses the model
+    resume = templates.normalize_resume(resume_data)
+    render_latex = make_latex_renderer(template_module, resume, chunked=stream_latex)
+    
+    # Handle the case when auto-sizing is disabled
+    if not auto_size:
+        latex_content = render_latex(page_height) # None: template handles default
+        
+        result["compiles"] = 1
+        try:
+            compiled, result["page_count"] = compile_and_count_pages(latex_content, tex_filepath, **compile_options)
+        except CompileTimeoutError as e:
+            print(f"LaTeX compilation timed out: {e}")
+            result["status"] = RESULT_TIMEOUT
+            return result
+        if compiled:
+            print(f"Resume PDF generated successfully: {pdf_filepath}")
+            result["status"] = RESULT_SUCCESS
+        else:
+            print("Failed to compile the LaTeX content.")
+        return result
+    
+    # Auto-sizing loop implementation
+    print("Starting auto-sizing process to fit content on one page...")
+    
+    # A resume sized before with the same settings starts at the height that fitted it then
+    memo_key = None
+    remembered = None
+    if sizing_memo is not None:
+        # Keyed on the normalized model, so both key styles of the same resume share an entry
+        memo_key = sizing_memo.make_key(
+            resume, template_module, sizing_memo_variant(sizing, initial_page_height, size_tolerance)
         )
+        remembered = sizing_memo.get(memo_key)
+    
+    features = None
+    predicted_height = None
+    if height_model is not None and remembered is None:
+        latex_content = render_latex(initial_page_height)
+        features = height_model_module.extract_features(latex_content if isinstance(latex_content, str) else "".join(latex_content))
+        if sizing != SIZING_MEASURE:
+            predicted_height = height_model.predict(template_module.__name__, features)
+            if predicted_height is not None:
+                print(f"Predicted page height from earlier runs: {predicted_height:.2f} inches")
+    
+    if remembered is not None:
+        print(f"Sizing memo: this resume (or a nearly identical one) fitted at {remembered['page_height']:.2f} inches before; starting from that height.")
+        # The requested strategy starts from the remembered height, so its result is one the strategy
+        # would have chosen anyway (bisection still finds the tightest fit, in either direction)
+        sizing_steps = make_sizing_steps(sizing, initial_page_height, size_tolerance, predicted_page_height=remembered["page_height"])
+        run_sizing_steps(sizing_steps, render_latex, tex_filepath, compile_options, result)
+    elif sizing == SIZING_SPECULATIVE:
+        if predicted_height is not None:
+            initial_page_height = max(initial_page_height, predicted_height)
+        result.update(speculative_sizing(
+            render_latex, tex_filepath, initial_page_height, compile_options, max_parallel_compiles
+        ))
+    else:
+        if sizing == SIZING_MEASURE:
+            result["compiles"] += 1
+            try:
+                measured_height = measure_page_height(resume, template_module, tex_filepath, initial_page_height, compile_options)
+            except CompileTimeoutError as e:
+                print(f"LaTeX compilation timed out: {e} Aborting auto-sizing.")
+                result["status"] = RESULT_TIMEOUT
+                report_auto_size_result(result)
+                return result
+            if measured_height is not None:
+                initial_page_height = measured_height
+            else:
+                print("Falling back to incremental sizing.")
+        sizing_steps = make_sizing_steps(sizing, initial_page_height, size_tolerance, predicted_height)
+        run_sizing_steps(sizing_steps, render_latex, tex_filepath, compile_options, result)
+    
+    if memo_key is not None and result["status"] == RESULT_SUCCESS and \
+            (remembered is None or remembered["page_height"] != result["page_height"]):
+        sizing_memo.put(memo_key, result["page_height"], result["page_count"])
+    # Incremental heights overshoot by up to a step; training on them would skew predictions upwards
+    if features is not None and result["status"] == RESULT_SUCCESS and sizing in (SIZING_BISECT, SIZING_MEASURE):
+        height_model.record(template_module.__name__, features, result["page_height"])
+    report_auto_size_result(result)
+    return result
+
+def sizing_memo_variant(sizing: str, initial_page_height: float, size_tolerance: float) -> str:
+    """
+    Describes the sizing settings that affect which height a resume ends up with, for the
+    sizing memo key. Incremental, measure and speculative sizing all aim for the first fitting
+    incremental height, bisection for the tightest one.
+    """
+    if sizing == SIZING_BISECT:
+        return f"bisect:{initial_page_height:.2f}:{max(size_tolerance, MIN_SIZE_TOLERANCE_INCHES):.2f}"
+    return f"incremental:{initial_page_height:.2f}"
+
+def run_sizing_steps(
+    sizing_steps: Generator[float, Optional[int], None],
+    render_latex: Callable[[Optional[float]], Union[str, List[str]]],
+    tex_filepath: str,
+    compile_options: Dict[str, Any],
+    result: Dict[str, Any]
+) -> None:
+    """
+    Drives a sizing strategy generator: renders and compiles each height it yields and
+    sends back the page count. Updates result (see generate_resume) in place.
+    """
+    current_page_height = next(sizing_steps)
+    while True:
+        result["page_height"] = current_page_height
+        
+        # Generate LaTeX with current height
+        latex_content = render_latex(current_page_height)
+        
+        result["compiles"] += 1
+        try:
+            compiled, page_count = compile_and_count_pages(latex_content, tex_filepath, **compile_options)
+        except CompileTimeoutError as e:
+            # Unlike a LaTeX error, more page height will not help a runaway compile; stop here
+            print(f"LaTeX compilation timed out: {e} Aborting auto-sizing.")
+            result["status"] = RESULT_TIMEOUT
+            break
+        if not compiled:
+            print("LaTeX compilation failed. Aborting auto-sizing.")
+            result["status"] = RESULT_FAILED
+            break
+        
+        result["page_count"] = page_count
+        result["status"] = RESULT_SUCCESS if page_count is not None and page_count <= 1 else RESULT_MULTI_PAGE
+        try:
+            current_page_height = sizing_steps.send(page_count)
+        except StopIteration:
+            break
+
+def incremental_sizing(initial_page_height: float) -> Generator[float, Optional[int], None]:
+    """
+    The default auto-sizing strategy: grow the page by PAGE_HEIGHT_INCREMENT_INCHES until the
+    content fits on one page, for at most MAX_AUTO_SIZE_ATTEMPTS attempts.
+    
+    Written as a generator so the sync and async drivers share it: it yields the next
+    page height to compile and receives that attempt's page count (None if unknown).
+    It stops once the content fits or the attempts are used up.
+    """
+    current_page_height = initial_page_height
+    for attempt in range(1, MAX_AUTO_SIZE_ATTEMPTS + 1):
+        print(f"Attempt {attempt}/{MAX_AUTO_SIZE_ATTEMPTS}: Using page height of {current_page_height:.2f} inches")
+        page_count = yield current_page_height
+        if page_count is not None and page_count <= 1:
+            print("Success! Content fits on a single page.")
+            return
+        
+        if page_count is None:
+            # If we can't determine page count, assume it needs more space
+            print("Could not determine page count. Assuming multiple pages and increasing height.")
+            page_count = 2  # Default to assume it needs more space
         
-        if result.returncode != 0:
-            print(f"Error running pdfinfo: {result.stderr}")
+        # Need to increase page height and try again
+        if attempt < MAX_AUTO_SIZE_ATTEMPTS:  # Still have more attempts
+            print(f"Content currently spans {page_count} pages. Increasing page height...")
+            current_page_height += PAGE_HEIGHT_INCREMENT_INCHES
+            print(f"New page height: {current_page_height:.2f} inches")
         else:
-            # Parse the output to get page count
-            for line in result.stdout.splitlines():
-                if line.startswith("Pages:"):
-                    try:
-                        page_count = int(line.split(":", 1)[1].strip())
-                        print(f"PDF has {page_count} page(s)")
-                        return page_count
-                    except (IndexError, ValueError) as e:
-                        print(f"Error parsing page count: {e}")
-    except FileNotFoundError:
-        print("pdfinfo command not found, trying alternative method...")
+            print(f"Maximum attempts reached. Content still spans {page_count} pages.")
+
+def bisect_sizing(
+    initial_page_height: float,
+    tolerance: float = DEFAULT_SIZE_TOLERANCE_INCHES,
+    first_guess: Optional[float] = None
+) -> Generator[float, Optional[int], None]:
+    """
+    Auto-sizing strategy that finds the smallest fitting page height to within tolerance.
+    
+    Starting at initial_page_height (also the smallest height it will return), it grows the
+    page by doubling steps until the content fits, up to MAX_PAGE_HEIGHT_INCHES, and then
+    bisects between the tallest height that did not fit and the smallest that did. This takes
+    a logarithmic number of compiles. If the last compile was not at the best fitting height,
+    that height is yielded once more, so the PDF left on disk is always the chosen one.
+    
+    With a first_guess (e.g. a predicted height) the search starts there instead, and the
+    bracket is found by doubling steps of PREDICTED_HEIGHT_STEP_INCHES, down if the guess
+    fits and up if it does not.
+    
+    Same protocol as incremental_sizing().
+    """
+    tolerance = max(tolerance, MIN_SIZE_TOLERANCE_INCHES)
+    too_short = None  # Tallest height known not to fit
+    fits = None       # Smallest height known to fit
+    step = PAGE_HEIGHT_INCREMENT_INCHES
+    down_step = PAGE_HEIGHT_INCREMENT_INCHES
+    current_page_height = initial_page_height
+    if first_guess is not None and first_guess > initial_page_height:
+        current_page_height = min(first_guess, MAX_PAGE_HEIGHT_INCHES)
+        step = down_step = PREDICTED_HEIGHT_STEP_INCHES
+    attempt = 0
+    while True:
+        attempt += 1
+        print(f"Attempt {attempt}: Using page height of {current_page_height:.2f} inches")
+        page_count = yield current_page_height
+        if page_count is not None and page_count <= 1:
+            fits = current_page_height
+        else:
+            if page_count is None:
+                print("Could not determine page count. Assuming multiple pages.")
+            too_short = current_page_height
+        
+        if fits is None:
+            # Still bracketing: grow in doubling steps
+            if current_page_height >= MAX_PAGE_HEIGHT_INCHES:
+                print(f"Content does not fit on one page even at {MAX_PAGE_HEIGHT_INCHES:.2f} inches.")
+                return
+            current_page_height = min(round(current_page_height + step, 2), MAX_PAGE_HEIGHT_INCHES)
+            step *= 2
+            continue
+        if too_short is None:
+            # Fits already: look for a height that does not, unless at the minimum
+            if fits <= initial_page_height:
+                break
+            current_page_height = max(initial_page_height, round(fits - down_step, 2))
+            down_step *= 2
+            continue
+        if fits - too_short <= tolerance + 1e-9:  # Heights are rounded to 0.01; ignore float noise
+            break
+        midpoint = round((too_short + fits) / 2, 2)
+        if not too_short < midpoint < fits:
+            break
+        current_page_height = midpoint
+    
+    print(f"Success! Smallest fitting page height is {fits:.2f} inches (within {tolerance:.2f} inches).")
+    if current_page_height != fits:
+        print(f"Final compile at {fits:.2f} inches.")
+        yield fits
+
+def make_sizing_steps(
+    sizing: str,
+    initial_page_height: float,
+    size_tolerance: float = DEFAULT_SIZE_TOLERANCE_INCHES,
+    predicted_page_height: Optional[float] = None
+) -> Generator[float, Optional[int], None]:
+    """
+    Returns the strategy generator driving the auto-sizing loop for a SIZING_* value.
+    A predicted_page_height is bisection's first guess, and the incremental start if taller.
+    """
+    if sizing == SIZING_BISECT:
+        return bisect_sizing(initial_page_height, size_tolerance, first_guess=predicted_page_height)
+    # SIZING_MEASURE only picks the starting height; the steps after it are incremental
+    if predicted_page_height is not None:
+        initial_page_height = max(initial_page_height, predicted_page_height)
+    return incremental_sizing(initial_page_height)
+
+def report_auto_size_result(result: Dict[str, Any]) -> None:
+    """Prints the outcome of an auto-sizing run (see generate_resume) with hints on failure."""
+    if result.get("compiles"):
+        print(f"Compiles used: {result['compiles']}")
+    if result["status"] == RESULT_SUCCESS:
+        print(f"Auto-sizing successful. Final page height: {result['page_height']:.2f} inches.")
+    elif result["status"] == RESULT_TIMEOUT:
+        print("Auto-sizing stopped because compilation exceeded its time budget.")
+        print("Check the input for very long unbreakable text or unusual characters, or raise --pass-timeout/--job-timeout.")
+    else:
+        print("Auto-sizing completed without achieving one-page layout.")
+        print("You may need to:")
+        print("  1. Edit the input data to reduce content")
+        print("  2. Try with a larger initial page height")
+        print("  3. Try with a larger height increment")
+        print("  4. Disable auto-sizing (--no-auto-size) and manually adjust the content")
+
+def find_batch_inputs(pattern: str) -> List[str]:
+    """
+    Expands a --batch argument into the JSON files it refers to.
+    Args:
+        pattern: A directory (all *.json files in it) or a glob pattern.
+    Returns:
+        Sorted list of matching file paths.
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.json")
+    return sorted(p for p in glob.glob(pattern) if os.path.isfile(p))
+
+# PDF caches of this worker process, kept across its batch jobs so their size tracking carries over
+_worker_pdf_caches: Dict[tuple[str, int], pdf_cache_module.PdfCache] = {}
+
+def get_worker_pdf_cache(cache_dir: str, max_bytes: int) -> pdf_cache_module.PdfCache:
+    """Returns this process's PdfCache for the directory and bound, creating it on first use."""
+    pdf_cache = _worker_pdf_caches.get((cache_dir, max_bytes))
+    if pdf_cache is None:
+        pdf_cache = _worker_pdf_caches[(cache_dir, max_bytes)] = pdf_cache_module.PdfCache(cache_dir, max_bytes)
+    return pdf_cache
+
+# Height models of this worker process, kept across its batch jobs so the history is read incrementally
+_worker_height_models: Dict[str, height_model_module.HeightModel] = {}
+
+def get_worker_height_model(history_path: str) -> height_model_module.HeightModel:
+    """Returns this process's HeightModel for the history file, creating it on first use."""
+    height_model = _worker_height_models.get(history_path)
+    if height_model is None:
+        height_model = _worker_height_models[history_path] = height_model_module.HeightModel(history_path)
+    return height_model
+
+# Sizing memos of this worker process, kept across its batch jobs so the memo is read incrementally
+_worker_sizing_memos: Dict[str, sizing_memo_module.SizingMemo] = {}
+
+def get_worker_sizing_memo(memo_path: str) -> sizing_memo_module.SizingMemo:
+    """Returns this process's SizingMemo for the memo file, creating it on first use."""
+    sizing_memo = _worker_sizing_memos.get(memo_path)
+    if sizing_memo is None:
+        sizing_memo = _worker_sizing_memos[memo_path] = sizing_memo_module.SizingMemo(memo_path)
+    return sizing_memo
+
+def run_batch_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generates one resume of a batch. Runs in a worker process.
+    
+    The job is built in its own scratch directory, so .aux/.log files of concurrent jobs
+    never collide; only the final PDF (and the LaTeX log on failure) is copied to the
+    output directory. The generator's console output is suppressed to keep the batch log readable.
+    
+    Args:
+        job: Dict with 'input_path', 'output_name', 'output_dir', 'template_name',
+            'page_height', 'auto_size', 'fmt_path', 'cache_dir' (None disables the PDF
+            cache), 'cache_max_bytes', 'pass_timeout', 'job_timeout', 'sizing',
+            'size_tolerance', 'sizing_memo_path' (None disables the sizing memo),
+            'height_history_path' (None disables height prediction) and 'stream_latex'.
+            An optional 'resume_data' (the parsed record) is used instead of reading
+            'input_path', which then only names the job in reports.
+    Returns:
+        Dict with 'input_path', 'status', 'pdf_path', 'seconds', 'error' and
+        'section_cache_hits'/'section_cache_misses' (renders of this job served from / added
+        to the worker's section cache, if the template has one).
+    """
+    start_time = time.perf_counter()
+    outcome = {
+        "input_path": job["input_path"], "status": RESULT_FAILED, "pdf_path": None, "error": None,
+        "section_cache_hits": 0, "section_cache_misses": 0
+    }
+    build_dir = tempfile.mkdtemp(prefix="resume-build-")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            resume_data = job["resume_data"] if "resume_data" in job else load_json_data(job["input_path"])
+            if resume_data is None:
+                outcome["error"] = "could not load JSON data"
+            else:
+                template_module = templates.load_template(job["template_name"])
+                # The worker process keeps its section cache across the jobs it runs
+                section_cache = getattr(template_module, "SECTION_CACHE", None)
+                cache_stats_before = section_cache.stats() if section_cache is not None else None
+                tex_filepath = os.path.join(build_dir, f"{job['output_name']}.tex")
+                result = generate_resume(
+                    resume_data,
+                    template_module,
+                    tex_filepath,
+                    page_height=job["page_height"],
+                    auto_size=job["auto_size"],
+                    fmt_path=job["fmt_path"],
+                    pdf_cache=get_worker_pdf_cache(job["cache_dir"], job["cache_max_bytes"]) if job["cache_dir"] else None,
+                    pass_timeout=job["pass_timeout"],
+                    job_timeout=job["job_timeout"],
+                    sizing=job["sizing"],
+                    size_tolerance=job["size_tolerance"],
+                    # The process pool already keeps every CPU busy
+                    max_parallel_compiles=1,
+                    sizing_memo=get_worker_sizing_memo(job["sizing_memo_path"]) if job["sizing_memo_path"] else None,
+                    height_model=get_worker_height_model(job["height_history_path"]) if job["height_history_path"] else None,
+                    stream_latex=job["stream_latex"],
+                    # The build directory is discarded anyway
+                    keep_tex=False
+                )
+                outcome["status"] = result["status"]
+                if cache_stats_before is not None:
+                    cache_stats = section_cache.stats()
+                    outcome["section_cache_hits"] = cache_stats["hits"] - cache_stats_before["hits"]
+                    outcome["section_cache_misses"] = cache_stats["misses"] - cache_stats_before["misses"]
+                if os.path.exists(result["pdf_path"]) and result["status"] in (RESULT_SUCCESS, RESULT_MULTI_PAGE):
+                    outcome["pdf_path"] = os.path.join(job["output_dir"], f"{job['output_name']}.pdf")
+                    shutil.copy2(result["pdf_path"], outcome["pdf_path"])
+                else:
+                    outcome["error"] = "LaTeX compilation timed out" if result["status"] == RESULT_TIMEOUT else "LaTeX compilation failed"
+                    log_file = os.path.splitext(tex_filepath)[0] + ".log"
+                    if os.path.exists(log_file):
+                        shutil.copy2(log_file, os.path.join(job["output_dir"], f"{job['output_name']}.log"))
     except Exception as e:
-        print(f"Unexpected error running pdfinfo: {e}")
+        outcome["status"] = RESULT_FAILED
+        outcome["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+    outcome["seconds"] = time.perf_counter() - start_time
+    return outcome
+
+def run_batch(
+    input_paths: List[str],
+    template_name: str,
+    output_dir: str,
+    max_workers: int,
+    page_height: Optional[float] = None,
+    auto_size: bool = True,
+    fmt_path: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    cache_max_bytes: Optional[int] = None,
+    pass_timeout: Optional[float] = DEFAULT_PASS_TIMEOUT_SECONDS,
+    job_timeout: Optional[float] = DEFAULT_JOB_TIMEOUT_SECONDS,
+    sizing: str = SIZING_INCREMENTAL,
+    size_tolerance: float = DEFAULT_SIZE_TOLERANCE_INCHES,
+    sizing_memo_path: Optional[str] = None,
+    height_history_path: Optional[str] = None,
+    stream_latex: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Generates a resume for every input file on a bounded pool of worker processes
+    and prints a throughput/failure summary.
+    
+    Outputs are named after the input files (<stem>.pdf); inputs sharing a stem get
+    a numeric suffix.
+    
+    cache_max_bytes defaults to the PDF cache's DEFAULT_CACHE_MAX_BYTES.
+    
+    Returns:
+        The per-job outcomes (see run_batch_job), in completion order.
+    """
+    if cache_max_bytes is None:
+        cache_max_bytes = pdf_cache_module.DEFAULT_CACHE_MAX_BYTES
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = []
+    used_names = set()
+    for input_path in input_paths:
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        output_name, n = stem, 1
+        while output_name in used_names:
+            n += 1
+            output_name = f"{stem}_{n}"
+        used_names.add(output_name)
+        jobs.append({
+            "input_path": input_path,
+            "output_name": output_name,
+            "output_dir": output_dir,
+            "template_name": template_name,
+            "page_height": page_height,
+            "auto_size": auto_size,
+            "fmt_path": fmt_path,
+            "cache_dir": cache_dir,
+            "cache_max_bytes": cache_max_bytes,
+            "pass_timeout": pass_timeout,
+            "job_timeout": job_timeout,
+            "sizing": sizing,
+            "size_tolerance": size_tolerance,
+            "sizing_memo_path": sizing_memo_path,
+            "height_history_path": height_history_path,
+            "stream_latex": stream_latex
+        })
+    
+    print(f"Processing {len(jobs)} file(s) with {max_workers} worker process(es)...")
+    start_time = time.perf_counter()
+    outcomes = []
+    with concurrent_futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_batch_job, job) for job in jobs]
+        for future in concurrent_futures.as_completed(futures):
+            outcome = future.result()
+            outcomes.append(outcome)
+            print(f"  [{len(outcomes)}/{len(jobs)}] {outcome['input_path']}: {outcome['status']} ({outcome['seconds']:.2f}s)")
+    elapsed = time.perf_counter() - start_time
     
-    # Method 2: Use grep to search for "Page" in the LaTeX log file
-    log_file = pdf_path.replace('.pdf', '.log')
-    if os.path.exists(log_file):
+    failed = [o for o in outcomes if o["status"] == RESULT_FAILED]
+    timed_out = [o for o in outcomes if o["status"] == RESULT_TIMEOUT]
+    multi_page = [o for o in outcomes if o["status"] == RESULT_MULTI_PAGE]
+    succeeded = len(outcomes) - len(failed) - len(timed_out) - len(multi_page)
+    throughput = len(outcomes) / elapsed if elapsed > 0 else 0.0
+    print(f"\nBatch finished: {len(outcomes)} resume(s) in {elapsed:.2f}s ({throughput:.2f} resumes/s)")
+    print(f"  Succeeded: {succeeded}")
+    print(f"  Multi-page (auto-sizing could not fit one page): {len(multi_page)}")
+    print(f"  Timed out: {len(timed_out)}")
+    for outcome in timed_out:
+        print(f"    - {outcome['input_path']}")
+    print(f"  Failed: {len(failed)}")
+    for outcome in failed:
+        print(f"    - {outcome['input_path']}: {outcome['error']}")
+    section_hits = sum(o["section_cache_hits"] for o in outcomes)
+    section_misses = sum(o["section_cache_misses"] for o in outcomes)
+    if section_hits or section_misses:
+        print(f"  Section cache: {section_hits} hit(s), {section_misses} miss(es) "
+              f"({100.0 * section_hits / (section_hits + section_misses):.0f}% reused)")
+    return outcomes
+
+def run_stream(
+    input_path: str,
+    stream_format: str,
+    template_name: str,
+    output_base: str,
+    output_dir: str,
+    max_workers: int,
+    queue_size: int = DEFAULT_STREAM_QUEUE_SIZE,
+    **job_options: Any
+) -> Dict[str, int]:
+    """
+    Generates a resume for every record of a JSONL file or JSON array (see record_stream)
+    on a bounded pool of worker processes and prints a summary.
+
+    Records are read lazily and handed to the workers through a queue of at most
+    queue_size records; reading blocks while the queue is full, so memory use stays flat
+    however large the input is. A record that cannot be decoded or rendered is reported
+    with its position and offset in the input, and the stream continues with the next one.
+    Outputs are named <output_base>_<record number>.pdf.
+
+    Args:
+        job_options: The remaining job fields of run_batch_job ('page_height', 'auto_size',
+            'fmt_path', 'cache_dir', 'cache_max_bytes', 'pass_timeout', 'job_timeout', 'sizing',
+            'size_tolerance', 'sizing_memo_path', 'height_history_path', 'stream_latex').
+    Returns:
+        Counts of records per status (the RESULT_* constants); 0 records if the input
+        cannot be opened.
+    """
+    counts = {status: 0 for status in (RESULT_SUCCESS, RESULT_MULTI_PAGE, RESULT_FAILED, RESULT_TIMEOUT)}
+    try:
+        records = record_stream.open_record_stream(input_path, stream_format)
+    except OSError as e:
+        print(f"Error: could not open {input_path}: {e}", file=sys.stderr)
+        return counts
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Only problems are kept, so the summary does not grow with the input either
+    problems = []
+    section_cache_counts = {"hits": 0, "misses": 0}
+    report_lock = threading.Lock()
+
+    def report(outcome: Dict[str, Any]) -> None:
+        with report_lock:
+            counts[outcome["status"]] += 1
+            done = sum(counts.values())
+            if outcome["status"] in (RESULT_FAILED, RESULT_TIMEOUT):
+                problems.append(outcome)
+            section_cache_counts["hits"] += outcome.get("section_cache_hits", 0)
+            section_cache_counts["misses"] += outcome.get("section_cache_misses", 0)
+            seconds = f" ({outcome['seconds']:.2f}s)" if "seconds" in outcome else ""
+            print(f"  [{done}] {outcome['input_path']}: {outcome['status']}{seconds}")
+
+    pending = queue.Queue(maxsize=max(1, queue_size))
+
+    def feed_workers() -> None:
+        # One feeder per worker process, so every worker has a job while the queue holds records
+        while True:
+            job = pending.get()
+            if job is None:
+                return
+            try:
+                outcome = executor.submit(run_batch_job, job).result()
+            except Exception as e:  # E.g. a worker process died
+                outcome = {"input_path": job["input_path"], "status": RESULT_FAILED, "error": f"{type(e).__name__}: {e}"}
+            report(outcome)
+
+    print(f"Streaming records from {input_path} to {max_workers} worker process(es)...")
+    start_time = time.perf_counter()
+    with concurrent_futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        feeders = [threading.Thread(target=feed_workers, daemon=True) for _ in range(max_workers)]
+        for feeder in feeders:
+            feeder.start()
         try:
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                log_content = f.read()
-                # Look for patterns like "Output written on filename.pdf (2 pages"
-                match = re.search(r'Output written on .+?\.pdf \((\d+) pages', log_content)
-                if match:
-                    page_count = int(match.group(1))
-                    print(f"Found page count in log file: {page_count} page(s)")
-                    return page_count
-                
-                # Alternative pattern search
-                if "Overfull \hbox" in log_content and "Float too large" in log_content:
-                    print("Warning: Log file indicates content overflow issues")
-                
-        except Exception as e:
-            print(f"Error reading log file: {e}")
-    
-    # Method 3: Fallback - just check if the file exists and parse filename for clues
-    if os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0:
-        print(f"PDF file exists with size: {os.path.getsize(pdf_path)} bytes")
-        # If file is larger than typical 1-page resume, assume it's multi-page
-        # This is a very crude heuristic and should be improved
-        if os.path.getsize(pdf_path) > 150000:  # Arbitrary threshold
-            print("PDF file is larger than expected for a single page, assuming 2 pages")
-            return 2
+            for record in records:
+                label = f"record {record.index + 1} (offset {record.offset})"
+                if record.error is not None:
+                    report({"input_path": label, "status": RESULT_FAILED, "error": record.error})
+                    continue
+                pending.put(dict(
+                    job_options,
+                    input_path=label,
+                    resume_data=record.data,
+                    output_name=f"{output_base}_{record.index + 1}",
+                    output_dir=output_dir,
+                    template_name=template_name
+                ))
+        finally:
+            records.close()
+            for _ in feeders:
+                pending.put(None)
+            for feeder in feeders:
+                feeder.join()
+    elapsed = time.perf_counter() - start_time
+
+    total = sum(counts.values())
+    throughput = total / elapsed if elapsed > 0 else 0.0
+    print(f"\nStream finished: {total} record(s) in {elapsed:.2f}s ({throughput:.2f} resumes/s)")
+    print(f"  Succeeded: {counts[RESULT_SUCCESS]}")
+    print(f"  Multi-page (auto-sizing could not fit one page): {counts[RESULT_MULTI_PAGE]}")
+    print(f"  Timed out: {counts[RESULT_TIMEOUT]}")
+    for outcome in problems:
+        if outcome["status"] == RESULT_TIMEOUT:
+            print(f"    - {outcome['input_path']}")
+    print(f"  Failed: {counts[RESULT_FAILED]}")
+    for outcome in problems:
+        if outcome["status"] == RESULT_FAILED:
+            print(f"    - {outcome['input_path']}: {outcome['error']}")
+    if section_cache_counts["hits"] or section_cache_counts["misses"]:
+        lookups = section_cache_counts["hits"] + section_cache_counts["misses"]
+        print(f"  Section cache: {section_cache_counts['hits']} hit(s), {section_cache_counts['misses']} miss(es) "
+              f"({100.0 * section_cache_counts['hits'] / lookups:.0f}% reused)")
+    return counts
+
+def template_supports_engine(template_name: str, engine: str = LATEX_ENGINE) -> bool:
+    """Checks the engines a template declares (see templates.registry) and reports a mismatch."""
+    template_info = templates.get_template_info(template_name)
+    if template_info is not None and engine not in template_info.engines:
+        print(f"Template '{template_name}' does not support {engine} (supported: {', '.join(template_info.engines)}).", file=sys.stderr)
+        return False
+    return True
+
+def resolve_template_names(template_arg: str) -> List[str]:
+    """
+    Expands a --template argument into template names.
+    Args:
+        template_arg: A template name, a comma-separated list of names, or TEMPLATE_ALL.
+    Returns:
+        The names in the given order without duplicates (all available templates for TEMPLATE_ALL).
+    """
+    if template_arg.strip() == TEMPLATE_ALL:
+        return templates.get_available_templates()
+    names = []
+    for name in template_arg.split(","):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def generate_template_variant(
+    resume: templates.Resume,
+    template_name: str,
+    output_base: str,
+    output_dir: str,
+    format_cache: bool = True,
+    tex_workers: int = 0,
+    **generate_options: Any
+) -> Dict[str, Any]:
+    """
+    Generates one template's variant of a resume. Runs on a thread of generate_template_variants().
+
+    Args:
+        resume: The normalized resume shared by all variants.
+        template_name: The template to render with.
+        output_base: Base name for output files; the template name is appended to it.
+        output_dir: Where the variant's .tex/.pdf files are written.
+        format_cache: Compile from a precompiled format of the template's static preamble.
+        tex_workers: Number of warm TeX workers started for this template (0 for none).
+        generate_options: Further keyword arguments for generate_resume().
+    Returns:
+        Dict with 'template', 'status', 'pdf_path', 'page_height', 'seconds' and 'error'.
+    """
+    start_time = time.perf_counter()
+    outcome = {"template": template_name, "status": RESULT_FAILED, "pdf_path": None, "page_height": None, "error": None}
+    worker_pool = None
+    try:
+        template_module = templates.load_template(template_name)
+        if not template_supports_engine(template_name):
+            outcome["error"] = f"template does not support {LATEX_ENGINE}"
+            return outcome
+        fmt_path = get_preamble_format(template_name, template_module) if format_cache else None
+        if tex_workers > 0:
+            # Warm workers have the template's format loaded, so each template needs its own pool
+            worker_pool = tex_worker.TexWorkerPool(tex_workers, engine=LATEX_ENGINE, fmt_path=fmt_path)
+            if not worker_pool.start():
+                print(f"TeX worker pool unavailable for '{template_name}', using one-shot compiles.")
+                worker_pool = None
+        tex_filepath = get_output_filenames(f"{output_base}_{template_name}", output_dir)[0]
+        result = generate_resume(
+            resume, template_module, tex_filepath, fmt_path=fmt_path, worker_pool=worker_pool, **generate_options
+        )
+        outcome.update(status=result["status"], page_height=result["page_height"])
+        if result["status"] in (RESULT_SUCCESS, RESULT_MULTI_PAGE):
+            outcome["pdf_path"] = result["pdf_path"]
         else:
-            print("Assuming 1 page for auto-sizing purposes")
-            return 1
-    
-    # Couldn't determine page count
-    print("Could not determine page count. Install pdfinfo (poppler-utils) for better results.")
-    print("On most systems, you can install it through:")
-    print("  - macOS: 'brew install poppler'")
-    print("  - Linux: 'apt-get install poppler-utils' (Ubuntu/Debian)")
-    # Default to 2 pages if we can't determine to force height increases
-    print("Defaulting to 2 pages to trigger page height increase")
-    return 2
+            outcome["error"] = "LaTeX compilation timed out" if result["status"] == RESULT_TIMEOUT else "LaTeX compilation failed"
+    except ImportError as e:
+        outcome["error"] = str(e)
+    except Exception as e:
+        outcome["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if worker_pool is not None:
+            worker_pool.close()
+        outcome["seconds"] = time.perf_counter() - start_time
+    return outcome
 
-def main():
-    # Ensure required directories exist
-    for dirname in [DATA_DIR, TEMPLATES_DIR, OUTPUT_DIR]:
-        os.makedirs(dirname, exist_ok=True)
+def generate_template_variants(
+    resume_data: Dict[str, Any],
+    template_names: List[str],
+    output_base: str,
+    output_dir: str,
+    max_workers: int,
+    **variant_options: Any
+) -> List[Dict[str, Any]]:
+    """
+    Generates the same resume with several templates at once and prints a summary.
+
+    The data is normalized once and every variant renders the same Resume on a thread
+    pool, so the templates also share the process-wide LaTeX escape cache; the work
+    that runs in parallel is mostly pdflatex. Variant outputs are named
+    <output_base>_<template><n>.pdf.
+
+    Args:
+        resume_data: The parsed JSON resume data.
+        template_names: The templates to generate (see resolve_template_names).
+        output_base: Base name for output files.
+        output_dir: Where the outputs are written.
+        max_workers: Maximum number of variants generated at the same time.
+        variant_options: Keyword arguments for generate_template_variant().
+    Returns:
+        The per-template outcomes (see generate_template_variant), in template order.
+    """
+    resume = templates.normalize_resume(resume_data)
+    os.makedirs(output_dir, exist_ok=True)
+    max_workers = max(1, min(max_workers, len(template_names)))
+    print(f"Generating {len(template_names)} template variant(s) with up to {max_workers} at a time...")
+    start_time = time.perf_counter()
+    with concurrent_futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(generate_template_variant, resume, name, output_base, output_dir, **variant_options)
+            for name in template_names
+        ]
+        outcomes = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start_time
 
+    print(f"\nTemplate variants finished: {len(outcomes)} in {elapsed:.2f}s")
+    for outcome in outcomes:
+        if outcome["pdf_path"]:
+            detail = f"{outcome['pdf_path']} ({outcome['status']})"
+        else:
+            detail = f"{outcome['status']}: {outcome['error']}"
+        print(f"  - {outcome['template']}: {detail} ({outcome['seconds']:.2f}s)")
+    return outcomes
+
+def main():
+    # Directories are created by the paths that write to them (see below), not up front
     parser = argparse.ArgumentParser(description="Generates professional-looking resumes in PDF format from JSON data.")
 
     parser.add_argument(
@@ -214,10 +1667,60 @@ def main():
         type=str,
         help="Path to the input JSON file."
     )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        help="Directory or glob pattern of JSON files to generate in parallel (e.g. \"data/*.json\")."
+    )
+    parser.add_argument(
+        "--stream",
+        type=str,
+        help="JSONL file or JSON array of resumes to generate one by one as they are read, with "
+             "the worker processes of --batch mode ('-' reads standard input)."
+    )
+    parser.add_argument(
+        "--stream-format",
+        choices=("auto", "jsonl", "array"),
+        default="auto",
+        help="Format of the --stream input (default: auto, an array if it starts with '[', JSONL otherwise)."
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_STREAM_QUEUE_SIZE,
+        help=f"Records read ahead of the workers in --stream mode, or requests waiting for a render thread "
+             f"with --serve before further ones are answered with 503 (default: {DEFAULT_STREAM_QUEUE_SIZE})."
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a local HTTP render service (POST /render?template=NAME with resume JSON, GET /health) "
+             "with --jobs render threads."
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Address the --serve service listens on (default: 127.0.0.1)."
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port the --serve service listens on (default: 8000)."
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Maximum number of worker processes in --batch mode, number of render threads with --serve, "
+             "or of concurrent candidate compiles with --sizing speculative (default: number of CPUs)."
+    )
     parser.add_argument(
         "--template",
         type=str,
-        help="Name of the template to use. Use --list-templates to see available options."
+        help="Name of the template to use, a comma-separated list of names, or \"all\" to generate the resume "
+             "with every template at once. Use --list-templates to see available options."
     )
     parser.add_argument(
         "--output",
@@ -255,31 +1758,188 @@ def main():
         action="store_true",
         help="Disable the automatic page height adjustment feature."
     )
+    parser.add_argument(
+        "--sizing",
+        choices=SIZING_STRATEGIES,
+        default=SIZING_INCREMENTAL,
+        help="Auto-sizing strategy: 'incremental' grows the page step by step; 'measure' measures the content "
+             "on one tall page and then compiles at the exact height; 'bisect' finds the smallest fitting "
+             "height to within --size-tolerance in a logarithmic number of compiles; 'speculative' compiles "
+             "the incremental candidates in parallel and keeps the smallest that fits."
+    )
+    parser.add_argument(
+        "--size-tolerance",
+        type=float,
+        default=DEFAULT_SIZE_TOLERANCE_INCHES,
+        help=f"Precision in inches of --sizing bisect (default: {DEFAULT_SIZE_TOLERANCE_INCHES})."
+    )
+    parser.add_argument(
+        "--no-format-cache",
+        action="store_true",
+        help="Do not compile from a precompiled format of the template's static preamble."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always compile, bypassing the cache of previously compiled PDFs."
+    )
+    parser.add_argument(
+        "--no-sizing-memo",
+        action="store_true",
+        help="Do not start auto-sizing from the page height that fitted the same resume before."
+    )
+    parser.add_argument(
+        "--no-height-model",
+        action="store_true",
+        help="Do not predict a starting page height from earlier runs, nor record this run for predictions."
+    )
+    parser.add_argument(
+        "--cache-size-mb",
+        type=float,
+        default=None,
+        help="Maximum size of the compiled-PDF cache in megabytes (default: 500); least recently used "
+             "entries are evicted."
+    )
+    parser.add_argument(
+        "--pass-timeout",
+        type=float,
+        default=DEFAULT_PASS_TIMEOUT_SECONDS,
+        help="Seconds a single pdflatex pass may run before it is killed (0 disables)."
+    )
+    parser.add_argument(
+        "--job-timeout",
+        type=float,
+        default=DEFAULT_JOB_TIMEOUT_SECONDS,
+        help="Seconds all compilations for one resume may take together (0 disables)."
+    )
+    parser.add_argument(
+        "--tex-workers",
+        type=int,
+        default=0,
+        help="Number of warm, pre-started TeX worker processes to compile on (0 disables the pool)."
+    )
+    parser.add_argument(
+        "--stream-latex",
+        action="store_true",
+        help="Pipe the generated LaTeX straight into pdflatex instead of writing a .tex file for it to read "
+             "(warm TeX workers are not used for streamed documents)."
+    )
+    parser.add_argument(
+        "--keep-tex",
+        action="store_true",
+        help="With --stream-latex, still write the .tex file next to the PDF."
+    )
 
     args = parser.parse_args()
 
+    if args.list_data_files:
+        print(f"Listing JSON files in '{DATA_DIR}/':")
+        json_files = glob.glob(os.path.join(DATA_DIR, "*.json"))
+        if json_files:
+            for f_path in json_files:
+                print(f"  - {os.path.basename(f_path)}")
+        else:
+            print(f"No JSON files found in '{DATA_DIR}/'.")
+        sys.exit(0)
+
+    # Template metadata is kept between runs and re-read only for changed template files
+    templates.use_registry_cache(TEMPLATE_REGISTRY_CACHE_PATH)
+
     if args.list_templates:
         # Placeholder for listing templates
         print("Listing templates...")
-        available_templates = get_available_templates()
+        available_templates = templates.get_available_templates()
         if available_templates:
             print("Available templates:")
             for t_name in available_templates:
                 print(f"  - {t_name}")
         else:
-            print(f"No templates found in '{TEMPLATES_DIR}/'. Ensure template files end with '{TEMPLATE_FILE_SUFFIX}'.")
+            print(f"No templates found in '{TEMPLATES_DIR}/'. Ensure template files end with '{templates.TEMPLATE_FILE_SUFFIX}'.")
         sys.exit(0)
 
-    if args.list_data_files:
-        print(f"Listing JSON files in '{DATA_DIR}/':")
-        json_files = glob.glob(os.path.join(DATA_DIR, "*.json"))
-        if json_files:
-            for f_path in json_files:
-                print(f"  - {os.path.basename(f_path)}")
-        else:
-            print(f"No JSON files found in '{DATA_DIR}/'.")
+    # Only the compiling paths below import the PDF cache module for its default
+    if args.cache_size_mb is None:
+        cache_max_bytes = pdf_cache_module.DEFAULT_CACHE_MAX_BYTES
+    else:
+        cache_max_bytes = int(args.cache_size_mb * 1024 * 1024)
+
+    # --- Server Mode ---
+    if args.serve:
+        service = render_server.RenderService(
+            max(1, args.jobs),
+            queue_size=args.queue_size,
+            format_cache=not args.no_format_cache,
+            tex_workers=args.tex_workers,
+            page_height=args.page_height,
+            auto_size=not args.no_auto_size,
+            pdf_cache=None if args.no_cache else pdf_cache_module.PdfCache(os.path.join(CACHE_DIR, "pdf"), max_bytes=cache_max_bytes),
+            pass_timeout=args.pass_timeout or None,
+            job_timeout=args.job_timeout or None,
+            sizing=args.sizing,
+            size_tolerance=args.size_tolerance,
+            # The render threads already keep every CPU busy
+            max_parallel_compiles=1,
+            sizing_memo=None if args.no_sizing_memo else sizing_memo_module.SizingMemo(SIZING_MEMO_PATH),
+            height_model=None if args.no_height_model else height_model_module.HeightModel(HEIGHT_HISTORY_PATH),
+            stream_latex=args.stream_latex
+        )
+        render_server.serve(service, args.host, args.port)
         sys.exit(0)
 
+    # --- Batch and Stream Modes ---
+    if args.batch or args.stream:
+        mode = "--batch" if args.batch else "--stream"
+        if args.batch and args.stream:
+            parser.error("--batch and --stream cannot be combined")
+        if not args.template:
+            parser.error(f"{mode} requires --template")
+        if len(resolve_template_names(args.template)) != 1:
+            parser.error(f"{mode} takes a single --template")
+        input_paths = []
+        if args.batch:
+            input_paths = find_batch_inputs(args.batch)
+            if not input_paths:
+                print(f"No JSON files found for '{args.batch}'.", file=sys.stderr)
+                sys.exit(1)
+        try:
+            # The workers import the template themselves; here only its metadata is needed
+            template_module = templates.load_template(args.template, lazy=True)
+        except ImportError as e:
+            print(f"Error loading template: {e}", file=sys.stderr)
+            sys.exit(1)
+        if not template_supports_engine(args.template):
+            sys.exit(1)
+        # Build the format once up front so worker processes never race to create it
+        fmt_path = None if args.no_format_cache else get_preamble_format(args.template, template_module)
+        job_options = dict(
+            page_height=args.page_height,
+            auto_size=not args.no_auto_size,
+            fmt_path=fmt_path,
+            cache_dir=None if args.no_cache else os.path.join(CACHE_DIR, "pdf"),
+            cache_max_bytes=cache_max_bytes,
+            pass_timeout=args.pass_timeout or None,
+            job_timeout=args.job_timeout or None,
+            sizing=args.sizing,
+            size_tolerance=args.size_tolerance,
+            sizing_memo_path=None if args.no_sizing_memo else SIZING_MEMO_PATH,
+            height_history_path=None if args.no_height_model else HEIGHT_HISTORY_PATH,
+            stream_latex=args.stream_latex
+        )
+        if args.batch:
+            outcomes = run_batch(input_paths, args.template, OUTPUT_DIR, max(1, args.jobs), **job_options)
+            sys.exit(1 if any(o["status"] in (RESULT_FAILED, RESULT_TIMEOUT) for o in outcomes) else 0)
+        counts = run_stream(
+            args.stream,
+            args.stream_format,
+            args.template,
+            args.output,
+            OUTPUT_DIR,
+            max(1, args.jobs),
+            queue_size=args.queue_size,
+            **job_options
+        )
+        sys.exit(1 if counts[RESULT_FAILED] or counts[RESULT_TIMEOUT] or not sum(counts.values()) else 0)
+
     # --- Interactive Mode ---
     input_json_path = args.json
     selected_template_name = args.template
@@ -305,7 +1965,7 @@ def main():
                     print("Invalid input. Please enter a number.")
         
         if not selected_template_name:
-            available_templates = get_available_templates()
+            available_templates = templates.get_available_templates()
             if not available_templates:
                 print(f"No templates found in '{TEMPLATES_DIR}/'.", file=sys.stderr)
                 sys.exit(1)
@@ -335,106 +1995,113 @@ def main():
     if resume_data is None:
         sys.exit(1)
 
+    # --- Several Templates: Render the Same Data with Each ---
+    template_names = resolve_template_names(selected_template_name)
+    if not template_names:
+        print(f"No templates found for '{selected_template_name}'.", file=sys.stderr)
+        sys.exit(1)
+    if len(template_names) > 1:
+        outcomes = generate_template_variants(
+            resume_data,
+            template_names,
+            args.output,
+            OUTPUT_DIR,
+            max(1, args.jobs),
+            format_cache=not args.no_format_cache,
+            tex_workers=args.tex_workers,
+            page_height=args.page_height,
+            auto_size=not args.no_auto_size,
+            pdf_cache=None if args.no_cache else pdf_cache_module.PdfCache(os.path.join(CACHE_DIR, "pdf"), max_bytes=cache_max_bytes),
+            pass_timeout=args.pass_timeout or None,
+            job_timeout=args.job_timeout or None,
+            sizing=args.sizing,
+            size_tolerance=args.size_tolerance,
+            # The variants already compile side by side
+            max_parallel_compiles=max(1, args.jobs // len(template_names)),
+            sizing_memo=None if args.no_sizing_memo else sizing_memo_module.SizingMemo(SIZING_MEMO_PATH),
+            height_model=None if args.no_height_model else height_model_module.HeightModel(HEIGHT_HISTORY_PATH),
+            stream_latex=args.stream_latex,
+            keep_tex=args.keep_tex
+        )
+        if not args.no_save_json:
+            for outcome in outcomes:
+                if outcome["pdf_path"]:
+                    json_copy_filepath = os.path.splitext(outcome["pdf_path"])[0] + ".json"
+                    try:
+                        with open(json_copy_filepath, 'w') as f:
+                            json.dump(resume_data, f, indent=2)
+                    except Exception as e:
+                        print(f"Error saving JSON copy: {e}", file=sys.stderr)
+        sys.exit(1 if any(o["status"] in (RESULT_FAILED, RESULT_TIMEOUT) for o in outcomes) else 0)
+    selected_template_name = template_names[0]
+
     # --- Load Template ---
     print(f"Loading template: '{selected_template_name}'")
     try:
-        template_module = load_template(selected_template_name)
+        template_module = templates.load_template(selected_template_name)
     except ImportError as e:
         print(f"Error loading template: {e}", file=sys.stderr)
         # Suggest valid templates if the one chosen is bad
-        available_templates = get_available_templates()
+        available_templates = templates.get_available_templates()
         if available_templates:
             print("Available templates are:", ", ".join(available_templates))
         else:
             print(f"No templates found in '{TEMPLATES_DIR}/'.")
         sys.exit(1)
+    if not template_supports_engine(selected_template_name):
+        sys.exit(1)
 
-    # --- Determine Output Filenames ---
-    base_output_name = args.output
-    tex_filepath, pdf_filepath, json_copy_filepath, file_num = get_output_filenames(base_output_name, OUTPUT_DIR)
-    print(f"Output .tex will be: {tex_filepath}")
-    print(f"Output .pdf will be: {pdf_filepath}")
+    # --- Precompiled Preamble Format ---
+    fmt_path = None
+    if not args.no_format_cache:
+        fmt_path = get_preamble_format(selected_template_name, template_module)
 
+    # --- Warm TeX Worker Pool ---
+    worker_pool = None
+    if args.tex_workers > 0:
+        worker_pool = tex_worker.TexWorkerPool(args.tex_workers, engine=LATEX_ENGINE, fmt_path=fmt_path)
+        if not worker_pool.start():
+            print("TeX worker pool unavailable, using one-shot compiles.")
+            worker_pool = None
+
+    # The warm pdflatex processes must not outlive a run that fails
+    try:
+        # --- Compiled PDF Cache ---
+        pdf_cache = None if args.no_cache else pdf_cache_module.PdfCache(os.path.join(CACHE_DIR, "pdf"), max_bytes=cache_max_bytes)
+
+        # --- Determine Output Filenames ---
+        base_output_name = args.output
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        tex_filepath, pdf_filepath, json_copy_filepath, file_num = get_output_filenames(base_output_name, OUTPUT_DIR)
+        if not args.stream_latex or args.keep_tex:
+            print(f"Output .tex will be: {tex_filepath}")
+        print(f"Output .pdf will be: {pdf_filepath}")
+
+
+        # --- Page Sizing Loop / LaTeX Generation / Compilation ---
+        generate_resume(
+            resume_data,
+            template_module,
+            tex_filepath,
+            page_height=args.page_height,
+            auto_size=not args.no_auto_size,
+            fmt_path=fmt_path,
+            worker_pool=worker_pool,
+            pdf_cache=pdf_cache,
+            pass_timeout=args.pass_timeout or None,
+            job_timeout=args.job_timeout or None,
+            sizing=args.sizing,
+            size_tolerance=args.size_tolerance,
+            max_parallel_compiles=max(1, args.jobs),
+            sizing_memo=None if args.no_sizing_memo else sizing_memo_module.SizingMemo(SIZING_MEMO_PATH),
+            height_model=None if args.no_height_model else height_model_module.HeightModel(HEIGHT_HISTORY_PATH),
+            stream_latex=args.stream_latex,
+            keep_tex=args.keep_tex
+        )
+    finally:
+        if worker_pool is not None:
+            worker_pool.close()
 
-    # --- Page Sizing Loop / LaTeX Generation / Compilation ---
-    initial_page_height = args.page_height if args.page_height is not None else DEFAULT_INITIAL_PAGE_HEIGHT_INCHES
-    
-    if hasattr(template_module, 'generate_latex_content'):
-        print(f"Generating LaTeX content with initial page height: {initial_page_height} inches (auto-sizing: {'disabled' if args.no_auto_size else 'enabled'})")
-        
-        # Handle the case when auto-sizing is disabled
-        if args.no_auto_size:
-            page_height_to_use = args.page_height # Can be None, template handles default
-            latex_content = template_module.generate_latex_content(resume_data, page_height=page_height_to_use)
-            
-            # Save .tex file
-            with open(tex_filepath, 'w', encoding='utf-8') as f:
-                f.write(latex_content)
-            print(f"LaTeX content saved to {tex_filepath}")
-            
-            # Compile .tex file
-            if compile_latex(tex_filepath):
-                print(f"Resume PDF generated successfully: {pdf_filepath}")
-            else:
-                print("Failed to compile the LaTeX content.")
-        else:
-            # Auto-sizing loop implementation
-            print("Starting auto-sizing process to fit content on one page...")
-            current_page_height = initial_page_height
-            attempts_remaining = MAX_AUTO_SIZE_ATTEMPTS
-            success = False
-            
-            while attempts_remaining > 0:
-                print(f"Attempt {MAX_AUTO_SIZE_ATTEMPTS - attempts_remaining + 1}/{MAX_AUTO_SIZE_ATTEMPTS}: Using page height of {current_page_height:.2f} inches")
-                
-                # Generate LaTeX with current height
-                latex_content = template_module.generate_latex_content(resume_data, page_height=current_page_height)
-                
-                # Save .tex file
-                with open(tex_filepath, 'w', encoding='utf-8') as f:
-                    f.write(latex_content)
-                print(f"LaTeX content saved to {tex_filepath}")
-                
-                # Compile .tex file
-                if not compile_latex(tex_filepath):
-                    print("LaTeX compilation failed. Aborting auto-sizing.")
-                    break
-                
-                # Check page count
-                page_count = get_pdf_page_count(pdf_filepath)
-                if page_count is None or page_count > 1:
-                    if page_count is None:
-                        # If we can't determine page count, assume it needs more space
-                        print("Could not determine page count. Assuming multiple pages and increasing height.")
-                        page_count = 2  # Default to assume it needs more space
-                    
-                    # Need to increase page height and try again
-                    if attempts_remaining > 1:  # Still have more attempts
-                        print(f"Content currently spans {page_count} pages. Increasing page height...")
-                        current_page_height += PAGE_HEIGHT_INCREMENT_INCHES
-                        print(f"New page height: {current_page_height:.2f} inches")
-                        attempts_remaining -= 1
-                    else:
-                        print(f"Maximum attempts reached. Content still spans {page_count} pages.")
-                        break
-                else:
-                    print("Success! Content fits on a single page.")
-                    success = True
-                    break
-            
-            if success:
-                print(f"Auto-sizing successful. Final page height: {current_page_height:.2f} inches.")
-            else:
-                print("Auto-sizing completed without achieving one-page layout.")
-                print("You may need to:")
-                print("  1. Edit the input data to reduce content")
-                print("  2. Try with a larger initial page height")
-                print("  3. Try with a larger height increment")
-                print("  4. Disable auto-sizing (--no-auto-size) and manually adjust the content")
-    else:
-        print(f"Error: Template module '{selected_template_name}' does not have 'generate_latex_content' function.", file=sys.stderr)
-        sys.exit(1)
-        
     # --- Optionally Save JSON Copy ---
     if not args.no_save_json:
         try:
@@ -0,0 +1,113 @@
+"""
+Microbenchmark for the template's LaTeX escaper.
+
+Compares fix_latex_special_chars() against the previous implementation (a regex
+pass protecting 'N%', ten sequential str.replace scans and a restore loop) on a
+mix of strings typical for a resume batch, where skills, companies and dates
+repeat across records.
+
+Usage:
+    python scripts/benchmark_escape.py [--records N] [--repeat N]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from templates.latex_utils import escape_latex, fix_latex_special_chars  # noqa: E402
+
+
+def legacy_fix_latex_special_chars(text):
+    """The escaper as it was before the single-pass rewrite, kept for comparison."""
+    if text is None:
+        return ""
+    if not isinstance(text, str):
+        text = str(text)
+    protected_percentages = {}
+    for i, match in enumerate(re.finditer(r'(\d+)%', text)):
+        placeholder = f"__PCT_PLACEHOLDER_{i}__"
+        text = text.replace(match.group(0), placeholder)
+        protected_percentages[placeholder] = f"{match.group(1)}\\%"
+    replacements = [
+        ("\\", r"\textbackslash{}"),
+        ("&", r"\&"),
+        ("%", r"\%"),
+        ("$", r"\$"),
+        ("#", r"\#"),
+        ("_", r"\_"),
+        ("{", r"\{"),
+        ("}", r"\}"),
+        ("~", r"\textasciitilde{}"),
+        ("^", r"\textasciicircum{}"),
+    ]
+    for old, new in replacements:
+        text = text.replace(old, new)
+    for placeholder, replacement in protected_percentages.items():
+        text = text.replace(placeholder, replacement)
+    return text
+
+
+def build_workload(records: int) -> list:
+    """Strings escaped for `records` resumes: shared skills/companies/dates plus unique bullets."""
+    shared = [
+        "Python", "SQL", "C++", "R & Tableau", "Machine Learning", "A/B Testing",
+        "Google LLC", "Meta Platforms, Inc.", "University of California, Berkeley",
+        "Aug 2021", "May 2023", "Present", "San Francisco, CA", "New York, NY",
+    ]
+    workload = []
+    for r in range(records):
+        workload.extend(shared)
+        workload.extend([
+            f"Improved conversion by {r % 40 + 5}% across {r % 9 + 2} markets & cut costs by ${r * 10}k",
+            f"Built feature_store_{r} pipelines processing 1{r % 10}TB/day with 99.9% uptime",
+            f"Led #{r % 5 + 1} ranked team of {r % 12 + 3} engineers; shipped {{core}} APIs",
+        ])
+    return workload
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the LaTeX escaper.")
+    parser.add_argument("--records", type=int, default=200, help="Resumes in the simulated batch.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported).")
+    args = parser.parse_args()
+
+    workload = build_workload(args.records)
+
+    # Outputs must agree wherever the old escaper's placeholders did not break (no 'N%' in the text)
+    for text in workload:
+        if not re.search(r"\d%", text):
+            assert fix_latex_special_chars(text) == legacy_fix_latex_special_chars(text), text
+    assert fix_latex_special_chars("Grew revenue 25%") == "Grew revenue 25\\%"
+
+    def run_legacy():
+        for text in workload:
+            legacy_fix_latex_special_chars(text)
+
+    def run_cold():
+        escape_latex.cache_clear()
+        for text in workload:
+            fix_latex_special_chars(text)
+
+    def run_warm():
+        for text in workload:
+            fix_latex_special_chars(text)
+
+    run_warm()  # Fill the memo
+    timings = {
+        "legacy (regex + 10 replace passes)": min(timeit.repeat(run_legacy, number=1, repeat=args.repeat)),
+        "single-pass, cold memo": min(timeit.repeat(run_cold, number=1, repeat=args.repeat)),
+        "single-pass, warm memo": min(timeit.repeat(run_warm, number=1, repeat=args.repeat)),
+    }
+    baseline = timings["legacy (regex + 10 replace passes)"]
+    print(f"{len(workload)} strings ({args.records} resumes):")
+    for name, seconds in timings.items():
+        print(f"  {name:36s} {seconds * 1000:8.2f} ms  ({baseline / seconds:5.1f}x)")
+    info = escape_latex.cache_info()
+    print(f"Memo: {info.hits} hits, {info.misses} misses, {info.currsize} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Import-time regression check for the CLI.
+
+Imports resume_generator in fresh interpreters under `python -X importtime` and
+fails if the fastest run's cumulative import time exceeds the budget, or if any
+module that resume_generator defers (see lazy_import.py) gets imported eagerly.
+The fastest of several runs is compared, so a busy machine does not cause
+false alarms.
+
+Usage:
+    python scripts/check_import_time.py [--budget-ms MS] [--runs N] [--module NAME]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Cumulative import time allowed for the CLI module, in milliseconds
+DEFAULT_BUDGET_MS = 50.0
+DEFAULT_RUNS = 5
+DEFAULT_MODULE = "resume_generator"
+
+# Modules the CLI imports only on the paths that need them
+DEFERRED_MODULES = (
+    "argparse",
+    "subprocess",
+    "shutil",
+    "json",
+    "hashlib",
+    "tempfile",
+    "concurrent.futures",
+    "queue",
+    "templates",
+    "tex_worker",
+    "pdf_cache",
+    "sizing_memo",
+    "height_model",
+    "pdf_reader",
+    "latex_log",
+    "record_stream",
+    "render_server",
+)
+
+
+def measure_imports(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Imports module in a fresh interpreter and returns the -X importtime report as
+    {module name: (self microseconds, cumulative microseconds)}.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # The header line
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Cumulative import time allowed in milliseconds (default: {DEFAULT_BUDGET_MS}).")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help=f"Fresh interpreters to measure; the fastest counts (default: {DEFAULT_RUNS}).")
+    parser.add_argument("--module", default=DEFAULT_MODULE,
+                        help=f"Module to import (default: {DEFAULT_MODULE}).")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Number of slowest imports to list.")
+    args = parser.parse_args()
+
+    runs: List[Dict[str, Tuple[int, int]]] = [measure_imports(args.module) for _ in range(max(1, args.runs))]
+    fastest = min(runs, key=lambda timings: timings.get(args.module, (0, 0))[1])
+    total_ms = fastest.get(args.module, (0, 0))[1] / 1000.0
+
+    print(f"import {args.module}: {total_ms:.1f} ms (fastest of {len(runs)}, budget {args.budget_ms:.1f} ms)")
+    print(f"Slowest imports (self time):")
+    for name, (self_us, cumulative_us) in sorted(fastest.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {self_us / 1000.0:7.2f} ms  (cumulative {cumulative_us / 1000.0:7.2f} ms)  {name}")
+
+    failed = False
+    if args.module == DEFAULT_MODULE:
+        eager = [name for name in DEFERRED_MODULES if name in fastest]
+        if eager:
+            print(f"FAIL: deferred modules imported eagerly: {', '.join(eager)}")
+            failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import time {total_ms:.1f} ms exceeds the budget of {args.budget_ms:.1f} ms")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
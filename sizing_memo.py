@@ -0,0 +1,210 @@
+"""
+Persistent memo of page heights that fitted previous resumes.
+
+Maps a coarse signature of the resume plus the template (its name and source) to
+the page height and page count of the last successful auto-sizing run. The
+signature counts each section's records and text fields and measures its text
+in buckets of SIGNATURE_BUCKET_CHARS characters, so a re-render of the same resume
+after small edits (a typo, a reworded bullet) finds the entry too. The
+remembered height is only a starting point for the requested sizing strategy,
+which grows the page if the edited resume no longer fits and, when bisecting,
+shrinks it if a smaller one does.
+
+The memo is a JSON Lines file that updates are appended to, one short line each,
+so concurrent processes never overwrite each other's entries. It is read
+incrementally (only the lines appended since the last lookup; a later line for a
+key wins) and bounded in memory to a number of entries, the least recently
+updated dropped first. Once the file grows past COMPACT_MEMO_BYTES (and to twice
+its size after the last compaction) it is rewritten with just those entries. One instance can be shared by threads.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Default bound on the number of remembered resumes
+DEFAULT_MEMO_MAX_ENTRIES = 10000
+# The memo file is compacted when an append makes it larger than this
+COMPACT_MEMO_BYTES = 4 * 1024 * 1024
+# Characters of text per signature bucket, about one line of a resume; edits that keep
+# every section within its bucket share a memo entry
+SIGNATURE_BUCKET_CHARS = 80
+
+
+def _template_fingerprint(template_module: Any) -> str:
+    """Identifies a template by its module name and the contents of its source file."""
+    digest = hashlib.sha256(getattr(template_module, "__name__", "").encode("utf-8"))
+    source_path = getattr(template_module, "__file__", None)
+    if source_path:
+        try:
+            with open(source_path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            pass
+    return digest.hexdigest()
+
+
+def _text_stats(value: Any) -> tuple[int, int]:
+    """Returns the number of non-empty text fields in value and their total length."""
+    if isinstance(value, str):
+        return (1, len(value)) if value else (0, 0)
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return 0, 0
+    fields = chars = 0
+    for item in value:
+        item_fields, item_chars = _text_stats(item)
+        fields += item_fields
+        chars += item_chars
+    return fields, chars
+
+
+def resume_signature(resume_data: Any) -> list:
+    """
+    Summarizes resume data (a normalized Resume or a JSON dict) per section as
+    [section, records, text fields, text length // SIGNATURE_BUCKET_CHARS].
+    """
+    if hasattr(resume_data, "_fields"):
+        sections = list(zip(resume_data._fields, resume_data))
+    elif isinstance(resume_data, dict):
+        sections = sorted(resume_data.items())
+    else:
+        return []
+    signature = []
+    for name, value in sections:
+        records = len(value) if isinstance(value, (list, tuple)) and not hasattr(value, "_fields") else int(bool(value))
+        fields, chars = _text_stats(value)
+        signature.append([str(name), records, fields, chars // SIGNATURE_BUCKET_CHARS])
+    return signature
+
+
+class SizingMemo:
+    """
+    Usage:
+        memo = SizingMemo(".cache/sizing_memo.jsonl")
+        key = memo.make_key(resume_data, template_module, "incremental:11.00")
+        entry = memo.get(key)  # {'page_height': ..., 'page_count': ...} or None
+        ...size the resume...
+        memo.put(key, page_height, page_count)
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MEMO_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        # Entries read from the file so far, least recently updated first
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._read_offset = 0
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._compacted_size = 0  # Size the file was last compacted to
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(resume_data: Any, template_module: Any, variant: str = "") -> str:
+        """
+        Returns the memo key for resume_data rendered with template_module. Resumes with
+        the same signature (see resume_signature) share the key.
+        Args:
+            resume_data: A normalized Resume (or JSON resume data).
+            variant: Describes any sizing settings that change which height is chosen.
+        """
+        digest = hashlib.sha256()
+        digest.update(_template_fingerprint(template_module).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(variant.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(json.dumps(resume_signature(resume_data)).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_new_entries(self) -> None:
+        """
+        Reads the lines appended to the memo since the last call. A replaced or truncated
+        file (see _compact) is re-read.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._read_offset:
+            self._entries = OrderedDict()
+            self._read_offset = 0
+            self._file_id = file_id
+        if stat.st_size == self._read_offset:
+            return
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._read_offset)
+                data = f.read()
+        except OSError:
+            return
+        # A line still being written by a concurrent writer is read next time
+        complete = data.rfind(b"\n") + 1
+        self._read_offset += complete
+        for line in data[:complete].splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # A torn line from a concurrent writer
+            if isinstance(entry, dict) and isinstance(entry.get("key"), str):
+                self._remember(entry.pop("key"), entry)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up the sizing result remembered for key.
+        Returns:
+            A dict with 'page_height' and 'page_count', or None if nothing is remembered.
+        """
+        with self._lock:
+            self._read_new_entries()
+            entry = self._entries.get(key)
+        if not isinstance(entry, dict) or not isinstance(entry.get("page_height"), (int, float)):
+            return None
+        return entry
+
+    def put(self, key: str, page_height: float, page_count: Optional[int]) -> None:
+        """Remembers a successful sizing result by appending it to the memo file."""
+        entry = {"page_height": page_height, "page_count": page_count, "updated": time.time()}
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # One short append per entry, so concurrent writers do not interleave within a line
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(dict(entry, key=key)) + "\n")
+                    size = f.tell()
+                self._remember(key, entry)
+                # Kept entries can outgrow the threshold; compacting again needs as much new data
+                if size > max(COMPACT_MEMO_BYTES, 2 * self._compacted_size):
+                    self._compact()
+            except OSError as e:
+                print(f"Could not update sizing memo: {e}")
+
+    def _compact(self) -> None:
+        """
+        Rewrites the memo with only the entries kept in memory. An entry appended by another
+        process while the file is rewritten may be lost, which only costs that resume a memo hit.
+        """
+        self._read_new_entries()
+        # Write under a temporary name and rename, so readers never see a partial file
+        tmp_path = f"{self.path}.tmp{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, entry in self._entries.items():
+                f.write(json.dumps(dict(entry, key=key)) + "\n")
+            size = f.tell()
+        os.replace(tmp_path, self.path)
+        # Continue reading after what was just written instead of re-reading the new file
+        stat = os.stat(self.path)
+        self._file_id = (stat.st_dev, stat.st_ino)
+        self._read_offset = size
+        self._compacted_size = size
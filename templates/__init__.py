@@ -1,58 +1,54 @@
 import os
-import glob
-import importlib
-from typing import List, Any
+from typing import List, Any, Optional
+
+from .declarative import TemplateSpecError, compile_template
+from .registry import TEMPLATE_FILE_SUFFIX, LazyTemplate, TemplateInfo, TemplateRegistry, preamble_hash
+from .resume_model import Resume, normalize_resume
 
 TEMPLATES_DIR_NAME = "templates" # Relative to the main script or where this __init__ is
-TEMPLATE_FILE_SUFFIX = "_template.py"
+
+# The registry of the templates in this directory, built on first use
+_REGISTRY = TemplateRegistry(os.path.dirname(os.path.abspath(__file__)), __name__)
+
+def get_registry() -> TemplateRegistry:
+    """Returns the registry of the templates in this package."""
+    return _REGISTRY
+
+def use_registry_cache(cache_path: Optional[str]) -> None:
+    """
+    Keeps the template metadata in a JSON file at cache_path (None to stop), so later
+    runs only re-read templates whose files changed. Takes effect on the next scan.
+    """
+    _REGISTRY.cache_path = cache_path
+    _REGISTRY._infos = None
 
 def get_available_templates() -> List[str]:
     """
-    Discovers available template modules in the templates directory.
+    Lists the available template modules in the templates directory.
     Templates are expected to be Python files ending with '_template.py'.
     Returns a list of template names (without the '_template.py' suffix).
+    The directory is scanned once; see TemplateRegistry.refresh().
     """
-    # Construct the path to the templates directory relative to this __init__.py file
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    search_pattern = os.path.join(current_dir, f"*{TEMPLATE_FILE_SUFFIX}")
-    
-    template_files = glob.glob(search_pattern)
-    
-    available_templates = []
-    for t_file in template_files:
-        base_name = os.path.basename(t_file)
-        if base_name == "__init__.py":
-            continue
-        template_name = base_name.replace(TEMPLATE_FILE_SUFFIX, "")
-        available_templates.append(template_name)
-        
-    return sorted(available_templates)
+    return _REGISTRY.names()
+
+def get_template_info(template_name: str) -> Optional[TemplateInfo]:
+    """Returns a template's metadata (read without importing it), or None if it does not exist."""
+    return _REGISTRY.info(template_name)
 
-def load_template(template_name: str) -> Any:
+def load_template(template_name: str, lazy: bool = False) -> Any:
     """
-    Loads a template module dynamically.
+    Loads a template module (once; later calls return the same module).
     Args:
         template_name: The name of the template (e.g., 'classic').
+        lazy: Return a LazyTemplate that imports the module on first render instead.
     Returns:
-        The loaded template module.
+        The loaded template module, or its LazyTemplate stand-in.
     Raises:
         ImportError: If the template module cannot be found or loaded.
     """
-    module_name = f".{template_name}{TEMPLATE_FILE_SUFFIX[:-3]}" # Relative import
-    try:
-        # The package is 'templates' (the directory this __init__.py is in)
-        template_module = importlib.import_module(module_name, package=TEMPLATES_DIR_NAME)
-        
-        # Check if the required function exists
-        if not hasattr(template_module, 'generate_latex_content'):
-            raise ImportError(
-                f"Template '{template_name}' loaded, but missing required function "
-                f"'generate_latex_content(data, page_height)'."
-            )
-        return template_module
-    except ImportError as e:
-        raise ImportError(f"Could not load template '{template_name}'. Error: {e}")
+    if lazy:
+        return _REGISTRY.lazy(template_name)
+    return _REGISTRY.load(template_name)
 
 # Example usage (for testing within this file, not typical)
 if __name__ == '__main__':
@@ -1,62 +1,139 @@
-from typing import Dict, Any, Optional, List
-import re
+from typing import Dict, Any, Optional, Iterator, Tuple, Union
+
+from .latex_utils import (
+    CONTENT_HEIGHT_LOG_TAG,
+    CONTENT_HEIGHT_REPORT,
+    PREAMBLE_LOADED_MACRO,
+    fix_latex_special_chars,
+    format_date_range,
+    guard_static_preamble,
+    page_geometry,
+)
+from .resume_model import (
+    Activity,
+    Award,
+    Certification,
+    Contact,
+    Education,
+    Experience,
+    Involvement,
+    Language,
+    Project,
+    Resume,
+    SkillCategory,
+    normalize_resume,
+)
+from .section_cache import SectionCache, template_source_version
 
 # Default page height if not specified by the generator (e.g. if auto-sizing is off and no specific height is given)
 DEFAULT_TEMPLATE_PAGE_HEIGHT_INCHES = 11.0 
 
-def fix_latex_special_chars(text: Optional[Any]) -> str:
-    """
-    Escapes LaTeX special characters in a given string.
-    Also converts None to an empty string.
-    """
-    if text is None:
-        return ""
-    if not isinstance(text, str):
-        text = str(text) # Ensure it's a string
-
-    # Process percentage signs specially to handle common patterns like "5%" correctly
-    # First, find and protect patterns like "X%" where X is a number
-    protected_percentages = {}
-    for i, match in enumerate(re.finditer(r'(\d+)%', text)):
-        placeholder = f"__PCT_PLACEHOLDER_{i}__"
-        text = text.replace(match.group(0), placeholder)
-        protected_percentages[placeholder] = f"{match.group(1)}\\%"
-
-    # Now handle standard LaTeX special characters
-    replacements = [
-        ("\\", r"\textbackslash{}"), # Must be first
-        ("&", r"\&"),
-        ("%", r"\%"),
-        ("$", r"\$"),
-        ("#", r"\#"),
-        ("_", r"\_"),
-        ("{", r"\{"),
-        ("}", r"\}"),
-        ("~", r"\textasciitilde{}"),
-        ("^", r"\textasciicircum{}"),
-    ]
+# Vertical margins around the text area
+# (0.5in at the top due to \addtolength{\topmargin}{-0.5in}, 0.5in left free at the bottom)
+TOP_MARGIN_INCHES = 0.5
+BOTTOM_MARGIN_INCHES = 0.5
+
+# Static LaTeX preamble: everything that depends on neither the resume data nor the page height.
+# It can be dumped into a .fmt file once and reused by every compile.
+STATIC_PREAMBLE = r"""
+\documentclass[letterpaper,11pt]{article}
+
+\usepackage{latexsym}
+\usepackage[empty]{fullpage} % This sets margins to be minimal.
+\usepackage{titlesec}
+\usepackage{marvosym}
+\usepackage[usenames,dvipsnames]{color}
+\usepackage{verbatim}
+\usepackage{enumitem}
+\usepackage[hidelinks]{hyperref}
+\usepackage{fancyhdr}
+\usepackage[english]{babel}
+\usepackage{tabularx}
+\usepackage{amsfonts} % For \Huge, \scshape etc. sometimes needs amsfonts or similar
+
+% Adjust margins (text height is set per document, after this preamble)
+\addtolength{\oddsidemargin}{-0.5in}
+\addtolength{\evensidemargin}{-0.5in}
+\addtolength{\textwidth}{1in}
+\addtolength{\topmargin}{-0.5in} % Moves the top of the text area up
 
-    for old, new in replacements:
-        text = text.replace(old, new)
-        
-    # Finally, restore the protected percentage patterns
-    for placeholder, replacement in protected_percentages.items():
-        text = text.replace(placeholder, replacement)
-        
-    return text
+% Page breaking penalties (from previous successful attempt to fill page)
+\clubpenalty=8000
+\widowpenalty=8000
+\tolerance=1000
+\setlength{\emergencystretch}{1.5em}
+
+\urlstyle{same}
+\raggedbottom
+\raggedright
+\setlength{\tabcolsep}{0in}
+
+% Sections formatting (from sample)
+\titleformat{\section}{
+  \vspace{-4pt}\scshape\raggedright\large
+}{}{0em}{}[\color{black}\titlerule \vspace{-5pt}]
 
+% Ensure that generated pdf is machine readable/ATS parsable
+\pdfgentounicode=1
+
+%-------------------------
+% Custom commands (from sample)
+\newcommand{\resumeItem}[1]{
+  \item\small{
+    {#1 \vspace{-2pt}}
+  }
+}
+
+\newcommand{\resumeSubheading}[4]{
+  \vspace{-2pt}\item
+    \begin{tabular*}{0.97\textwidth}[t]{l@{\extracolsep{\fill}}r}
+      \textbf{#1} & #2 \\
+      \textit{\small#3} & \textit{\small #4} \\
+    \end{tabular*}\vspace{-7pt}
+}
+
+\newcommand{\resumeSubSubheading}[2]{
+    \item
+    \begin{tabular*}{0.97\textwidth}{l@{\extracolsep{\fill}}r}
+      \textit{\small#1} & \textit{\small #2} \\
+    \end{tabular*}\vspace{-7pt}
+}
+
+\newcommand{\resumeProjectHeading}[2]{
+    \item
+    \begin{tabular*}{0.97\textwidth}{l@{\extracolsep{\fill}}r}
+      \small#1 & #2 \\
+    \end{tabular*}\vspace{-7pt}
+}
+
+\newcommand{\resumeSubItem}[1]{\resumeItem{#1}\vspace{-4pt}}
+
+\renewcommand\labelitemii{$\vcenter{\hbox{\tiny$\bullet$}}$}
+
+\newcommand{\resumeSubHeadingListStart}{\begin{itemize}[leftmargin=0.15in, label={}]}
+\newcommand{\resumeSubHeadingListEnd}{\end{itemize}}
+\newcommand{\resumeItemListStart}{\begin{itemize}}
+\newcommand{\resumeItemListEnd}{\end{itemize}\vspace{-5pt}}
+"""
 
-def _generate_header_section(personal_info: Optional[Dict[str, Any]]) -> Optional[str]:
-    if not personal_info:
+
+# Rendered sections, keyed by their input data and this file's contents; shared across
+# resumes and sizing attempts. SECTION_CACHE.stats() reports hits and misses.
+SECTION_CACHE = SectionCache(template_source_version(__file__))
+
+
+@SECTION_CACHE.memoize
+def _generate_header_section(contact: Optional[Contact]) -> Optional[str]:
+    if not contact:
         return None
     
-    name = fix_latex_special_chars(personal_info.get("name"))
-    email = personal_info.get("email")  # Raw email, will handle special chars in href
-    phone = fix_latex_special_chars(personal_info.get("phone"))
-    linkedin = fix_latex_special_chars(personal_info.get("linkedin")) # Assuming 'linkedin' key
-    website = fix_latex_special_chars(personal_info.get("website")) # Assuming 'website' key
-    github = fix_latex_special_chars(personal_info.get("github")) # Assuming 'github' key
-    location = fix_latex_special_chars(personal_info.get("location"))
+    name = fix_latex_special_chars(contact.name)
+    email = contact.email  # Raw email, will handle special chars in href
+    phone = fix_latex_special_chars(contact.phone)
+    linkedin = fix_latex_special_chars(contact.linkedin)
+    website = fix_latex_special_chars(contact.website)
+    github = fix_latex_special_chars(contact.github)
+    location = fix_latex_special_chars(contact.location)
 
     lines = []
     if name:
@@ -71,17 +148,17 @@ def _generate_header_section(personal_info: Optional[Dict[str, Any]]) -> Optiona
         # Use the raw email for mailto but escape underscores properly for display
         email_display = email.replace("_", r"\_")  # Proper LaTeX escaping
         contact_parts.append(f"\\href{{mailto:{email}}}{{\\underline{{{email_display}}}}}")
-    if linkedin: # Assuming 'linkedin' key from schema
+    if linkedin:
         linkedin_url = linkedin
         if not linkedin.startswith("http"):
             linkedin_url = f"https://{linkedin}" # Basic assumption
         contact_parts.append(f"\\href{{{linkedin_url}}}{{\\underline{{{linkedin}}}}}")
-    if github: # Assuming 'github' key
+    if github:
         github_url = github
         if not github.startswith("http"):
             github_url = f"https://{github}" # Basic assumption
         contact_parts.append(f"\\href{{{github_url}}}{{\\underline{{{github}}}}}")
-    if website: # Assuming 'website' key
+    if website:
         website_url = website
         if not website.startswith("http"): # Basic check for protocol
              website_url = f"http://{website}"
@@ -103,7 +180,8 @@ def _generate_header_section(personal_info: Optional[Dict[str, Any]]) -> Optiona
     return "\n".join(lines) if lines else None
 
 
-def _generate_objective_section(objective: Optional[str]) -> Optional[str]:
+@SECTION_CACHE.memoize
+def _generate_objective_section(objective: str) -> Optional[str]:
     if not objective:
         return None
     
@@ -111,41 +189,32 @@ def _generate_objective_section(objective: Optional[str]) -> Optional[str]:
   {fix_latex_special_chars(objective)}
 """
 
-def _generate_education_section(education_list: Optional[List[Dict[str, Any]]]) -> Optional[str]:
+@SECTION_CACHE.memoize
+def _generate_education_section(education_list: Tuple[Education, ...]) -> Optional[str]:
     if not education_list:
         return None
     
     lines = ["\\section{Education}", "  \\resumeSubHeadingListStart"]
     for edu in education_list:
-        uni = fix_latex_special_chars(edu.get("institution") or edu.get("university"))
-        loc = fix_latex_special_chars(edu.get("location"))
-        degree_parts = [fix_latex_special_chars(edu.get("degree"))]
-        if edu.get("specialization"):
-            degree_parts.append(fix_latex_special_chars(edu.get("specialization")))
+        uni = fix_latex_special_chars(edu.institution)
+        loc = fix_latex_special_chars(edu.location)
+        degree_parts = [fix_latex_special_chars(edu.degree)]
+        if edu.specialization:
+            degree_parts.append(fix_latex_special_chars(edu.specialization))
         degree_str = ", ".join(filter(None, degree_parts))
         
-        start_date = edu.get("start_date", "")
-        end_date = edu.get("end_date", "")
-        dates = f"{fix_latex_special_chars(start_date)} -- {fix_latex_special_chars(end_date)}" if start_date or end_date else ""
-        if end_date and end_date.lower() == 'present': # Handle 'Present' for end date
-             dates = f"{fix_latex_special_chars(start_date)} -- Present"
-        elif not end_date and start_date: # If only start_date is present
-             dates = fix_latex_special_chars(start_date)
-
+        dates = format_date_range(fix_latex_special_chars(edu.dates.start), fix_latex_special_chars(edu.dates.end))
 
         lines.append(f"    \\resumeSubheading")
         lines.append(f"      {{{uni}}}{{{loc}}}")
         lines.append(f"      {{{degree_str}}}{{{dates}}}")
         
         # Optional GPA and Honors
-        gpa = edu.get("gpa")
-        honors = fix_latex_special_chars(edu.get("honors"))
-        
         details_parts = []
-        if gpa:
-            details_parts.append(f"GPA: {fix_latex_special_chars(gpa)}")
-        if honors:
-            details_parts.append(f"Honors: {honors}")
+        if edu.gpa:
+            details_parts.append(f"GPA: {fix_latex_special_chars(edu.gpa)}")
+        if edu.honors:
+            details_parts.append(f"Honors: {fix_latex_special_chars(edu.honors)}")
         
         if details_parts:
             lines.append(f"    \\resumeSubSubheading{{{', '.join(details_parts)}}}{{}}")
@@ -153,17 +222,13 @@ def _generate_education_section(education_list: Optional[List[Dict[str, Any]]])
         # Relevant coursework / additional info
         # The schema has `relevant_coursework` as a list, and JSON has `additional_info` as a string.
         # Let's prioritize `additional_info` if present, then `relevant_coursework`.
-        
-        additional_info = edu.get("additional_info")
-        relevant_coursework = edu.get("relevant_coursework")
-
-        if additional_info:
+        if edu.additional_info:
             lines.append(r"      \resumeItemListStart")
-            lines.append(f"        \\resumeItem{{{fix_latex_special_chars(additional_info)}}}")
+            lines.append(f"        \\resumeItem{{{fix_latex_special_chars(edu.additional_info)}}}")
             lines.append(r"      \resumeItemListEnd")
-        elif relevant_coursework and isinstance(relevant_coursework, list):
+        elif edu.relevant_coursework:
             lines.append(r"      \resumeItemListStart")
-            courses_str = ", ".join(fix_latex_special_chars(c) for c in relevant_coursework)
+            courses_str = ", ".join(fix_latex_special_chars(c) for c in edu.relevant_coursework)
             lines.append(f"        \\resumeItem{{Relevant Coursework: {courses_str}}}")
             lines.append(r"      \resumeItemListEnd")
             
@@ -171,35 +236,25 @@ def _generate_education_section(education_list: Optional[List[Dict[str, Any]]])
     lines.append("")
     return "\n".join(lines)
 
-def _generate_experience_section(experience_list: Optional[List[Dict[str, Any]]]) -> Optional[str]:
-    # Placeholder: Needs to map JSON `work_experience` to `resumeSubheading` and `resumeItemList`
+@SECTION_CACHE.memoize
+def _generate_experience_section(experience_list: Tuple[Experience, ...]) -> Optional[str]:
     if not experience_list:
         return None
     
     lines = ["\\section{Experience}", "  \\resumeSubHeadingListStart"]
     for exp in experience_list:
-        company = fix_latex_special_chars(exp.get("company"))
-        position = fix_latex_special_chars(exp.get("position") or exp.get("title")) # JSON has 'title'
-        location = fix_latex_special_chars(exp.get("location"))
-        
-        dates_dict = exp.get("dates", {})
-        start_date = fix_latex_special_chars(dates_dict.get("start_date"))
-        end_date = fix_latex_special_chars(dates_dict.get("end_date"))
-        dates_str = f"{start_date} -- {end_date}" if start_date or end_date else ""
-        if end_date and end_date.lower() == 'present':
-             dates_str = f"{start_date} -- Present"
-        elif not end_date and start_date:
-             dates_str = start_date
-
+        company = fix_latex_special_chars(exp.company)
+        position = fix_latex_special_chars(exp.position)
+        location = fix_latex_special_chars(exp.location)
+        dates_str = format_date_range(fix_latex_special_chars(exp.dates.start), fix_latex_special_chars(exp.dates.end))
 
         lines.append(f"    \\resumeSubheading")
         lines.append(f"      {{{position}}}{{{dates_str}}}") # Position first, then dates
         lines.append(f"      {{{company}}}{{{location}}}")   # Company second, then location
 
-        responsibilities = exp.get("responsibilities") or exp.get("responsibilities/achievements") # JSON has the latter
-        if responsibilities and isinstance(responsibilities, list):
+        if exp.responsibilities:
             lines.append(r"      \resumeItemListStart")
-            for resp in responsibilities:
+            for resp in exp.responsibilities:
                 lines.append(f"        \\resumeItem{{{fix_latex_special_chars(resp)}}}")
             lines.append(r"      \resumeItemListEnd")
             
@@ -207,48 +262,29 @@ def _generate_experience_section(experience_list: Optional[List[Dict[str, Any]]]
     lines.append("")
     return "\n".join(lines)
 
-def _generate_projects_section(project_list: Optional[List[Dict[str, Any]]]) -> Optional[str]:
+@SECTION_CACHE.memoize
+def _generate_projects_section(project_list: Tuple[Project, ...]) -> Optional[str]:
     if not project_list:
         return None
     
     lines = ["\\section{Projects}", "    \\resumeSubHeadingListStart"]
     for proj in project_list:
-        title = fix_latex_special_chars(proj.get("title"))
-        # Dates for projects can be a single 'date' or 'dates' dict
-        dates_val = proj.get("dates") or proj.get("date")
-        dates_str = ""
-        if isinstance(dates_val, dict):
-            start = fix_latex_special_chars(dates_val.get("start_date"))
-            end = fix_latex_special_chars(dates_val.get("end_date"))
-            dates_str = f"{start} -- {end}" if start or end else ""
-            if end and end.lower() == 'present': dates_str = f"{start} -- Present"
-            elif not end and start : dates_str = start
-        elif isinstance(dates_val, str):
-            dates_str = fix_latex_special_chars(dates_val)
-
-        tech_used = proj.get("technologies") or proj.get("technologies_used") # JSON has the latter
-        
+        title = fix_latex_special_chars(proj.title)
+        dates_str = format_date_range(fix_latex_special_chars(proj.dates.start), fix_latex_special_chars(proj.dates.end))
+
         # Combining title with technologies if they exist for the heading
         heading_title_part = f"\\textbf{{{title}}}"
-        if tech_used:
-            if isinstance(tech_used, list):
-                tech_str = ", ".join(fix_latex_special_chars(t) for t in tech_used)
-            else: # string
-                tech_str = fix_latex_special_chars(tech_used)
-            if tech_str: # Ensure not empty
-                 heading_title_part += f" $|$ \\emph{{{tech_str}}}"
+        tech_str = ", ".join(fix_latex_special_chars(t) for t in proj.technologies)
+        if tech_str: # Ensure not empty
+             heading_title_part += f" $|$ \\emph{{{tech_str}}}"
 
         lines.append(f"      \\resumeProjectHeading")
         lines.append(f"          {{{heading_title_part}}}{{{dates_str}}}")
 
-        description = proj.get("description")
-        if description:
+        if proj.description:
             lines.append(r"          \resumeItemListStart")
-            if isinstance(description, list):
-                for item in description:
-                    lines.append(f"            \\resumeItem{{{fix_latex_special_chars(item)}}}")
-            else: # string
-                lines.append(f"            \\resumeItem{{{fix_latex_special_chars(description)}}}")
+            for item in proj.description:
+                lines.append(f"            \\resumeItem{{{fix_latex_special_chars(item)}}}")
             lines.append(r"          \resumeItemListEnd")
             
     lines.append("    \\resumeSubHeadingListEnd")
@@ -256,49 +292,33 @@ def _generate_projects_section(project_list: Optional[List[Dict[str, Any]]]) ->
     return "\n".join(lines)
 
 
-def _generate_skills_section(skills_dict: Optional[Dict[str, Any]]) -> Optional[str]:
-    # The sample JSON has skills_dict: {"Soft Skills": [], "Technical Skills": {"Category": [item1, item2]}}
-    # The schema has skills_dict: {"Category": [item1, item2]}
-    # The sample LaTeX is more free-form.
-    # Let's try to match the sample JSON structure and then the schema if that fails.
-
-    if not skills_dict:
+@SECTION_CACHE.memoize
+def _generate_skills_section(skills: Tuple[SkillCategory, ...]) -> Optional[str]:
+    # Skill categories are listed one per line; a 'Soft Skills' list kept next to the
+    # 'Technical Skills' categories (as in Evelyn.json) is only shown when there are no categories.
+    if not skills:
         return None
 
     lines = ["\\section{Technical Skills}"] # Default section title from sample
     
-    # Check for "Technical Skills" sub-dictionary as in Evelyn.json
-    technical_skills_data = skills_dict.get("Technical Skills")
-    
-    # If "Technical Skills" is not a sub-dict, assume skills_dict itself is the category->list_of_skills map
-    # as per the prompt's schema definition.
-    skills_to_process = {}
-    if isinstance(technical_skills_data, dict):
-        skills_to_process = technical_skills_data
-    elif isinstance(skills_dict, dict) and not technical_skills_data: # skills_dict *is* the categories
-        skills_to_process = skills_dict
-    
-    if not skills_to_process: # If still no processable skills (e.g. only "Soft Skills" or empty)
-        # Try to see if there's a "Soft Skills" to list, or just output nothing.
-        soft_skills = skills_dict.get("Soft Skills")
-        if isinstance(soft_skills, list) and soft_skills:
-            lines.append(r" \begin{itemize}[leftmargin=0.15in, label={}]")
-            lines.append(r"    \small{\item{")
-            lines.append(f"     \\textbf{{Soft Skills}}{{: {fix_latex_special_chars(', '.join(soft_skills))}}} \\\\")
-            lines.append(r"    }}")
-            lines.append(r" \end{itemize}")
-            lines.append("")
-            return "\n".join(lines)
-        return None # No technical skills to list in the desired format
+    categories = [category for category in skills if not category.soft]
+    if not categories:
+        soft_skills = skills[0].skills
+        lines.append(r" \begin{itemize}[leftmargin=0.15in, label={}]")
+        lines.append(r"    \small{\item{")
+        lines.append(f"     \\textbf{{Soft Skills}}{{: {fix_latex_special_chars(', '.join(soft_skills))}}} \\\\")
+        lines.append(r"    }}")
+        lines.append(r" \end{itemize}")
+        lines.append("")
+        return "\n".join(lines)
 
     lines.append(r" \begin{itemize}[leftmargin=0.15in, label={}]")
     lines.append(r"    \small{\item{")
     
     category_lines = []
-    for category, skills_list in skills_to_process.items():
-        if isinstance(skills_list, list) and skills_list: # Ensure it's a list and not empty
-            skills_str = ", ".join(fix_latex_special_chars(s) for s in skills_list)
-            category_lines.append(f"     \\textbf{{{fix_latex_special_chars(category)}}}{{: {skills_str}}}")
+    for category in categories:
+        skills_str = ", ".join(fix_latex_special_chars(s) for s in category.skills)
+        category_lines.append(f"     \\textbf{{{fix_latex_special_chars(category.name)}}}{{: {skills_str}}}")
     
     lines.append(" \\\\ ".join(category_lines)) # Join categories with LaTeX newline
     
@@ -308,14 +328,15 @@ def _generate_skills_section(skills_dict: Optional[Dict[str, Any]]) -> Optional[
     return "\n".join(lines)
 
 
-def _generate_languages_section(languages_list: Optional[List[Dict[str, Any]]]) -> Optional[str]:
+@SECTION_CACHE.memoize
+def _generate_languages_section(languages_list: Tuple[Language, ...]) -> Optional[str]:
     if not languages_list:
         return None
     lines = ["\\section{Languages}", r" \begin{itemize}[leftmargin=0.15in, label={}]"]
     lang_items = []
-    for lang_data in languages_list:
-        name = fix_latex_special_chars(lang_data.get("name"))
-        proficiency = fix_latex_special_chars(lang_data.get("proficiency"))
+    for lang in languages_list:
+        name = fix_latex_special_chars(lang.name)
+        proficiency = fix_latex_special_chars(lang.proficiency)
         if name:
             item_str = name
             if proficiency:
@@ -329,18 +350,18 @@ def _generate_languages_section(languages_list: Optional[List[Dict[str, Any]]])
     return "\n".join(lines) if lang_items else None
 
 
-def _generate_certifications_section(cert_list: Optional[List[Dict[str, Any]]]) -> Optional[str]:
-    # Schema: certifications (list of dicts: `certification`, `institution`, `date`)
+@SECTION_CACHE.memoize
+def _generate_certifications_section(cert_list: Tuple[Certification, ...]) -> Optional[str]:
     # Evelyn.json: "Certifications/Awards": [] -> this implies it could be mixed.
-    # Let's assume cert_list is purely certifications for now.
+    # Only the schema's separate 'certifications' list is rendered for now.
     if not cert_list:
         return None
     
     lines = ["\\section{Certifications}", "  \\resumeSubHeadingListStart"]
     for cert in cert_list:
-        name = fix_latex_special_chars(cert.get("certification"))
-        institution = fix_latex_special_chars(cert.get("institution"))
-        date = fix_latex_special_chars(cert.get("date"))
+        name = fix_latex_special_chars(cert.name)
+        institution = fix_latex_special_chars(cert.institution)
+        date = fix_latex_special_chars(cert.date)
         
         # Using resumeSubheading for a structured look, though it's typically for job/edu.
         # We can simplify if needed.
@@ -352,18 +373,17 @@ def _generate_certifications_section(cert_list: Optional[List[Dict[str, Any]]])
     lines.append("")
     return "\n".join(lines)
 
-def _generate_awards_section(awards_list: Optional[List[Dict[str, Any]]]) -> Optional[str]:
-    # Schema: awards (list of dicts: `title`, `issuer`, `date`, `description`)
-    # Evelyn.json: "Certifications/Awards": []
+@SECTION_CACHE.memoize
+def _generate_awards_section(awards_list: Tuple[Award, ...]) -> Optional[str]:
     if not awards_list:
         return None
         
     lines = ["\\section{Awards}", "  \\resumeSubHeadingListStart"]
     for award in awards_list:
-        title = fix_latex_special_chars(award.get("title"))
-        issuer = fix_latex_special_chars(award.get("issuer"))
-        date = fix_latex_special_chars(award.get("date"))
-        description = fix_latex_special_chars(award.get("description"))
+        title = fix_latex_special_chars(award.title)
+        issuer = fix_latex_special_chars(award.issuer)
+        date = fix_latex_special_chars(award.date)
+        description = fix_latex_special_chars(award.description)
 
         lines.append(f"    \\resumeSubheading")
         lines.append(f"      {{{title}}}{{{date}}}")
@@ -379,42 +399,27 @@ def _generate_awards_section(awards_list: Optional[List[Dict[str, Any]]]) -> Opt
     return "\n".join(lines)
 
 
-def _generate_involvement_section(involvement_list: Optional[List[Dict[str, Any]]]) -> Optional[str]:
-    # Schema: involvement or leadership (list of dicts: `organization`, `position`, `date`, `responsibilities` list)
-    # Evelyn.json: "Misc": { "Leadership": { "Event Name": { "dates": ..., "responsibilities": ...}}}
-    # This is quite different. The sample json has a nested structure under "Misc" -> "Leadership"
-    # The schema expects a flat list of involvement dicts.
-    # This template function will try to handle the schema's flat list first.
-    # If that's not found, it will look for the Evelyn.json structure.
-
-    if not involvement_list: # This is for the direct schema key 'involvement' or 'leadership'
+@SECTION_CACHE.memoize
+def _generate_involvement_section(involvement_list: Tuple[Involvement, ...]) -> Optional[str]:
+    # The schema's flat 'involvement' / 'leadership' list; Evelyn.json's 'Misc' -> 'Leadership'
+    # mapping is rendered by _generate_misc_leadership_section instead.
+    if not involvement_list:
         return None
 
     lines = ["\\section{Leadership \\& Involvement}", "  \\resumeSubHeadingListStart"] # Escape ampersand in section title
     
-    for item in involvement_list: # Assuming schema-compliant list
-        organization = fix_latex_special_chars(item.get("organization"))
-        position = fix_latex_special_chars(item.get("position"))
-        
-        date_val = item.get("date") # Schema suggests 'date' (string) or 'dates' (dict)
-        dates_str = ""
-        if isinstance(date_val, dict):
-            start = fix_latex_special_chars(date_val.get("start_date"))
-            end = fix_latex_special_chars(date_val.get("end_date"))
-            dates_str = f"{start} -- {end}" if start or end else ""
-            if end and end.lower() == 'present': dates_str = f"{start} -- Present"
-            elif not end and start : dates_str = start
-        elif isinstance(date_val, str):
-            dates_str = fix_latex_special_chars(date_val)
+    for item in involvement_list:
+        organization = fix_latex_special_chars(item.organization)
+        position = fix_latex_special_chars(item.position)
+        dates_str = format_date_range(fix_latex_special_chars(item.dates.start), fix_latex_special_chars(item.dates.end))
 
         lines.append(f"    \\resumeSubheading")
         lines.append(f"      {{{position}}}{{{dates_str}}}")
         lines.append(f"      {{{organization}}}{{}}")
 
-        responsibilities = item.get("responsibilities")
-        if responsibilities and isinstance(responsibilities, list):
+        if item.responsibilities:
             lines.append(r"      \resumeItemListStart")
-            for resp in responsibilities:
+            for resp in item.responsibilities:
                 lines.append(f"        \\resumeItem{{{fix_latex_special_chars(resp)}}}")
             lines.append(r"      \resumeItemListEnd")
             
@@ -422,28 +427,17 @@ def _generate_involvement_section(involvement_list: Optional[List[Dict[str, Any]
     lines.append("")
     return "\n".join(lines)
 
-def _generate_misc_leadership_section(misc_data: Optional[Dict[str, Any]]) -> Optional[str]:
+@SECTION_CACHE.memoize
+def _generate_misc_leadership_section(activities: Tuple[Activity, ...]) -> Optional[str]:
     """Specifically handles the Evelyn.json Misc.Leadership structure."""
-    if not misc_data or not isinstance(misc_data, dict):
-        return None
-    
-    leadership_data = misc_data.get("Leadership")
-    if not leadership_data or not isinstance(leadership_data, dict):
+    if not activities:
         return None
 
     lines = ["\\section{Leadership \\& Activities}", "  \\resumeSubHeadingListStart"] # Escape ampersand in section title
     
-    for event_name, details in leadership_data.items():
-        name = fix_latex_special_chars(event_name)
-        
-        dates_dict = details.get("dates", {})
-        start_date = fix_latex_special_chars(dates_dict.get("start_date"))
-        end_date = fix_latex_special_chars(dates_dict.get("end_date"))
-        dates_str = f"{start_date} -- {end_date}" if start_date or end_date else ""
-        if end_date and end_date.lower() == 'present':
-             dates_str = f"{start_date} -- Present"
-        elif not end_date and start_date:
-             dates_str = start_date
+    for activity in activities:
+        name = fix_latex_special_chars(activity.name)
+        dates_str = format_date_range(fix_latex_special_chars(activity.dates.start), fix_latex_special_chars(activity.dates.end))
         
         # Using resumeSubheading: Event Name on left, Dates on right.
         # No clear "position" or "organization" like in the schema, so event name is primary.
@@ -451,10 +445,9 @@ def _generate_misc_leadership_section(misc_data: Optional[Dict[str, Any]]) -> Op
         lines.append(f"      {{\\textbf{{{name}}}}}{{{dates_str}}}") # Event name bolded
         lines.append(f"      {{}}{{}}") # Empty second line of subheading
         
-        responsibilities = details.get("responsibilities/achievements") # From Evelyn.json
-        if responsibilities and isinstance(responsibilities, list):
+        if activity.responsibilities:
             lines.append(r"      \resumeItemListStart")
-            for resp in responsibilities:
+            for resp in activity.responsibilities:
                 lines.append(f"        \\resumeItem{{{fix_latex_special_chars(resp)}}}")
             lines.append(r"      \resumeItemListEnd")
             
@@ -463,181 +456,75 @@ def _generate_misc_leadership_section(misc_data: Optional[Dict[str, Any]]) -> Op
     return "\n".join(lines)
 
 
-def generate_latex_content(data: Dict[str, Any], page_height: Optional[float] = None) -> str:
-    """
-    Generates the full LaTeX document string for a classic resume.
-    Args:
-        data: The parsed JSON resume data.
-        page_height: Optional page height in inches. If None, a template default is used.
-    Returns:
-        A string containing the complete LaTeX document.
-    """
-    
-    page_height_setting_for_doc_start = "" # For \pdfpageheight
-    
-    # Determine the physical page height for this compilation run
-    current_physical_page_height = page_height if page_height is not None else DEFAULT_TEMPLATE_PAGE_HEIGHT_INCHES
-
-    if page_height is not None:
-        # This sets the physical media height at the start of the document
-        page_height_setting_for_doc_start = f"\\setlength{{\\pdfpageheight}}{{{current_physical_page_height:.2f}in}}"
-
-    # Calculate target text height based on the current physical page height
-    # Assuming 0.5in for top margin (due to \addtolength{\topmargin}{-.5in}) and 0.5in for bottom margin
-    effective_top_margin = 0.5
-    desired_bottom_margin = 0.5
-    target_text_height = current_physical_page_height - effective_top_margin - desired_bottom_margin
-    text_height_declaration = f"\\setlength{{\\textheight}}{{{target_text_height:.2f}in}}"
-
-    # LaTeX Preamble
-    # The text_height_declaration is now part of this main preamble string
-    preamble = rf"""
-\documentclass[letterpaper,11pt]{{article}}
-
-\usepackage{{latexsym}}
-\usepackage[empty]{{fullpage}} % This sets margins to be minimal.
-\usepackage{{titlesec}}
-\usepackage{{marvosym}}
-\usepackage[usenames,dvipsnames]{{color}}
-\usepackage{{verbatim}}
-\usepackage{{enumitem}}
-\usepackage[hidelinks]{{hyperref}}
-\usepackage{{fancyhdr}}
-\usepackage[english]{{babel}}
-\usepackage{{tabularx}}
-\usepackage{{amsfonts}} % For \Huge, \scshape etc. sometimes needs amsfonts or similar
-
-% Adjust margins and SET text height precisely
-\addtolength{{\oddsidemargin}}{{-0.5in}}
-\addtolength{{\evensidemargin}}{{-0.5in}}
-\addtolength{{\textwidth}}{{1in}}
-\addtolength{{\topmargin}}{{-0.5in}} % Moves the top of the text area up
-{text_height_declaration}         % SET the text height based on physical page height and margins
+def page_height_for_content(content_height_inches: float) -> float:
+    """Returns the page height (in inches) whose text area exactly holds content of the given height."""
+    return content_height_inches + TOP_MARGIN_INCHES + BOTTOM_MARGIN_INCHES
 
-% Page breaking penalties (from previous successful attempt to fill page)
-\clubpenalty=8000
-\widowpenalty=8000
-\tolerance=1000
-\setlength{{\emergencystretch}}{{1.5em}}
-
-\urlstyle{{same}}
-\raggedbottom 
-\raggedright
-\setlength{{\tabcolsep}}{{0in}}
 
-% Sections formatting (from sample)
-\titleformat{{\section}}{{
-  \vspace{{-4pt}}\scshape\raggedright\large
-}}{{}}{{0em}}{{}}[\color{{black}}\titlerule \vspace{{-5pt}}]
+# The static preamble, guarded so it is skipped when compiling on top of the precompiled format.
+# Built once at import; only the geometry lines after it change between documents.
+GUARDED_STATIC_PREAMBLE = guard_static_preamble(STATIC_PREAMBLE)
 
-% Ensure that generated pdf is machine readable/ATS parsable
-\pdfgentounicode=1
 
-%-------------------------
-% Custom commands (from sample)
-\newcommand{{\resumeItem}}[1]{{
-  \item\small{{
-    {{#1 \vspace{{-2pt}}}}
-  }}
-}}
-
-\newcommand{{\resumeSubheading}}[4]{{
-  \vspace{{-2pt}}\item
-    \begin{{tabular*}}{{0.97\textwidth}}[t]{{l@{{\extracolsep{{\fill}}}}r}}
-      \textbf{{#1}} & #2 \\
-      \textit{{\small#3}} & \textit{{\small #4}} \\
-    \end{{tabular*}}\vspace{{-7pt}}
-}}
-
-\newcommand{{\resumeSubSubheading}}[2]{{
-    \item
-    \begin{{tabular*}}{{0.97\textwidth}}{{l@{{\extracolsep{{\fill}}}}r}}
-      \textit{{\small#1}} & \textit{{\small #2}} \\
-    \end{{tabular*}}\vspace{{-7pt}}
-}}
-
-\newcommand{{\resumeProjectHeading}}[2]{{
-    \item
-    \begin{{tabular*}}{{0.97\textwidth}}{{l@{{\extracolsep{{\fill}}}}r}}
-      \small#1 & #2 \\
-    \end{{tabular*}}\vspace{{-7pt}}
-}}
-
-\newcommand{{\resumeSubItem}}[1]{{\resumeItem{{#1}}\vspace{{-4pt}}}}
-
-\renewcommand\labelitemii{{$\vcenter{{\hbox{{\tiny$\bullet$}}}}$}}
-
-\newcommand{{\resumeSubHeadingListStart}}{{\begin{{itemize}}[leftmargin=0.15in, label={{}}]}}
-\newcommand{{\resumeSubHeadingListEnd}}{{\end{{itemize}}}}
-\newcommand{{\resumeItemListStart}}{{\begin{itemize}}}}
-\newcommand{{\resumeItemListEnd}}{{\end{{itemize}}\vspace{{-5pt}}}}
-""" 
-
-    # Document body start
-    doc_start = f"""\\begin{{document}}
-{page_height_setting_for_doc_start}
-"""
+def iter_latex_document(body: str, page_height: Optional[float] = None) -> Iterator[str]:
+    """
+    Yields the document of assemble_latex_document() in pieces, without joining them,
+    e.g. to stream it into the TeX engine.
+    """
+    yield GUARDED_STATIC_PREAMBLE
+    yield "\n"
+    yield page_geometry(page_height, DEFAULT_TEMPLATE_PAGE_HEIGHT_INCHES, TOP_MARGIN_INCHES, BOTTOM_MARGIN_INCHES)
+    yield body
 
-    # Extract data based on schema (and handle Evelyn.json variations where noted)
-    # The schema uses 'contact', Evelyn.json uses 'Personal Information'.
-    # The schema uses 'objective' or 'summary', Evelyn.json uses 'Summary/Objective'.
-    # The schema uses 'work_experience', Evelyn.json uses 'Experience'.
-    # The schema uses 'skills' (dict), Evelyn.json uses 'Skills' (dict with sub-dicts).
-    # The schema uses 'languages', Evelyn.json uses 'Languages'.
-    # The schema uses 'certifications', Evelyn.json uses 'Certifications/Awards' (potentially mixed).
-    # The schema uses 'awards', (see above).
-    # The schema uses 'involvement' or 'leadership', Evelyn.json has 'Misc' -> 'Leadership'.
-
-    personal_info_data = data.get("Personal Information") or data.get("contact")
-    name_from_data = data.get("name") # Top level name from schema.
-    if name_from_data and personal_info_data and not personal_info_data.get('name'):
-        personal_info_data['name'] = name_from_data # Inject if missing in contact dict
-
-    objective_data = data.get("Summary/Objective") or data.get("objective") or data.get("summary")
-    education_data = data.get("Education") or data.get("education")
-    experience_data = data.get("Experience") or data.get("work_experience")
-    projects_data = data.get("Projects") or data.get("projects")
-    skills_data = data.get("Skills") or data.get("skills")
-    languages_data = data.get("Languages") or data.get("languages")
-    
-    # For certs/awards, Evelyn.json has "Certifications/Awards".
-    # Schema has separate "certifications" and "awards".
-    # We'll prefer direct keys first.
-    certifications_data = data.get("certifications")
-    awards_data = data.get("awards")
-    certs_and_awards_mixed = data.get("Certifications/Awards")
 
-    # If specific keys are empty but mixed one exists, we might need to split them.
-    # For now, this template won't try to split a mixed list. It will use dedicated lists if present.
-    # If only the mixed list is present and non-empty, we might decide to pass it to one
-    # or the other, or a combined section. Given the prompt, let's assume separate lists are preferred.
+def assemble_latex_document(body: str, page_height: Optional[float] = None) -> str:
+    """
+    Splices a document body from generate_latex_body() into the static preamble with the
+    geometry for page_height. Cheap enough to call once per sizing attempt.
+    Args:
+        body: The rendered document body.
+        page_height: Optional page height in inches. If None, a template default is used.
+    Returns:
+        A string containing the complete LaTeX document.
+    """
+    return "".join(iter_latex_document(body, page_height))
 
-    involvement_data = data.get("involvement") or data.get("leadership") # Schema direct keys
-    misc_data = data.get("Misc") # For Evelyn.json specific "Misc" -> "Leadership"
 
+def generate_latex_body(data: Union[Resume, Dict[str, Any]], report_content_height: bool = False) -> str:
+    """
+    Generates everything after the page geometry: the resume sections and \\end{document}.
+    It does not depend on the page height, so one body serves every sizing attempt.
+    Args:
+        data: The parsed JSON resume data, or a Resume already normalized from it.
+        report_content_height: If True, the document writes the height of its typeset content
+            to the log (see CONTENT_HEIGHT_LOG_TAG). Meaningful when everything fits on one page.
+    Returns:
+        The document body, to be passed to assemble_latex_document().
+    """
+    # The schema's and Evelyn.json's key variants are resolved by normalize_resume();
+    # the data itself is never modified.
+    resume = normalize_resume(data)
 
     # Generate LaTeX for each section
-    header_tex = _generate_header_section(personal_info_data)
-    objective_tex = _generate_objective_section(objective_data)
-    education_tex = _generate_education_section(education_data)
-    experience_tex = _generate_experience_section(experience_data)
-    projects_tex = _generate_projects_section(projects_data)
-    skills_tex = _generate_skills_section(skills_data) # Handles complex skills structure
-    languages_tex = _generate_languages_section(languages_data)
-    certifications_tex = _generate_certifications_section(certifications_data)
-    awards_tex = _generate_awards_section(awards_data)
+    header_tex = _generate_header_section(resume.contact)
+    objective_tex = _generate_objective_section(resume.summary)
+    education_tex = _generate_education_section(resume.education)
+    experience_tex = _generate_experience_section(resume.experience)
+    projects_tex = _generate_projects_section(resume.projects)
+    skills_tex = _generate_skills_section(resume.skills)
+    languages_tex = _generate_languages_section(resume.languages)
+    certifications_tex = _generate_certifications_section(resume.certifications)
+    awards_tex = _generate_awards_section(resume.awards)
     
     involvement_tex = None
-    if involvement_data: # Prioritize schema's direct key
-        involvement_tex = _generate_involvement_section(involvement_data)
-    elif misc_data: # Fallback to Evelyn.json's Misc.Leadership structure
-        involvement_tex = _generate_misc_leadership_section(misc_data)
+    if resume.involvement: # Prioritize schema's direct key
+        involvement_tex = _generate_involvement_section(resume.involvement)
+    elif resume.activities: # Fallback to Evelyn.json's Misc.Leadership structure
+        involvement_tex = _generate_misc_leadership_section(resume.activities)
 
 
-    # Assemble the document
+    # Assemble the body
     content_parts = [
-        preamble,
-        doc_start,
         header_tex,
         objective_tex, # Or summary
         education_tex,
@@ -648,16 +535,30 @@ def generate_latex_content(data: Dict[str, Any], page_height: Optional[float] =
         certifications_tex,
         awards_tex,
         involvement_tex, # Covers leadership/misc as well
-        r"""
-\end{document}
-"""
     ]
+    if report_content_height:
+        content_parts.append(CONTENT_HEIGHT_REPORT)
+    content_parts.append(r"""
+\end{document}
+""")
     
     # Filter out None parts (e.g., if a section is empty and its generate function returns None)
     # and join them.
-    full_latex_doc = "\n".join(filter(None, content_parts))
-    
-    return full_latex_doc
+    return "\n".join(filter(None, content_parts))
+
+
+def generate_latex_content(data: Union[Resume, Dict[str, Any]], page_height: Optional[float] = None, report_content_height: bool = False) -> str:
+    """
+    Generates the full LaTeX document string for a classic resume.
+    Args:
+        data: The parsed JSON resume data, or a Resume already normalized from it.
+        page_height: Optional page height in inches. If None, a template default is used.
+        report_content_height: If True, the document writes the height of its typeset content
+            to the log (see CONTENT_HEIGHT_LOG_TAG). Meaningful when everything fits on one page.
+    Returns:
+        A string containing the complete LaTeX document.
+    """
+    return assemble_latex_document(generate_latex_body(data, report_content_height), page_height)
 
 # --- Minimal test for the template if run directly (not typical use) ---
 if __name__ == '__main__':
@@ -0,0 +1,228 @@
+"""
+Compact resume template: 10pt type, tighter spacing, one-line entry headings.
+
+Written as a declarative spec (see templates/declarative.py); load_template()
+compiles it into the usual template functions.
+"""
+
+STATIC_PREAMBLE = r"""
+\documentclass[letterpaper,10pt]{article}
+
+\usepackage{latexsym}
+\usepackage[empty]{fullpage}
+\usepackage{titlesec}
+\usepackage[usenames,dvipsnames]{color}
+\usepackage{enumitem}
+\usepackage[hidelinks]{hyperref}
+\usepackage[english]{babel}
+\usepackage{tabularx}
+
+% Adjust margins (text height is set per document, after this preamble)
+\addtolength{\oddsidemargin}{-0.6in}
+\addtolength{\evensidemargin}{-0.6in}
+\addtolength{\textwidth}{1.2in}
+\addtolength{\topmargin}{-0.5in}
+
+\clubpenalty=8000
+\widowpenalty=8000
+\tolerance=1000
+\setlength{\emergencystretch}{1.5em}
+
+\urlstyle{same}
+\raggedbottom
+\raggedright
+\setlength{\tabcolsep}{0in}
+
+\titleformat{\section}{
+  \vspace{-6pt}\scshape\raggedright\normalsize\bfseries
+}{}{0em}{}[\color{black}\titlerule \vspace{-6pt}]
+
+\pdfgentounicode=1
+
+% #1 title, #2 dates, #3 organization, #4 location: all on one line
+\newcommand{\resumeSubheading}[4]{
+  \item
+    \begin{tabular*}{0.99\textwidth}[t]{l@{\extracolsep{\fill}}r}
+      \textbf{#1}\ifx\relax#3\relax\else, \textit{#3}\fi & \small #2\ifx\relax#4\relax\else\ $|$ #4\fi \\
+    \end{tabular*}\vspace{-8pt}
+}
+
+\newcommand{\resumeProjectHeading}[2]{
+  \item
+    \begin{tabular*}{0.99\textwidth}{l@{\extracolsep{\fill}}r}
+      \small#1 & \small #2 \\
+    \end{tabular*}\vspace{-8pt}
+}
+
+\newcommand{\resumeItem}[1]{\item\small{#1 \vspace{-3pt}}}
+
+\newcommand{\resumeSubHeadingListStart}{\begin{itemize}[leftmargin=0.1in, label={}]}
+\newcommand{\resumeSubHeadingListEnd}{\end{itemize}}
+\newcommand{\resumeItemListStart}{\begin{itemize}[leftmargin=0.2in, itemsep=0pt]}
+\newcommand{\resumeItemListEnd}{\end{itemize}\vspace{-6pt}}
+"""
+
+# Bullet list under an entry
+BULLETS = {
+    "begin": r"      \resumeItemListStart",
+    "line": r"        \resumeItem{<<item>>}",
+    "end": r"      \resumeItemListEnd",
+}
+
+ENTRY_LIST_BEGIN = r"  \resumeSubHeadingListStart"
+ENTRY_LIST_END = [r"  \resumeSubHeadingListEnd", ""]
+
+TEMPLATE_SPEC = {
+    "static_preamble": STATIC_PREAMBLE,
+    "default_page_height_inches": 11.0,
+    "top_margin_inches": 0.5,
+    "bottom_margin_inches": 0.5,
+    "sections": [
+        {
+            "name": "header",
+            "source": "contact",
+            "type": "record",
+            "fields": {
+                "name": "name",
+                "contact": {
+                    "join": " $|$ ",
+                    "parts": [
+                        "phone",
+                        {"attr": "email", "link": "mailto:"},
+                        {"attr": "linkedin", "link": "https://"},
+                        {"attr": "github", "link": "https://"},
+                        {"attr": "website", "link": "http://"},
+                        "location",
+                    ],
+                },
+            },
+            "lines": [
+                r"\begin{center}",
+                r"    {\LARGE \scshape <<name>>} \\ \vspace{1pt}",
+                r"    \small <<contact>>",
+                r"\end{center}",
+                r"\vspace{-8pt}",
+            ],
+        },
+        {
+            "name": "summary",
+            "source": "summary",
+            "type": "text",
+            "begin": r"\section*{Summary}",
+            "lines": [r"  \small <<value>>", ""],
+        },
+        {
+            "name": "education",
+            "source": "education",
+            "begin": [r"\section{Education}", ENTRY_LIST_BEGIN],
+            "end": ENTRY_LIST_END,
+            "fields": {
+                "institution": "institution",
+                "degree": {
+                    "parts": [
+                        "degree",
+                        "specialization",
+                        {"attr": "gpa", "prefix": "GPA: "},
+                        {"attr": "honors", "prefix": "Honors: "},
+                    ],
+                },
+                "location": "location",
+                "dates": {"attr": "dates", "format": "date_range"},
+            },
+            "lines": r"    \resumeSubheading{<<institution>>}{<<dates>>}{<<degree>>}{<<location>>}",
+            "items": dict(BULLETS, attr=["additional_info", "relevant_coursework"]),
+        },
+        {
+            "name": "experience",
+            "source": "experience",
+            "begin": [r"\section{Experience}", ENTRY_LIST_BEGIN],
+            "end": ENTRY_LIST_END,
+            "fields": {
+                "position": "position",
+                "company": "company",
+                "location": "location",
+                "dates": {"attr": "dates", "format": "date_range"},
+            },
+            "lines": r"    \resumeSubheading{<<position>>}{<<dates>>}{<<company>>}{<<location>>}",
+            "items": dict(BULLETS, attr="responsibilities"),
+        },
+        {
+            "name": "projects",
+            "source": "projects",
+            "begin": [r"\section{Projects}", ENTRY_LIST_BEGIN],
+            "end": ENTRY_LIST_END,
+            "fields": {
+                "title": "title",
+                "technologies": {"attr": "technologies", "prefix": r" $|$ \emph{", "suffix": "}"},
+                "dates": {"attr": "dates", "format": "date_range"},
+            },
+            "lines": r"    \resumeProjectHeading{\textbf{<<title>>}<<technologies>>}{<<dates>>}",
+            "items": dict(BULLETS, attr="description"),
+        },
+        {
+            "name": "skills",
+            "source": "skills",
+            "type": "categories",
+            "begin": [r"\section{Skills}", r" \begin{itemize}[leftmargin=0.1in, label={}]", r"    \small{\item{"],
+            "end": [r"    }}", r" \end{itemize}", ""],
+            "lines": r"     \textbf{<<category>>}{: <<values>>}",
+            "join": " \\\\\n",
+        },
+        {
+            "name": "languages",
+            "source": "languages",
+            "begin": [r"\section{Languages}", r" \begin{itemize}[leftmargin=0.1in, label={}, itemsep=0pt]"],
+            "end": [r" \end{itemize}", ""],
+            "fields": {
+                "name": "name",
+                "proficiency": {"attr": "proficiency", "prefix": " (", "suffix": ")"},
+            },
+            "lines": r"    \small{\item{<<name>><<proficiency>>}}",
+        },
+        {
+            "name": "certifications",
+            "source": "certifications",
+            "begin": [r"\section{Certifications}", ENTRY_LIST_BEGIN],
+            "end": ENTRY_LIST_END,
+            "fields": {"certification": "name", "institution": "institution", "date": "date"},
+            "lines": r"    \resumeSubheading{<<certification>>}{<<date>>}{<<institution>>}{}",
+        },
+        {
+            "name": "awards",
+            "source": "awards",
+            "begin": [r"\section{Awards}", ENTRY_LIST_BEGIN],
+            "end": ENTRY_LIST_END,
+            "fields": {"title": "title", "issuer": "issuer", "date": "date"},
+            "lines": r"    \resumeSubheading{<<title>>}{<<date>>}{<<issuer>>}{}",
+            "items": dict(BULLETS, attr="description"),
+        },
+        {
+            "name": "involvement",
+            "source": "involvement",
+            "begin": [r"\section{Leadership \& Involvement}", ENTRY_LIST_BEGIN],
+            "end": ENTRY_LIST_END,
+            "fields": {
+                "position": "position",
+                "organization": "organization",
+                "dates": {"attr": "dates", "format": "date_range"},
+            },
+            "lines": r"    \resumeSubheading{<<position>>}{<<dates>>}{<<organization>>}{}",
+            "items": dict(BULLETS, attr="responsibilities"),
+        },
+        {
+            # The export style's 'Misc' -> 'Leadership' entries (event name -> details), as in
+            # the classic template only when there is no schema-style involvement
+            "name": "activities",
+            "source": "activities",
+            "unless": "involvement",
+            "begin": [r"\section{Leadership \& Activities}", ENTRY_LIST_BEGIN],
+            "end": ENTRY_LIST_END,
+            "fields": {
+                "name": "name",
+                "dates": {"attr": "dates", "format": "date_range"},
+            },
+            "lines": r"    \resumeSubheading{\textbf{<<name>>}}{<<dates>>}{}{}",
+            "items": dict(BULLETS, attr="responsibilities"),
+        },
+    ],
+}
@@ -0,0 +1,368 @@
+"""
+Declarative templates.
+
+A template module may describe itself with a TEMPLATE_SPEC dict instead of
+hand-written section functions. load_template() compiles the spec once into
+render closures (field getters bound to attributes of the normalized Resume
+model, snippets split into literal and placeholder parts) and attaches the usual
+template interface to the module: generate_latex_content(), generate_latex_body(),
+iter_latex_document(), assemble_latex_document(), page_height_for_content(),
+STATIC_PREAMBLE, PREAMBLE_LOADED_MACRO, CONTENT_HEIGHT_LOG_TAG and SECTION_CACHE.
+
+Spec layout:
+    TEMPLATE_SPEC = {
+        "static_preamble": r"\\documentclass{article} ...",
+        "default_page_height_inches": 11.0,   # optional, as are the two margins
+        "top_margin_inches": 0.5,
+        "bottom_margin_inches": 0.5,
+        "sections": [
+            {
+                "name": "experience",
+                "source": "experience",     # a Resume field (see templates/resume_model.py)
+                "type": "entries",          # text | record | entries | categories
+                "begin": [r"\\section{Experience}", r"  \\resumeSubHeadingListStart"],
+                "end": [r"  \\resumeSubHeadingListEnd", ""],
+                "fields": {
+                    "position": "position",
+                    "dates": {"attr": "dates", "format": "date_range"},
+                },
+                "lines": [r"    \\resumeSubheading{<<position>>}{<<dates>>}"],
+                "items": {"attr": "responsibilities", "begin": [...], "line": r"\\resumeItem{<<item>>}", "end": [...]},
+            },
+            {"name": "activities", "source": "activities", "unless": "involvement", ...},
+        ],
+    }
+
+Snippets refer to fields as <<name>>; everything else is literal LaTeX. A line whose
+placeholders all render empty is left out. Field values are escaped; 'text' sections
+provide <<value>>, item lines <<item>>, and 'categories' lines (one per SkillCategory,
+joined by 'join') <<category>> and <<values>>.
+
+A section with 'unless' (another Resume field) is left out when that field is
+non-empty, e.g. to render one source only as a fallback for another.
+
+Field specs: an attribute of the section's record type, a list of attributes (the
+first non-empty one is used), or a dict with 'attr' and optionally 'join' (separator
+for tuple values, default ', '), 'prefix'/'suffix' (added around non-empty values),
+'format': 'date_range' (for a DateRange), 'link': URL prefix (renders \\href, URL escaped, with the
+underlined value), or 'parts' (a list of field specs rendered and joined by 'join').
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .latex_utils import (
+    CONTENT_HEIGHT_LOG_TAG,
+    CONTENT_HEIGHT_REPORT,
+    PREAMBLE_LOADED_MACRO,
+    escape_latex_url,
+    fix_latex_special_chars,
+    format_date_range,
+    guard_static_preamble,
+    page_geometry,
+)
+from .resume_model import RECORD_TYPES, DateRange, Resume, normalize_resume
+from .section_cache import SectionCache, template_source_version
+
+SECTION_TYPES = ("text", "record", "entries", "categories")
+PLACEHOLDER_PATTERN = re.compile(r"<<(\w+)>>")
+DEFAULT_JOIN = ", "
+
+# A compiled snippet: its literal parts and the placeholder names between them
+Snippet = Tuple[Tuple[str, ...], Tuple[str, ...]]
+# Field getters take a record of the model (a NamedTuple such as Experience)
+FieldGetter = Callable[[Any], str]
+
+
+class TemplateSpecError(ValueError):
+    """Raised when a TEMPLATE_SPEC is malformed; names the offending section."""
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _compile_snippet(text: str) -> Snippet:
+    pieces = PLACEHOLDER_PATTERN.split(text)
+    return tuple(pieces[0::2]), tuple(pieces[1::2])
+
+
+def _render_snippet(snippet: Snippet, values: Dict[str, str]) -> Optional[str]:
+    """Fills a snippet in; None if it has placeholders and all of them are empty."""
+    literals, names = snippet
+    if not names:
+        return literals[0]
+    filled = [values[name] for name in names]
+    if not any(filled):
+        return None
+    parts = [literals[0]]
+    for value, literal in zip(filled, literals[1:]):
+        parts.append(value)
+        parts.append(literal)
+    return "".join(parts)
+
+
+def _compile_attrs(spec: Any, record_type: Optional[type], section_name: str) -> Callable[[Any], Any]:
+    """Returns a getter for the first non-empty of the attributes named by spec."""
+    attrs = tuple(_as_list(spec))
+    if not attrs or not all(isinstance(attr, str) for attr in attrs):
+        raise TemplateSpecError(f"section '{section_name}': field spec needs attribute names, got {spec!r}")
+    if record_type is not None:
+        for attr in attrs:
+            if attr not in record_type._fields:
+                raise TemplateSpecError(
+                    f"section '{section_name}': {record_type.__name__} has no attribute {attr!r}"
+                )
+    if len(attrs) == 1:
+        attr = attrs[0]
+        return lambda record: getattr(record, attr)
+
+    def get_first(record: Any) -> Any:
+        for attr in attrs:
+            value = getattr(record, attr)
+            if value:
+                return value
+        return None
+    return get_first
+
+
+def _compile_field(spec: Any, record_type: Optional[type], section_name: str) -> FieldGetter:
+    if isinstance(spec, (str, list, tuple)):
+        spec = {"attr": spec}
+    if not isinstance(spec, dict):
+        raise TemplateSpecError(f"section '{section_name}': invalid field spec {spec!r}")
+
+    join = spec.get("join", DEFAULT_JOIN)
+    prefix = spec.get("prefix", "")
+    suffix = spec.get("suffix", "")
+
+    def decorate(getter: FieldGetter) -> FieldGetter:
+        if not prefix and not suffix:
+            return getter
+
+        def decorated(record: Any) -> str:
+            value = getter(record)
+            return f"{prefix}{value}{suffix}" if value else ""
+        return decorated
+
+    if "parts" in spec:
+        part_getters = [_compile_field(part, record_type, section_name) for part in _as_list(spec["parts"])]
+
+        def get_parts(record: Any) -> str:
+            return join.join(filter(None, (getter(record) for getter in part_getters)))
+        return decorate(get_parts)
+
+    get_attr = _compile_attrs(spec.get("attr"), record_type, section_name)
+    field_format = spec.get("format")
+
+    if field_format == "date_range":
+        def get_dates(record: Any) -> str:
+            value = get_attr(record)
+            if isinstance(value, DateRange):
+                return format_date_range(fix_latex_special_chars(value.start), fix_latex_special_chars(value.end))
+            return fix_latex_special_chars(value)
+        return decorate(get_dates)
+    if field_format is not None:
+        raise TemplateSpecError(f"section '{section_name}': unknown field format {field_format!r}")
+
+    link = spec.get("link")
+    if link is not None:
+        def get_link(record: Any) -> str:
+            value = get_attr(record)
+            if not value:
+                return ""
+            url = str(value)
+            if not url.startswith(("http://", "https://")):
+                url = f"{link}{url}"
+            return f"\\href{{{escape_latex_url(url)}}}{{\\underline{{{fix_latex_special_chars(value)}}}}}"
+        return decorate(get_link)
+
+    def get_value(record: Any) -> str:
+        value = get_attr(record)
+        if isinstance(value, tuple):
+            return join.join(fix_latex_special_chars(v) for v in value if v)
+        return fix_latex_special_chars(value)
+    return decorate(get_value)
+
+
+def _compile_lines(lines: Any, available: Sequence[str], section_name: str) -> List[Snippet]:
+    snippets = [_compile_snippet(line) for line in _as_list(lines)]
+    for _, names in snippets:
+        for name in names:
+            if name not in available:
+                raise TemplateSpecError(f"section '{section_name}': unknown placeholder <<{name}>>")
+    return snippets
+
+
+def _fill(snippets: List[Snippet], values: Dict[str, str], out: List[str]) -> None:
+    for snippet in snippets:
+        line = _render_snippet(snippet, values)
+        if line is not None:
+            out.append(line)
+
+
+def _compile_items(
+    spec: Optional[Dict[str, Any]],
+    record_type: Optional[type],
+    section_name: str
+) -> Optional[Callable[[Any, List[str]], None]]:
+    """Compiles a section's 'items' spec (the bullet list under each entry)."""
+    if spec is None:
+        return None
+    if not spec.get("attr"):
+        raise TemplateSpecError(f"section '{section_name}': 'items' needs 'attr'")
+    get_items = _compile_attrs(spec["attr"], record_type, section_name)
+    begin = _compile_lines(spec.get("begin"), (), section_name)
+    end = _compile_lines(spec.get("end"), (), section_name)
+    line = _compile_lines(spec.get("line", "<<item>>"), ("item",), section_name)
+
+    def render_items(record: Any, out: List[str]) -> None:
+        items = [fix_latex_special_chars(item) for item in _as_list(get_items(record)) if item]
+        if not items:
+            return
+        _fill(begin, {}, out)
+        for item in items:
+            _fill(line, {"item": item}, out)
+        _fill(end, {}, out)
+    return render_items
+
+
+def compile_section(spec: Dict[str, Any]) -> Callable[[Any], Optional[str]]:
+    """
+    Compiles one section spec.
+    Returns:
+        A function taking the section's data (the Resume field named by its 'source')
+        and returning its LaTeX, or None if there is nothing to render.
+    Raises:
+        TemplateSpecError: If the spec is malformed.
+    """
+    name = spec.get("name")
+    if not isinstance(name, str) or not name:
+        raise TemplateSpecError(f"section spec without a name: {spec!r}")
+    section_type = spec.get("type", "entries")
+    if section_type not in SECTION_TYPES:
+        raise TemplateSpecError(f"section '{name}': unknown type {section_type!r}")
+    source = spec.get("source")
+    if source not in Resume._fields:
+        raise TemplateSpecError(f"section '{name}': 'source' must be one of {', '.join(Resume._fields)}")
+    if spec.get("unless") is not None and spec["unless"] not in Resume._fields:
+        raise TemplateSpecError(f"section '{name}': 'unless' must be one of {', '.join(Resume._fields)}")
+    record_type = RECORD_TYPES.get(source)
+
+    getters = {field: _compile_field(field_spec, record_type, name) for field, field_spec in spec.get("fields", {}).items()}
+    begin = _compile_lines(spec.get("begin"), (), name)
+    end = _compile_lines(spec.get("end"), (), name)
+    available = {"text": ("value",), "categories": ("category", "values")}.get(section_type, tuple(getters))
+    lines = _compile_lines(spec.get("lines"), available, name)
+    render_items = _compile_items(spec.get("items"), record_type, name)
+    join = spec.get("join", "\n")
+
+    def field_values(record: Any) -> Dict[str, str]:
+        return {field: getter(record) for field, getter in getters.items()}
+
+    def render_body(data: Any, out: List[str]) -> bool:
+        """Appends the section content to out; False if the data has nothing to render."""
+        if section_type == "text":
+            if isinstance(data, tuple):
+                value = DEFAULT_JOIN.join(fix_latex_special_chars(v) for v in data if v)
+            else:
+                value = fix_latex_special_chars(data)
+            _fill(lines, {"value": value}, out)
+            return bool(value)
+        if section_type == "record":
+            _fill(lines, field_values(data), out)
+            if render_items is not None:
+                render_items(data, out)
+            return True
+        if section_type == "categories":
+            rendered = []
+            for category in data:
+                values_text = DEFAULT_JOIN.join(fix_latex_special_chars(v) for v in category.skills if v)
+                if values_text:
+                    category_lines: List[str] = []
+                    _fill(lines, {"category": fix_latex_special_chars(category.name), "values": values_text}, category_lines)
+                    rendered.append("\n".join(category_lines))
+            if rendered:
+                out.append(join.join(rendered))
+            return bool(rendered)
+        for record in data:
+            _fill(lines, field_values(record), out)
+            if render_items is not None:
+                render_items(record, out)
+        return True
+
+    def render(data: Any) -> Optional[str]:
+        if not data:
+            return None
+        out: List[str] = []
+        _fill(begin, {}, out)
+        if not render_body(data, out):
+            return None
+        _fill(end, {}, out)
+        return "\n".join(out)
+
+    render.__qualname__ = f"section:{name}"
+    return render
+
+
+def compile_template(module: Any) -> None:
+    """
+    Compiles module.TEMPLATE_SPEC once and attaches the template interface to the module.
+    Raises:
+        TemplateSpecError: If the spec is malformed.
+    """
+    spec = module.TEMPLATE_SPEC
+    if not isinstance(spec, dict) or not isinstance(spec.get("static_preamble"), str):
+        raise TemplateSpecError("TEMPLATE_SPEC needs a 'static_preamble' string")
+    section_specs = spec.get("sections")
+    if not isinstance(section_specs, list) or not section_specs:
+        raise TemplateSpecError("TEMPLATE_SPEC needs a non-empty 'sections' list")
+
+    default_page_height = float(spec.get("default_page_height_inches", 11.0))
+    top_margin = float(spec.get("top_margin_inches", 0.5))
+    bottom_margin = float(spec.get("bottom_margin_inches", 0.5))
+    static_preamble = spec["static_preamble"]
+    guarded_preamble = guard_static_preamble(static_preamble)
+    section_cache = SectionCache(template_source_version(getattr(module, "__file__", None) or module.__name__))
+    sections = [
+        (section_spec["source"], section_spec.get("unless"), section_cache.memoize(compile_section(section_spec)))
+        for section_spec in section_specs
+    ]
+
+    def generate_latex_body(data: Union[Resume, Dict[str, Any]], report_content_height: bool = False) -> str:
+        resume = normalize_resume(data)
+        parts = [
+            render(getattr(resume, source)) for source, unless, render in sections
+            if unless is None or not getattr(resume, unless)
+        ]
+        if report_content_height:
+            parts.append(CONTENT_HEIGHT_REPORT)
+        parts.append("\n\\end{document}\n")
+        return "\n".join(filter(None, parts))
+
+    def iter_latex_document(body: str, page_height: Optional[float] = None):
+        yield guarded_preamble
+        yield "\n"
+        yield page_geometry(page_height, default_page_height, top_margin, bottom_margin)
+        yield body
+
+    def assemble_latex_document(body: str, page_height: Optional[float] = None) -> str:
+        return "".join(iter_latex_document(body, page_height))
+
+    def generate_latex_content(data: Union[Resume, Dict[str, Any]], page_height: Optional[float] = None, report_content_height: bool = False) -> str:
+        return assemble_latex_document(generate_latex_body(data, report_content_height), page_height)
+
+    def page_height_for_content(content_height_inches: float) -> float:
+        return content_height_inches + top_margin + bottom_margin
+
+    module.STATIC_PREAMBLE = static_preamble
+    module.PREAMBLE_LOADED_MACRO = PREAMBLE_LOADED_MACRO
+    module.CONTENT_HEIGHT_LOG_TAG = CONTENT_HEIGHT_LOG_TAG
+    module.DEFAULT_TEMPLATE_PAGE_HEIGHT_INCHES = default_page_height
+    module.SECTION_CACHE = section_cache
+    module.generate_latex_body = generate_latex_body
+    module.iter_latex_document = iter_latex_document
+    module.assemble_latex_document = assemble_latex_document
+    module.generate_latex_content = generate_latex_content
+    module.page_height_for_content = page_height_for_content
@@ -0,0 +1,131 @@
+"""
+Helpers shared by the templates: escaping of LaTeX special characters and the
+per-document page geometry spliced in after a template's static preamble.
+"""
+from functools import lru_cache
+from typing import Any, Optional
+
+# Macro defined by the precompiled preamble format built by the generator.
+# Documents test for it, so the same .tex compiles standalone or on top of the format.
+PREAMBLE_LOADED_MACRO = r"\resumeStaticPreambleLoaded"
+
+# Tag of the log line written when report_content_height is requested, e.g.
+# "RESUME-CONTENT-HEIGHT=612.3pt": the height of the typeset content on the (last) page
+CONTENT_HEIGHT_LOG_TAG = "RESUME-CONTENT-HEIGHT"
+
+# Appended to a document body to report its content height.
+# The penalty makes TeX move all pending material onto the page before \pagetotal is read.
+CONTENT_HEIGHT_REPORT = f"\\par\\penalty10000\\typeout{{{CONTENT_HEIGHT_LOG_TAG}=\\the\\dimexpr\\pagetotal+\\pagedepth\\relax}}"
+
+# LaTeX special characters and their escaped forms, applied in a single str.translate pass
+# (so nothing produced by one replacement is ever rewritten by another)
+LATEX_ESCAPES = {
+    "\\": r"\textbackslash{}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+}
+LATEX_ESCAPE_TABLE = str.maketrans(LATEX_ESCAPES)
+
+# Escapes for the URL argument of \href: hyperref turns \% and \# back into the plain
+# characters; a backslash or brace would break the argument, so those are percent-encoded
+URL_ESCAPES = {
+    "%": r"\%",
+    "#": r"\#",
+    "\\": r"\%5C",
+    "{": r"\%7B",
+    "}": r"\%7D",
+}
+URL_ESCAPE_TABLE = str.maketrans(URL_ESCAPES)
+
+# Distinct strings remembered by the escaper; skills, companies and dates repeat a lot across a batch
+ESCAPE_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=ESCAPE_CACHE_SIZE)
+def escape_latex(text: str) -> str:
+    """Escapes the LaTeX special characters of a string (memoized)."""
+    return text.translate(LATEX_ESCAPE_TABLE)
+
+
+def fix_latex_special_chars(text: Optional[Any]) -> str:
+    """
+    Escapes LaTeX special characters in a given string.
+    Also converts None to an empty string.
+    """
+    if text is None:
+        return ""
+    if not isinstance(text, str):
+        text = str(text) # Ensure it's a string
+    return escape_latex(text)
+
+
+def escape_latex_url(url: str) -> str:
+    """Escapes a URL for the first argument of \\href, so '%' and '#' neither comment out nor break the line."""
+    return url.translate(URL_ESCAPE_TABLE)
+
+
+def format_date_range(start: str, end: str) -> str:
+    """
+    Formats already escaped dates as 'start -- end', 'start -- Present', a lone start,
+    or '' when both are empty.
+    """
+    if end and end.lower() == "present":
+        return f"{start} -- Present"
+    if start and not end:
+        return start
+    return f"{start} -- {end}" if start or end else ""
+
+
+def guard_static_preamble(static_preamble: str) -> str:
+    """Wraps a static preamble so it is skipped when compiling on top of the precompiled format."""
+    return "\n".join([
+        f"\\ifdefined{PREAMBLE_LOADED_MACRO}\\else",
+        static_preamble,
+        "\\fi",
+    ])
+
+
+def page_geometry(
+    page_height: Optional[float],
+    default_page_height: float,
+    top_margin: float,
+    bottom_margin: float
+) -> str:
+    """
+    The per-document lines between the static preamble and the body: the text height
+    declaration, \\begin{document} and the physical page height.
+    Args:
+        page_height: Page height in inches, or None for default_page_height (the page
+            height itself is then left to LaTeX).
+        default_page_height: The template's default page height in inches.
+        top_margin, bottom_margin: Vertical margins in inches around the text area.
+    """
+    page_height_setting_for_doc_start = "" # For \pdfpageheight
+
+    # Determine the physical page height for this compilation run
+    current_physical_page_height = page_height if page_height is not None else default_page_height
+
+    if page_height is not None:
+        # This sets the physical media height at the start of the document
+        page_height_setting_for_doc_start = f"\\setlength{{\\pdfpageheight}}{{{current_physical_page_height:.2f}in}}"
+
+    # Calculate target text height based on the current physical page height
+    target_text_height = current_physical_page_height - top_margin - bottom_margin
+    text_height_declaration = f"\\setlength{{\\textheight}}{{{target_text_height:.2f}in}}"
+
+    # The text height declaration is per document and always follows the static preamble
+    return "\n".join([
+        f"{text_height_declaration} % SET the text height based on physical page height and margins",
+        "",
+        "\\begin{document}",
+        page_height_setting_for_doc_start,
+        "",
+        "",
+    ])
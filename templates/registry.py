@@ -0,0 +1,286 @@
+"""
+Registry of the templates in this package.
+
+The registry is built once: it lists the *_template.py files and reads each
+one's metadata (name, version, supported engines, static preamble hash) from
+its source with ast, without importing it. The metadata can be kept in a JSON
+file and is re-read only for files whose modification time or size changed.
+Template modules are imported (and declarative specs compiled) on first use,
+either explicitly with load() or through the LazyTemplate stand-in returned by
+lazy().
+
+Templates may declare, next to STATIC_PREAMBLE:
+    TEMPLATE_VERSION = "1.0"            # default: a hash of the source file
+    TEMPLATE_ENGINES = ("pdflatex",)    # default: DEFAULT_TEMPLATE_ENGINES
+Declarative templates put 'version' and 'engines' in their TEMPLATE_SPEC.
+
+Usage:
+    registry = TemplateRegistry(templates_dir, "templates", cache_path=".cache/template_registry.json")
+    registry.names()                   # ['classic', 'compact']
+    registry.info("classic").version
+    template_module = registry.load("classic")
+"""
+import ast
+import hashlib
+import importlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .declarative import TemplateSpecError, compile_template
+
+TEMPLATE_FILE_SUFFIX = "_template.py"
+DEFAULT_TEMPLATE_ENGINES = ("pdflatex",)
+# Bumped whenever TemplateInfo changes, so older registry cache files are ignored
+REGISTRY_CACHE_FORMAT = 1
+
+
+class TemplateInfo(NamedTuple):
+    """Metadata of a template, read from its source without importing it."""
+    name: str
+    module_name: str
+    path: str
+    mtime_ns: int
+    size: int
+    version: str
+    engines: Tuple[str, ...]
+    preamble_hash: Optional[str]  # None if the template has no static preamble
+    declarative: bool
+
+
+def preamble_hash(static_preamble: str) -> str:
+    """Identifies a static preamble by its contents."""
+    return hashlib.sha256(static_preamble.encode("utf-8")).hexdigest()[:16]
+
+
+def _literal(node: Optional[ast.AST], strings: Dict[str, str]) -> Any:
+    """Evaluates a literal node; a bare name resolves to a module-level string constant."""
+    if node is None:
+        return None
+    if isinstance(node, ast.Name):
+        return strings.get(node.id)
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+
+def read_template_info(name: str, path: str, module_name: str) -> TemplateInfo:
+    """
+    Reads a template's metadata from its source file.
+    Raises:
+        OSError: If the file cannot be read.
+        SyntaxError: If it is not valid Python.
+    """
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        source = f.read()
+    tree = ast.parse(source, filename=path)
+
+    assignments: Dict[str, ast.AST] = {}
+    functions = set()
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    assignments[target.id] = node.value
+        elif isinstance(node, ast.FunctionDef):
+            functions.add(node.name)
+    strings = {
+        target: node.value for target, node in assignments.items()
+        if isinstance(node, ast.Constant) and isinstance(node.value, str)
+    }
+
+    static_preamble = strings.get("STATIC_PREAMBLE")
+    version = _literal(assignments.get("TEMPLATE_VERSION"), strings)
+    engines = _literal(assignments.get("TEMPLATE_ENGINES"), strings)
+    spec_node = assignments.get("TEMPLATE_SPEC")
+    declarative = isinstance(spec_node, ast.Dict) and "generate_latex_content" not in functions
+    if declarative:
+        spec_fields = {
+            key.value: value for key, value in zip(spec_node.keys, spec_node.values)
+            if isinstance(key, ast.Constant) and isinstance(key.value, str)
+        }
+        static_preamble = _literal(spec_fields.get("static_preamble"), strings)
+        version = _literal(spec_fields.get("version"), strings) or version
+        engines = _literal(spec_fields.get("engines"), strings) or engines
+
+    return TemplateInfo(
+        name=name,
+        module_name=module_name,
+        path=path,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        version=str(version) if version else hashlib.sha256(source).hexdigest()[:16],
+        engines=tuple(engines) if isinstance(engines, (list, tuple)) and engines else DEFAULT_TEMPLATE_ENGINES,
+        preamble_hash=preamble_hash(static_preamble) if isinstance(static_preamble, str) and static_preamble else None,
+        declarative=declarative,
+    )
+
+
+class LazyTemplate:
+    """
+    Stands in for a template module and imports it on first access to anything but
+    its metadata (template_info, __name__, __file__).
+    """
+    __slots__ = ("template_info", "_registry", "_module")
+
+    def __init__(self, template_info: TemplateInfo, registry: "TemplateRegistry"):
+        self.template_info = template_info
+        self._registry = registry
+        self._module = None
+
+    @property
+    def __name__(self) -> str:
+        return self.template_info.module_name
+
+    @property
+    def __file__(self) -> str:
+        return self.template_info.path
+
+    def load(self) -> Any:
+        """Imports the template module (once) and returns it."""
+        if self._module is None:
+            self._module = self._registry.load(self.template_info.name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr in LazyTemplate.__slots__:
+            raise AttributeError(attr)
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyTemplate '{self.template_info.name}' ({state})>"
+
+
+class TemplateRegistry:
+    """The templates of one package directory; safe to share between threads."""
+
+    def __init__(self, templates_dir: str, package: str, cache_path: Optional[str] = None):
+        self.templates_dir = templates_dir
+        self.package = package
+        self.cache_path = cache_path
+        self._infos: Optional[Dict[str, TemplateInfo]] = None
+        self._modules: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def _read_cache(self) -> Dict[str, TemplateInfo]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("format") != REGISTRY_CACHE_FORMAT:
+                return {}
+            infos = {}
+            for fields in cached["templates"]:
+                info = TemplateInfo(**fields)
+                infos[info.path] = info._replace(engines=tuple(info.engines))
+            return infos
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+
+    def _write_cache(self, infos: Dict[str, TemplateInfo]) -> None:
+        try:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Write under a temporary name and rename, so readers never see a partial file
+            tmp_path = f"{self.cache_path}.tmp{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": REGISTRY_CACHE_FORMAT, "templates": [info._asdict() for info in infos.values()]}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not update template registry cache: {e}")
+
+    def refresh(self) -> None:
+        """
+        Rescans the templates directory. Metadata is re-read only for files that are
+        new or whose modification time or size changed since the cache was written.
+        """
+        with self._lock:
+            cached = self._read_cache()
+            infos: Dict[str, TemplateInfo] = {}
+            changed = False
+            try:
+                entries = sorted(os.scandir(self.templates_dir), key=lambda entry: entry.name)
+            except OSError:
+                entries = []
+            for entry in entries:
+                if not entry.name.endswith(TEMPLATE_FILE_SUFFIX) or not entry.is_file():
+                    continue
+                name = entry.name[:-len(TEMPLATE_FILE_SUFFIX)]
+                info = cached.get(entry.path)
+                try:
+                    stat = entry.stat()
+                    if info is None or info.mtime_ns != stat.st_mtime_ns or info.size != stat.st_size:
+                        info = read_template_info(name, entry.path, f"{self.package}.{entry.name[:-3]}")
+                        changed = True
+                except (OSError, SyntaxError, ValueError) as e:
+                    print(f"Skipping template '{name}': {e}")
+                    continue
+                infos[name] = info
+            if self.cache_path and (changed or len(infos) != len(cached)):
+                self._write_cache({info.path: info for info in infos.values()})
+            self._infos = infos
+
+    def _ensure_scanned(self) -> Dict[str, TemplateInfo]:
+        if self._infos is None:
+            self.refresh()
+        return self._infos
+
+    def names(self) -> List[str]:
+        """Returns the sorted names of the available templates."""
+        return sorted(self._ensure_scanned())
+
+    def info(self, name: str) -> Optional[TemplateInfo]:
+        """Returns the metadata of a template, or None if there is no such template."""
+        return self._ensure_scanned().get(name)
+
+    def load(self, name: str) -> Any:
+        """
+        Imports a template module on first use (compiling a declarative TEMPLATE_SPEC)
+        and returns it.
+        Raises:
+            ImportError: If the template does not exist or cannot be loaded.
+        """
+        module = self._modules.get(name)
+        if module is not None:
+            return module
+        with self._lock:
+            module = self._modules.get(name)
+            if module is not None:
+                return module
+            info = self.info(name)
+            if info is None:
+                raise ImportError(f"No template named '{name}'.")
+            try:
+                module = importlib.import_module(info.module_name)
+            except Exception as e:
+                raise ImportError(f"Could not load template '{name}'. Error: {e}") from e
+            # Declarative templates are compiled on first load; the module keeps the result
+            if not hasattr(module, 'generate_latex_content') and hasattr(module, 'TEMPLATE_SPEC'):
+                try:
+                    compile_template(module)
+                except TemplateSpecError as e:
+                    raise ImportError(f"Template '{name}' has an invalid TEMPLATE_SPEC: {e}")
+            if not hasattr(module, 'generate_latex_content'):
+                raise ImportError(
+                    f"Template '{name}' loaded, but missing required function "
+                    f"'generate_latex_content(data, page_height)'."
+                )
+            self._modules[name] = module
+            return module
+
+    def lazy(self, name: str) -> LazyTemplate:
+        """
+        Returns a stand-in for the template that imports it on first render.
+        Raises:
+            ImportError: If there is no such template.
+        """
+        info = self.info(name)
+        if info is None:
+            raise ImportError(f"No template named '{name}'.")
+        return LazyTemplate(info, self)
@@ -0,0 +1,296 @@
+"""
+Normalized, immutable resume model consumed by the templates.
+
+Resume JSON comes in two styles: the schema's keys ('contact', 'work_experience',
+'responsibilities', ...) and the older export style ('Personal Information',
+'Experience', 'responsibilities/achievements', 'Misc' -> 'Leadership', ...).
+normalize_resume() resolves those alternatives once per record and returns a
+Resume built from NamedTuples (tuples with empty __slots__): every text field is a
+str ('' when missing) and every list a tuple. The input is never modified, so one
+record can be shared by threads, and the model is hashable, which makes it a cheap
+key for the section caches.
+
+Every template sees the same resolution, so a few schema-style keys that some
+templates used to ignore are now rendered everywhere: experience dates given as
+record-level 'start_date'/'end_date', education dates given as a 'dates' dict of
+'start_date'/'end_date', a certification's 'name' (when there is no
+'certification' key), and involvement dates under 'date' or 'dates'.
+
+Usage:
+    resume = normalize_resume(json.load(f))
+    resume.contact.name, resume.experience[0].dates.start
+"""
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+
+class DateRange(NamedTuple):
+    """A start and end date as written in the data; a single date is a start without an end."""
+    start: str = ""
+    end: str = ""
+
+
+class Contact(NamedTuple):
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    linkedin: str = ""
+    github: str = ""
+    website: str = ""
+    location: str = ""
+
+
+class Education(NamedTuple):
+    institution: str = ""
+    location: str = ""
+    degree: str = ""
+    specialization: str = ""
+    dates: DateRange = DateRange()
+    gpa: str = ""
+    honors: str = ""
+    additional_info: str = ""
+    relevant_coursework: Tuple[str, ...] = ()
+
+
+class Experience(NamedTuple):
+    company: str = ""
+    position: str = ""
+    location: str = ""
+    dates: DateRange = DateRange()
+    responsibilities: Tuple[str, ...] = ()
+
+
+class Project(NamedTuple):
+    title: str = ""
+    technologies: Tuple[str, ...] = ()
+    dates: DateRange = DateRange()
+    description: Tuple[str, ...] = ()
+
+
+class SkillCategory(NamedTuple):
+    """A named group of skills. soft is set for the 'Soft Skills' list kept next to 'Technical Skills'."""
+    name: str = ""
+    skills: Tuple[str, ...] = ()
+    soft: bool = False
+
+
+class Language(NamedTuple):
+    name: str = ""
+    proficiency: str = ""
+
+
+class Certification(NamedTuple):
+    name: str = ""
+    institution: str = ""
+    date: str = ""
+
+
+class Award(NamedTuple):
+    title: str = ""
+    issuer: str = ""
+    date: str = ""
+    description: str = ""
+
+
+class Involvement(NamedTuple):
+    organization: str = ""
+    position: str = ""
+    dates: DateRange = DateRange()
+    responsibilities: Tuple[str, ...] = ()
+
+
+class Activity(NamedTuple):
+    """An entry of the export style's 'Misc' -> 'Leadership' mapping (event name -> details)."""
+    name: str = ""
+    dates: DateRange = DateRange()
+    responsibilities: Tuple[str, ...] = ()
+
+
+class Resume(NamedTuple):
+    contact: Optional[Contact] = None
+    summary: str = ""
+    education: Tuple[Education, ...] = ()
+    experience: Tuple[Experience, ...] = ()
+    projects: Tuple[Project, ...] = ()
+    skills: Tuple[SkillCategory, ...] = ()
+    languages: Tuple[Language, ...] = ()
+    certifications: Tuple[Certification, ...] = ()
+    awards: Tuple[Award, ...] = ()
+    involvement: Tuple[Involvement, ...] = ()
+    activities: Tuple[Activity, ...] = ()
+
+
+# Record type of each Resume field holding records (a single Contact, or a tuple of the type)
+RECORD_TYPES = {
+    "contact": Contact,
+    "education": Education,
+    "experience": Experience,
+    "projects": Project,
+    "skills": SkillCategory,
+    "languages": Language,
+    "certifications": Certification,
+    "awards": Award,
+    "involvement": Involvement,
+    "activities": Activity,
+}
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+def _texts(value: Any) -> Tuple[str, ...]:
+    """A list of strings as a tuple; a lone string becomes a one-item tuple."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_text(v) for v in value)
+    return (_text(value),) if value else ()
+
+
+def _first(record: Dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        value = record.get(key)
+        if value:
+            return value
+    return None
+
+
+def _dates(value: Any, record: Optional[Dict[str, Any]] = None) -> DateRange:
+    """Dates given as a {'start_date', 'end_date'} dict or a single string; else the record's own keys."""
+    if isinstance(value, str):
+        return DateRange(value, "")
+    if not isinstance(value, dict):
+        value = record if record is not None else {}
+    return DateRange(_text(value.get("start_date")), _text(value.get("end_date")))
+
+
+def _records(value: Any) -> Tuple[Dict[str, Any], ...]:
+    if not isinstance(value, (list, tuple)):
+        return ()
+    return tuple(v for v in value if isinstance(v, dict))
+
+
+def _normalize_contact(data: Dict[str, Any]) -> Optional[Contact]:
+    contact = _first(data, "Personal Information", "contact")
+    if not isinstance(contact, dict):
+        return None
+    return Contact(
+        # The schema may keep the name at the top level instead of in the contact block
+        name=_text(contact.get("name") or data.get("name")),
+        email=_text(contact.get("email")),
+        phone=_text(contact.get("phone")),
+        linkedin=_text(contact.get("linkedin")),
+        github=_text(contact.get("github")),
+        website=_text(contact.get("website")),
+        location=_text(contact.get("location")),
+    )
+
+
+def _normalize_skills(skills: Any) -> Tuple[SkillCategory, ...]:
+    if not isinstance(skills, dict):
+        return ()
+    technical = skills.get("Technical Skills")
+    if isinstance(technical, dict):
+        # Export style: categories under 'Technical Skills', with a separate 'Soft Skills' list
+        categories = [SkillCategory(_text(name), _texts(items)) for name, items in technical.items()
+                      if isinstance(items, list) and items]
+        soft = skills.get("Soft Skills")
+        if isinstance(soft, list) and soft:
+            categories.append(SkillCategory("Soft Skills", _texts(soft), soft=True))
+        return tuple(categories)
+    # Schema style: the dict itself maps categories to skill lists
+    return tuple(SkillCategory(_text(name), _texts(items)) for name, items in skills.items()
+                 if isinstance(items, list) and items)
+
+
+def _normalize_activities(misc: Any) -> Tuple[Activity, ...]:
+    leadership = misc.get("Leadership") if isinstance(misc, dict) else None
+    if not isinstance(leadership, dict):
+        return ()
+    return tuple(
+        Activity(
+            name=_text(name),
+            dates=_dates(details.get("dates")),
+            responsibilities=_texts(details.get("responsibilities/achievements") or details.get("responsibilities")),
+        )
+        for name, details in leadership.items() if isinstance(details, dict)
+    )
+
+
+def normalize_resume(data: Any) -> Resume:
+    """
+    Converts resume JSON data (either key style) into a Resume. A Resume is returned as is.
+    """
+    if isinstance(data, Resume):
+        return data
+    if not isinstance(data, dict):
+        return Resume()
+    return Resume(
+        contact=_normalize_contact(data),
+        summary=_text(_first(data, "Summary/Objective", "objective", "summary")),
+        education=tuple(
+            Education(
+                institution=_text(edu.get("institution") or edu.get("university")),
+                location=_text(edu.get("location")),
+                degree=_text(edu.get("degree")),
+                specialization=_text(edu.get("specialization")),
+                dates=_dates(edu.get("dates"), edu),
+                gpa=_text(edu.get("gpa")),
+                honors=_text(edu.get("honors")),
+                additional_info=_text(edu.get("additional_info")),
+                relevant_coursework=_texts(edu.get("relevant_coursework")),
+            )
+            for edu in _records(_first(data, "Education", "education"))
+        ),
+        experience=tuple(
+            Experience(
+                company=_text(exp.get("company")),
+                position=_text(exp.get("position") or exp.get("title")),
+                location=_text(exp.get("location")),
+                dates=_dates(exp.get("dates"), exp),
+                responsibilities=_texts(exp.get("responsibilities") or exp.get("responsibilities/achievements")),
+            )
+            for exp in _records(_first(data, "Experience", "work_experience"))
+        ),
+        projects=tuple(
+            Project(
+                title=_text(proj.get("title")),
+                technologies=_texts(proj.get("technologies") or proj.get("technologies_used")),
+                dates=_dates(proj.get("dates") or proj.get("date"), {}),
+                description=_texts(proj.get("description")),
+            )
+            for proj in _records(_first(data, "Projects", "projects"))
+        ),
+        skills=_normalize_skills(_first(data, "Skills", "skills")),
+        languages=tuple(
+            Language(name=_text(lang.get("name")), proficiency=_text(lang.get("proficiency")))
+            for lang in _records(_first(data, "Languages", "languages"))
+        ),
+        certifications=tuple(
+            Certification(
+                name=_text(cert.get("certification") or cert.get("name")),
+                institution=_text(cert.get("institution")),
+                date=_text(cert.get("date")),
+            )
+            for cert in _records(data.get("certifications"))
+        ),
+        awards=tuple(
+            Award(
+                title=_text(award.get("title")),
+                issuer=_text(award.get("issuer")),
+                date=_text(award.get("date")),
+                description=_text(award.get("description")),
+            )
+            for award in _records(data.get("awards"))
+        ),
+        involvement=tuple(
+            Involvement(
+                organization=_text(item.get("organization")),
+                position=_text(item.get("position")),
+                dates=_dates(item.get("date") or item.get("dates"), {}),
+                responsibilities=_texts(item.get("responsibilities")),
+            )
+            for item in _records(_first(data, "involvement", "leadership"))
+        ),
+        activities=_normalize_activities(data.get("Misc")),
+    )
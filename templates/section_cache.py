@@ -0,0 +1,107 @@
+"""
+Bounded in-process memo of rendered template sections.
+
+Records of a batch often share whole sections (the same education entry, the
+same skills block), and every sizing attempt renders the same sections again.
+A SectionCache keys each section render by the section function and its input
+data, keeps the most recently used entries up to a bound, and counts hits and
+misses. Hashable input (such as the immutable model of templates/resume_model.py)
+is its own key; other JSON data is keyed by a hash of its canonical JSON and the
+template version.
+
+Usage:
+    SECTION_CACHE = SectionCache(template_source_version(__file__))
+
+    @SECTION_CACHE.memoize
+    def _generate_skills_section(skills_dict):
+        ...
+
+    print(SECTION_CACHE.stats())  # {'hits': ..., 'misses': ..., 'entries': ..., 'max_entries': ...}
+"""
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Default bound on the number of remembered section renders
+DEFAULT_SECTION_CACHE_MAX_ENTRIES = 4096
+
+
+def template_source_version(source_path: str) -> str:
+    """Identifies a template version by the contents of its source file."""
+    digest = hashlib.sha256()
+    try:
+        with open(source_path, "rb") as f:
+            digest.update(f.read())
+    except OSError:
+        digest.update(source_path.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class SectionCache:
+    """LRU memo of section renders; safe to share between threads."""
+
+    def __init__(self, version: str, max_entries: int = DEFAULT_SECTION_CACHE_MAX_ENTRIES):
+        self.version = version
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, section_name: str, args: tuple) -> Optional[Hashable]:
+        """
+        Returns the cache key for a section render, or None if its input is neither
+        hashable nor JSON data (such renders are not cached).
+        """
+        key = (section_name, args)
+        try:
+            hash(key)
+            return key
+        except TypeError:
+            pass
+        try:
+            payload = json.dumps(args, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+        digest = hashlib.sha256(f"{self.version}\0{section_name}\0".encode("utf-8"))
+        digest.update(payload.encode("utf-8"))
+        return digest.hexdigest()
+
+    def memoize(self, func: Callable[..., Optional[str]]) -> Callable[..., Optional[str]]:
+        """Decorates a section generator so its renders are looked up in this cache."""
+        section_name = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any) -> Optional[str]:
+            key = self.make_key(section_name, args)
+            if key is None:
+                return func(*args)
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                self.misses += 1
+            rendered = func(*args)
+            with self._lock:
+                self._entries[key] = rendered
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return rendered
+        return wrapper
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit and miss counters and the current and maximum number of entries."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "max_entries": self.max_entries}
+
+    def clear(self) -> None:
+        """Drops all entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,127 @@
+"""
+Tests of the streaming pdflatex log parser on small log excerpts.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, REPO_ROOT)
+
+import latex_log  # noqa: E402
+from latex_log import LatexLogParser, parse_latex_log  # noqa: E402
+
+SUCCESS_LOG = """This is pdfTeX, Version 3.141592653-2.6-1.40.25 (TeX Live 2023) (preloaded format=pdflatex)
+entering extended mode
+(./resume.tex
+LaTeX2e <2022-11-01> patch level 1
+Overfull \\hbox (12.34567pt too wide) in paragraph at lines 57--58
+[]\\OT1/cmr/m/n/10 Some long text|
+Underfull \\hbox (badness 10000) in paragraph at lines 80--80
+Overfull \\vbox (3.0pt too high) has occurred while \\output is active []
+LaTeX Warning: Label(s) may have changed. Rerun to get cross-references right.
+RESUME-CONTENT-HEIGHT=612.5pt
+[1{/usr/share/texlive/texmf-dist/fonts/map/pdftex/updmap/pdftex.map}] (./resume.aux) )
+Output written on resume.pdf (1 page, 45678 bytes).
+Transcript written on resume.log.
+"""
+
+ERROR_LOG = """(./resume.tex
+! Undefined control sequence.
+l.42 \\resumeItm
+                {Built things}
+./resume.tex:57: Missing $ inserted.
+! Emergency stop.
+<*> resume.tex
+
+No pages of output.
+Transcript written on resume.log.
+"""
+
+
+def parse_text(text, chunk_size=None, tags=()):
+    parser = LatexLogParser(tags)
+    chunk_size = chunk_size or len(text) or 1
+    for start in range(0, len(text), chunk_size):
+        parser.feed(text[start:start + chunk_size])
+    return parser.close()
+
+
+class LatexLogTest(unittest.TestCase):
+    def test_output_page_count_and_bytes(self):
+        log = parse_text(SUCCESS_LOG)
+        self.assertEqual((log.page_count, log.output_bytes, log.output_file), (1, 45678, "resume.pdf"))
+        self.assertEqual(parse_text("Output written on out.pdf (3 pages, 99 bytes).\n").page_count, 3)
+
+    def test_no_output(self):
+        log = parse_text(ERROR_LOG)
+        self.assertEqual((log.page_count, log.output_bytes), (0, 0))
+
+    def test_errors_with_line_numbers(self):
+        log = parse_text(ERROR_LOG)
+        self.assertEqual(
+            [(error.message, error.line) for error in log.errors],
+            [("Undefined control sequence.", 42), ("Missing $ inserted.", 57), ("Emergency stop.", None)],
+        )
+        self.assertEqual(log.format_errors(limit=2).splitlines(), [
+            "  line 42: Undefined control sequence.",
+            "  line 57: Missing $ inserted.",
+            "  ... and 1 more error(s)",
+        ])
+
+    def test_boxes(self):
+        log = parse_text(SUCCESS_LOG)
+        overfull = log.overfull_boxes
+        self.assertEqual([(box.box, box.amount_pt, box.first_line, box.last_line) for box in overfull],
+                         [("hbox", 12.34567, 57, 58), ("vbox", 3.0, None, None)])
+        underfull = log.underfull_boxes
+        self.assertEqual([(box.box, box.badness, box.first_line, box.last_line) for box in underfull],
+                         [("hbox", 10000, 80, 80)])
+
+    def test_rerun_requested(self):
+        self.assertTrue(parse_text(SUCCESS_LOG).rerun_requested)
+        self.assertTrue(parse_text("Package rerunfilecheck Warning: File `resume.out' has changed.\n"
+                                   "(rerunfilecheck)                Rerun to get outlines right\n").rerun_requested)
+        self.assertFalse(parse_text(ERROR_LOG).rerun_requested)
+
+    def test_warnings_and_tags(self):
+        log = parse_text(SUCCESS_LOG, tags=("RESUME-CONTENT-HEIGHT",))
+        self.assertEqual(log.warning_count, 1)
+        self.assertEqual(log.tagged_values, {"RESUME-CONTENT-HEIGHT": "612.5pt"})
+
+    def test_wrapped_lines_are_joined(self):
+        # TeX breaks log lines at 79 characters; the output line is split across two
+        line = "Output written on /a/very/long/build/directory/for/this/resume/output/resume.pdf (2 pages, 1234 bytes)."
+        wrapped = "\n".join(line[i:i + latex_log.LOG_LINE_WIDTH] for i in range(0, len(line), latex_log.LOG_LINE_WIDTH))
+        log = parse_text(wrapped + "\n")
+        self.assertEqual((log.page_count, log.output_bytes), (2, 1234))
+        self.assertTrue(log.output_file.endswith("output/resume.pdf"))
+
+    def test_result_does_not_depend_on_chunking(self):
+        whole = parse_text(SUCCESS_LOG + ERROR_LOG, tags=("RESUME-CONTENT-HEIGHT",))
+        for chunk_size in (1, 2, 7, 80):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(parse_text(SUCCESS_LOG + ERROR_LOG, chunk_size, ("RESUME-CONTENT-HEIGHT",)), whole)
+
+    def test_parse_latex_log_reads_files_in_chunks(self):
+        directory = tempfile.mkdtemp(prefix="latex-log-")
+        try:
+            path = os.path.join(directory, "resume.log")
+            with open(path, "w", encoding="latin-1", newline="\r\n") as f:
+                f.write(ERROR_LOG)
+            with mock.patch.object(latex_log, "LOG_READ_CHUNK_CHARS", 5):
+                log = parse_latex_log(path)
+            self.assertEqual([error.line for error in log.errors], [42, 57, None])
+            self.assertIsNone(parse_latex_log(os.path.join(directory, "missing.log")))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Tests of the in-process PDF page counter on small hand-built files.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import zlib
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, REPO_ROOT)
+
+from pdf_reader import read_pdf_page_count  # noqa: E402
+
+
+def page_objects(page_count, first_page_num=3):
+    """The catalog (1), page tree root (2) and pages, as {object number: body}."""
+    kids = " ".join(f"{first_page_num + i} 0 R" for i in range(page_count))
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode(),
+    }
+    for i in range(page_count):
+        objects[first_page_num + i] = b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>"
+    return objects
+
+
+def classic_pdf(objects, trailer_extra=b"", base=b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"):
+    """A PDF (or an incremental update appended to base) with a classic xref table."""
+    pdf = base
+    offsets = {}
+    for num, body in sorted(objects.items()):
+        offsets[num] = len(pdf)
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (num, body)
+    xref_offset = len(pdf)
+    pdf += b"xref\n"
+    if not base.rstrip().endswith(b"%%EOF"):
+        pdf += b"0 1\n0000000000 65535 f \n"
+    for num in sorted(offsets):
+        pdf += b"%d 1\n%010d 00000 n \n" % (num, offsets[num])
+    size = max(objects) + 1
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R %s>>\nstartxref\n%d\n%%%%EOF\n" % (size, trailer_extra, xref_offset)
+    return pdf
+
+
+def png_up_predict(rows):
+    """Encodes rows of equal length with the PNG 'Up' predictor, as pdfTeX does for xref streams."""
+    previous = bytes(len(rows[0]))
+    output = b""
+    for row in rows:
+        output += b"\x02" + bytes((value - above) & 0xFF for value, above in zip(row, previous))
+        previous = row
+    return output
+
+
+def xref_stream_pdf(page_count):
+    """A PDF 1.5 file whose catalog and page tree live in an object stream, indexed by an xref stream."""
+    objects = page_objects(page_count, first_page_num=4)
+    compressed = [1, 2]
+    header = b""
+    body = b""
+    for num in compressed:
+        header += b"%d %d " % (num, len(body))
+        body += objects.pop(num) + b"\n"
+    stream_data = zlib.compress(header + body)
+    objects[3] = b"<< /Type /ObjStm /N %d /First %d /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (
+        len(compressed), len(header), len(stream_data), stream_data)
+
+    pdf = b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n"
+    offsets = {}
+    for num, obj in sorted(objects.items()):
+        offsets[num] = len(pdf)
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (num, obj)
+    xref_num = max(objects) + 1
+    offsets[xref_num] = len(pdf)
+    rows = [bytes([0, 0, 0, 0xFF])]  # Object 0 is free
+    for num in range(1, xref_num + 1):
+        if num in compressed:
+            rows.append(bytes([2, 0, 3, compressed.index(num)]))
+        else:
+            rows.append(bytes([1]) + offsets[num].to_bytes(2, "big") + b"\x00")
+    xref_data = zlib.compress(png_up_predict(rows))
+    pdf += (b"%d 0 obj\n<< /Type /XRef /Size %d /W [1 2 1] /Root 1 0 R /Filter /FlateDecode "
+            b"/DecodeParms << /Columns 4 /Predictor 12 >> /Length %d >>\nstream\n%s\nendstream\nendobj\n") % (
+        xref_num, xref_num + 1, len(xref_data), xref_data)
+    pdf += b"startxref\n%d\n%%%%EOF\n" % offsets[xref_num]
+    return pdf
+
+
+class PdfReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="pdf-reader-")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def count(self, data):
+        path = os.path.join(self.directory, "test.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
+        return read_pdf_page_count(path)
+
+    def test_classic_xref_table(self):
+        self.assertEqual(self.count(classic_pdf(page_objects(1))), 1)
+        self.assertEqual(self.count(classic_pdf(page_objects(3))), 3)
+
+    def test_incremental_update_follows_prev(self):
+        original = classic_pdf(page_objects(1))
+        previous_xref = int(original.rsplit(b"startxref", 1)[1].split()[0])
+        # The update replaces the page tree root with one of two pages; the page objects stay
+        update = {2: b"<< /Type /Pages /Kids [3 0 R 3 0 R] /Count 2 >>"}
+        self.assertEqual(self.count(classic_pdf(update, b"/Prev %d " % previous_xref, base=original)), 2)
+
+    def test_xref_stream_with_object_stream(self):
+        self.assertEqual(self.count(xref_stream_pdf(1)), 1)
+        self.assertEqual(self.count(xref_stream_pdf(4)), 4)
+
+    def test_corrupt_files(self):
+        valid = classic_pdf(page_objects(2))
+        for name, data in (
+            ("empty", b""),
+            ("not a pdf", b"hello world\n" * 100),
+            ("truncated", valid[:len(valid) // 2]),
+            ("bad startxref", valid.replace(b"startxref\n", b"startxref\n9")),
+            ("no page tree", valid.replace(b"/Pages 2 0 R", b"/Pages 99 0 R")),
+            ("no count", valid.replace(b"/Count 2", b"/Cnt 2")),
+            ("bad stream", xref_stream_pdf(1).replace(b"/Filter /FlateDecode", b"/Filter /LZWDecode", 1)),
+        ):
+            with self.subTest(name):
+                self.assertIsNone(self.count(data))
+
+    def test_missing_file(self):
+        self.assertIsNone(read_pdf_page_count(os.path.join(self.directory, "missing.pdf")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Tests of the streaming readers for JSONL and JSON array inputs.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+import io
+import json
+import os
+import sys
+import unittest
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, REPO_ROOT)
+
+import record_stream  # noqa: E402
+from record_stream import iter_json_array_records, iter_jsonl_records  # noqa: E402
+
+RECORDS = [
+    {"index": i, "name": "Zoë é中" * i, "values": [1.5e3, -2, True, False, None], "text": "a\\\"bé"}
+    for i in range(30)
+]
+
+
+class CountingReader(io.BytesIO):
+    """A BytesIO that counts read() calls."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def read_array(data, chunk_size=record_stream.READ_CHUNK_SIZE):
+    return list(iter_json_array_records(io.BytesIO(data), chunk_size))
+
+
+class JsonArrayTest(unittest.TestCase):
+    def test_records_and_offsets_for_any_chunk_size(self):
+        text = json.dumps(RECORDS, ensure_ascii=False)
+        for chunk_size in (1, 2, 3, 7, 1000):
+            with self.subTest(chunk_size=chunk_size):
+                records = read_array(text.encode("utf-8"), chunk_size)
+                self.assertEqual([record.data for record in records], RECORDS)
+                self.assertEqual([record.index for record in records], list(range(len(RECORDS))))
+                self.assertTrue(all(record.error is None for record in records))
+                # Offsets are character offsets of each element
+                for record in records:
+                    self.assertEqual(json.JSONDecoder().raw_decode(text, record.offset)[0], record.data)
+
+    def test_literals_and_numbers_cut_by_chunks(self):
+        # Cut-off true/false/null, numbers and \uXXXX escapes land within _TRUNCATION_MARGIN of the end
+        data = b'[{"a": true, "b": false, "c": null, "d": -12345.678e-2, "e": "\\u00e9\\u4e2d"}, 1234567, {}]'
+        for chunk_size in range(1, 12):
+            with self.subTest(chunk_size=chunk_size):
+                records = read_array(data, chunk_size)
+                self.assertEqual(records[0].data, {"a": True, "b": False, "c": None, "d": -123.45678, "e": "é中"})
+                self.assertEqual(records[1].error, "expected a JSON object, got int")
+                self.assertEqual(records[2].data, {})
+
+    def test_long_string_split_across_many_chunks(self):
+        # An unterminated string is reported far from the end of the buffer, but is still read on
+        records = read_array(json.dumps([{"summary": "x" * 10000}]).encode(), 16)
+        self.assertEqual(records[0].data, {"summary": "x" * 10000})
+
+    def test_large_element(self):
+        data = json.dumps([{"text": "y" * 5000000}, {"after": 1}]).encode()
+        reader = CountingReader(data)
+        records = list(iter_json_array_records(reader, 64 * 1024))
+        self.assertEqual([len(record.data.get("text", "")) for record in records], [5000000, 0])
+        self.assertEqual(records[1].data, {"after": 1})
+        # Reads grow with the element, so they stay close to one per chunk
+        self.assertLess(reader.reads, 2 * len(data) // (64 * 1024) + 4)
+
+    def test_bad_element_is_reported_without_reading_on(self):
+        data = b'[{"a": 1}, {"a": tru e}, ' + b'{"z": 1}, ' * 1000000 + b'{}]'
+        reader = CountingReader(data)
+        records = list(iter_json_array_records(reader, 1024))
+        self.assertEqual(records[0].data, {"a": 1})
+        self.assertEqual(records[1].index, 1)
+        self.assertEqual(records[1].offset, 11)
+        self.assertTrue(records[1].error.startswith("invalid JSON: Expecting value at offset 17"))
+        self.assertEqual(len(records), 2)
+        self.assertEqual(reader.reads, 1)
+
+    def test_trailing_comma(self):
+        records = read_array(b'[{"a": 1}, {"b": 2},]')
+        self.assertEqual([record.data for record in records[:2]], [{"a": 1}, {"b": 2}])
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[2].offset, 20)
+        self.assertTrue(records[2].error.startswith("invalid JSON: Expecting value"))
+
+    def test_missing_separator(self):
+        records = read_array(b'[{"a": 1} {"b": 2}]')
+        self.assertEqual(records[0].data, {"a": 1})
+        self.assertEqual(records[1], record_stream.StreamRecord(1, 10, None, "expected ',' or ']' after an array element"))
+
+    def test_unterminated_array(self):
+        records = read_array(b'[{"a": 1},  ')
+        self.assertEqual(records[1], record_stream.StreamRecord(1, 12, None, "unexpected end of input"))
+
+    def test_empty_array_and_non_array(self):
+        self.assertEqual(read_array(b"  [ ] "), [])
+        self.assertEqual(read_array(b'{"a": 1}'), [record_stream.StreamRecord(0, 0, None, "input is not a JSON array")])
+
+    def test_invalid_utf8(self):
+        records = read_array(b'[{"a": 1}, {"b": "\xff"}]', 4)
+        self.assertEqual(records[0].data, {"a": 1})
+        self.assertTrue(records[1].error.startswith("invalid UTF-8"))
+
+
+class JsonlTest(unittest.TestCase):
+    def test_records_errors_and_byte_offsets(self):
+        lines = [b'{"a": 1}\n', b"\n", b'{"b": "\xc3\xa9"}\n', b"not json\n", b"[1, 2]\n", b'{"c": 3}']
+        records = list(iter_jsonl_records(io.BytesIO(b"".join(lines))))
+        offsets = [sum(len(line) for line in lines[:i]) for i in (0, 2, 3, 4, 5)]
+        self.assertEqual([record.offset for record in records], offsets)
+        self.assertEqual([record.index for record in records], [0, 1, 2, 3, 4])
+        self.assertEqual(records[1].data, {"b": "é"})
+        self.assertTrue(records[2].error.startswith("invalid JSON"))
+        self.assertEqual(records[3].error, "expected a JSON object, got list")
+        self.assertEqual(records[4].data, {"c": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
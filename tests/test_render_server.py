@@ -0,0 +1,197 @@
+"""
+Localhost tests of the render service: a fake pdflatex on PATH, the service on an
+ephemeral port, and requests through http.client.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+import http.client
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, REPO_ROOT)
+
+import render_server  # noqa: E402
+import sizing_memo  # noqa: E402
+
+# Writes a one-page PDF and a log with the 'Output written on' line, whatever the input
+FAKE_PDFLATEX = r'''#!{python}
+import os, re, sys
+args = sys.argv[1:]
+if args == ["--version"]:
+    print("pdfTeX 3.141592653-2.6-1.40.25 (fake)")
+    sys.exit(0)
+outdir, jobname, files = ".", None, []
+for arg in args:
+    if arg.startswith("-output-directory="):
+        outdir = arg.split("=", 1)[1]
+    elif arg.startswith("-jobname="):
+        jobname = arg.split("=", 1)[1]
+    elif not arg.startswith(("-", "&")):
+        files.append(arg)
+if files:
+    source = files[0]
+else:
+    source = next(m.group(1) for m in map(re.compile(r"\\input\{{(.+?)\}}").search, sys.stdin) if m)
+job = jobname or os.path.splitext(os.path.basename(source))[0]
+objects = ["<< /Type /Catalog /Pages 2 0 R >>", "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+           "<< /Type /Page /Parent 2 0 R >>"]
+pdf, offsets = b"%PDF-1.4\n", []
+for i, obj in enumerate(objects):
+    offsets.append(len(pdf))
+    pdf += f"{{i + 1}} 0 obj\n{{obj}}\nendobj\n".encode()
+xref = len(pdf)
+pdf += f"xref\n0 {{len(objects) + 1}}\n0000000000 65535 f \n".encode()
+pdf += "".join(f"{{offset:010d}} 00000 n \n" for offset in offsets).encode()
+pdf += f"trailer\n<< /Size {{len(objects) + 1}} /Root 1 0 R >>\nstartxref\n{{xref}}\n%%EOF\n".encode()
+with open(os.path.join(outdir, job + ".pdf"), "wb") as f:
+    f.write(pdf)
+with open(os.path.join(outdir, job + ".log"), "w") as f:
+    f.write(f"Output written on {{job}}.pdf (1 page, {{len(pdf)}} bytes).\n")
+with open(os.path.join(outdir, job + ".aux"), "w") as f:
+    f.write("\\relax\n")
+'''
+
+RESUME = {
+    "contact": {"name": "Test Person", "email": "test@example.com"},
+    "work_experience": [{"company": "Example", "position": "Engineer", "responsibilities": ["Built things"]}],
+}
+
+
+class GatedRenderService(render_server.RenderService):
+    """A RenderService whose renders wait until the test opens the gate."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gate = threading.Event()
+        self.gate.set()
+        self.rendering = threading.Event()
+
+    def _render(self, *args, **kwargs):
+        self.rendering.set()
+        self.gate.wait()
+        return super()._render(*args, **kwargs)
+
+
+class RenderServerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.bin_dir = tempfile.mkdtemp(prefix="fake-tex-")
+        fake_path = os.path.join(cls.bin_dir, "pdflatex")
+        with open(fake_path, "w") as f:
+            f.write(FAKE_PDFLATEX.format(python=sys.executable))
+        os.chmod(fake_path, os.stat(fake_path).st_mode | stat.S_IXUSR)
+        cls.saved_path = os.environ.get("PATH", "")
+        os.environ["PATH"] = cls.bin_dir + os.pathsep + cls.saved_path
+
+        cls.service = GatedRenderService(1, queue_size=1, format_cache=False, page_height=11.0, auto_size=False)
+        cls.service.start()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), render_server.RenderRequestHandler)
+        cls.server.daemon_threads = True
+        cls.server.service = cls.service
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.gate.set()
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.close()
+        os.environ["PATH"] = cls.saved_path
+        shutil.rmtree(cls.bin_dir, ignore_errors=True)
+
+    def post(self, path, body, headers=None):
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_port, timeout=30)
+        try:
+            connection.request("POST", path, body=body, headers=headers or {})
+            response = connection.getresponse()
+            return response.status, dict(response.getheaders()), response.read()
+        finally:
+            connection.close()
+
+    def test_render_returns_pdf(self):
+        status, headers, body = self.post("/render?template=classic", json.dumps(RESUME).encode())
+        self.assertEqual(status, 200, body)
+        self.assertEqual(headers["Content-Type"], "application/pdf")
+        self.assertTrue(body.startswith(b"%PDF"))
+        self.assertEqual(headers["X-Page-Count"], "1")
+
+    def test_unknown_template_is_404(self):
+        status, _, _ = self.post("/render?template=no-such-template", json.dumps(RESUME).encode())
+        self.assertEqual(status, 404)
+
+    def test_oversized_body_is_413(self):
+        # Only the headers are sent: the server answers without reading the body
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_port, timeout=30)
+        try:
+            connection.putrequest("POST", "/render?template=classic")
+            connection.putheader("Content-Length", str(render_server.MAX_REQUEST_BYTES + 1))
+            connection.endheaders()
+            response = connection.getresponse()
+            self.assertEqual(response.status, 413)
+        finally:
+            connection.close()
+
+    def test_invalid_page_height_is_400(self):
+        for page_height in ("nan", "inf", "-3", "0", "1e9", "tall"):
+            with self.subTest(page_height=page_height):
+                status, _, _ = self.post(f"/render?template=classic&page_height={page_height}",
+                                         json.dumps(RESUME).encode())
+                self.assertEqual(status, 400)
+
+    def test_negative_content_length_is_411(self):
+        status, _, _ = self.post("/render?template=classic", b"", {"Content-Length": "-1"})
+        self.assertEqual(status, 411)
+
+    def test_full_queue_is_503(self):
+        body = json.dumps(RESUME).encode()
+        self.service.rendering.clear()
+        self.service.gate.clear()
+        results = []
+        try:
+            # One request holds the only render thread, a second fills the queue of one
+            first = threading.Thread(target=lambda: results.append(self.post("/render?template=classic", body)))
+            first.start()
+            self.assertTrue(self.service.rendering.wait(30))
+            second = threading.Thread(target=lambda: results.append(self.post("/render?template=classic", body)))
+            second.start()
+            while self.service.health()["queued"] < 1:
+                second.join(0.01)
+            status, headers, _ = self.post("/render?template=classic", body)
+            self.assertEqual(status, 503)
+            self.assertEqual(headers["Retry-After"], str(render_server.RETRY_AFTER_SECONDS))
+        finally:
+            self.service.gate.set()
+        first.join(30)
+        second.join(30)
+        self.assertEqual(sorted(status for status, _, _ in results), [200, 200])
+
+    def test_render_threads_share_the_sizing_memo(self):
+        memo_dir = tempfile.mkdtemp(prefix="sizing-memo-")
+        memo = sizing_memo.SizingMemo(os.path.join(memo_dir, "memo.jsonl"))
+        service = render_server.RenderService(4, queue_size=32, format_cache=False, sizing_memo=memo)
+        service.start()
+        try:
+            # Different numbers of entries give every resume its own memo key
+            resumes = [dict(RESUME, work_experience=RESUME["work_experience"] * count) for count in range(1, 25)]
+            futures = [service.submit(resume, "classic") for resume in resumes]
+            self.assertNotIn(None, futures)
+            self.assertTrue(all(future.result(60)["pdf"] for future in futures))
+        finally:
+            service.close()
+        with open(os.path.join(memo_dir, "memo.jsonl"), encoding="utf-8") as f:
+            self.assertEqual(len({json.loads(line)["key"] for line in f}), len(resumes))
+        shutil.rmtree(memo_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
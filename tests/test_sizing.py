@@ -0,0 +1,103 @@
+"""
+Tests of the bisection sizing strategy, driven with a synthetic fits(height) function
+instead of pdflatex.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, REPO_ROOT)
+
+from resume_generator import (  # noqa: E402
+    MAX_PAGE_HEIGHT_INCHES,
+    MIN_SIZE_TOLERANCE_INCHES,
+    PREDICTED_HEIGHT_STEP_INCHES,
+    bisect_sizing,
+)
+
+
+def drive(sizing_steps, needed_height):
+    """
+    Runs a sizing strategy against content that fits from needed_height up (None: never).
+    Returns the heights it asked for, in order.
+    """
+    heights = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            height = next(sizing_steps)
+            while True:
+                heights.append(height)
+                fits = needed_height is not None and height >= needed_height
+                height = sizing_steps.send(1 if fits else 2)
+        except StopIteration:
+            pass
+    return heights
+
+
+class BisectSizingTest(unittest.TestCase):
+    def assert_converged(self, heights, needed_height, tolerance):
+        # The last compile is at the chosen height: it fits, within tolerance of the real need
+        chosen = heights[-1]
+        self.assertGreaterEqual(chosen, needed_height)
+        self.assertLessEqual(chosen - needed_height, max(tolerance, MIN_SIZE_TOLERANCE_INCHES) + 1e-9)
+        self.assertEqual(chosen, min(height for height in heights if height >= needed_height))
+
+    def test_converges_within_tolerance(self):
+        for needed_height in (11.0, 11.01, 11.37, 12.5, 13.99, 17.25, 42.0):
+            for tolerance in (0.05, 0.1, 0.25):
+                with self.subTest(needed_height=needed_height, tolerance=tolerance):
+                    heights = drive(bisect_sizing(11.0, tolerance), needed_height)
+                    self.assert_converged(heights, needed_height, tolerance)
+                    self.assertTrue(all(height >= 11.0 for height in heights))
+
+    def test_tolerance_has_a_floor(self):
+        heights = drive(bisect_sizing(11.0, 0.0), 11.37)
+        self.assert_converged(heights, 11.37, MIN_SIZE_TOLERANCE_INCHES)
+
+    def test_fits_at_the_initial_height(self):
+        self.assertEqual(drive(bisect_sizing(11.0, 0.1), 10.0), [11.0])
+
+    def test_first_guess_that_fits_brackets_downwards(self):
+        heights = drive(bisect_sizing(11.0, 0.05, first_guess=12.0), 11.5)
+        self.assertEqual(heights[:2], [12.0, 12.0 - PREDICTED_HEIGHT_STEP_INCHES])
+        self.assert_converged(heights, 11.5, 0.05)
+
+    def test_first_guess_too_short_brackets_upwards(self):
+        heights = drive(bisect_sizing(11.0, 0.05, first_guess=12.0), 12.3)
+        self.assertEqual(heights[:2], [12.0, 12.0 + PREDICTED_HEIGHT_STEP_INCHES])
+        self.assert_converged(heights, 12.3, 0.05)
+
+    def test_good_first_guess_saves_compiles(self):
+        without_guess = drive(bisect_sizing(11.0, 0.05), 14.31)
+        with_guess = drive(bisect_sizing(11.0, 0.05, first_guess=14.35), 14.31)
+        self.assert_converged(with_guess, 14.31, 0.05)
+        self.assertLess(len(with_guess), len(without_guess))
+
+    def test_first_guess_below_the_initial_height_is_ignored(self):
+        self.assertEqual(drive(bisect_sizing(11.0, 0.1, first_guess=9.0), 10.0), [11.0])
+
+    def test_stops_at_the_maximum_height(self):
+        heights = drive(bisect_sizing(11.0, 0.05), None)
+        self.assertEqual(heights[-1], MAX_PAGE_HEIGHT_INCHES)
+        self.assertEqual(max(heights), MAX_PAGE_HEIGHT_INCHES)
+        # Doubling steps reach the maximum in a logarithmic number of attempts
+        self.assertLessEqual(len(heights), 10)
+
+    def test_attempts_are_logarithmic(self):
+        for needed_height in (11.37, 25.5, 150.0, MAX_PAGE_HEIGHT_INCHES):
+            with self.subTest(needed_height=needed_height):
+                heights = drive(bisect_sizing(11.0, 0.05), needed_height)
+                self.assert_converged(heights, needed_height, 0.05)
+                self.assertLessEqual(len(heights), 24)
+                # No height is compiled twice, except a final compile back at the chosen one
+                self.assertEqual(len(heights[:-1]), len(set(heights[:-1])))
+
+
+if __name__ == "__main__":
+    unittest.main()
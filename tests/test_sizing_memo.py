@@ -0,0 +1,89 @@
+"""
+Tests of the sizing memo: keys, concurrent updates, the entry bound and compaction.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, REPO_ROOT)
+
+import sizing_memo  # noqa: E402
+from templates import normalize_resume  # noqa: E402
+
+RESUME = {
+    "contact": {"name": "Test Person", "email": "test@example.com"},
+    "work_experience": [
+        {"company": "Example", "position": "Engineer", "responsibilities": ["Built things", "Fixed things"]},
+    ],
+}
+
+
+class SizingMemoTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="sizing-memo-")
+        self.path = os.path.join(self.directory, "memo.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_near_identical_resumes_share_a_key(self):
+        edited = {**RESUME, "work_experience": [dict(RESUME["work_experience"][0], position="Engineer II")]}
+        key = sizing_memo.SizingMemo.make_key(normalize_resume(RESUME), sys, "bisect")
+        self.assertEqual(key, sizing_memo.SizingMemo.make_key(normalize_resume(edited), sys, "bisect"))
+        self.assertNotEqual(key, sizing_memo.SizingMemo.make_key(normalize_resume(RESUME), sys, "incremental"))
+
+    def test_later_update_wins_across_instances(self):
+        sizing_memo.SizingMemo(self.path).put("key", 11.5, 1)
+        reader = sizing_memo.SizingMemo(self.path)
+        self.assertEqual(reader.get("key")["page_height"], 11.5)
+        sizing_memo.SizingMemo(self.path).put("key", 11.25, 1)
+        self.assertEqual(reader.get("key")["page_height"], 11.25)
+        self.assertIsNone(reader.get("missing"))
+
+    def test_concurrent_puts_are_kept(self):
+        memo = sizing_memo.SizingMemo(self.path)
+
+        def put_many(thread_index):
+            for i in range(150):
+                memo.put(f"{thread_index}-{i}", 11.0 + i / 100, 1)
+
+        # A small compaction threshold, so the file is rewritten while threads keep appending
+        with mock.patch.object(sizing_memo, "COMPACT_MEMO_BYTES", 20000):
+            threads = [threading.Thread(target=put_many, args=(t,)) for t in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        reader = sizing_memo.SizingMemo(self.path)
+        missing = [(t, i) for t in range(8) for i in range(150) if reader.get(f"{t}-{i}") is None]
+        self.assertEqual(missing, [])
+
+    def test_least_recently_updated_entries_are_dropped(self):
+        memo = sizing_memo.SizingMemo(self.path, max_entries=3)
+        for key in ("a", "b", "c", "a", "d"):
+            memo.put(key, 11.0, 1)
+        reader = sizing_memo.SizingMemo(self.path, max_entries=3)
+        self.assertEqual([key for key in "abcd" if reader.get(key) is not None], ["a", "c", "d"])
+
+    def test_compaction_keeps_the_latest_entries(self):
+        memo = sizing_memo.SizingMemo(self.path, max_entries=5)
+        with mock.patch.object(sizing_memo, "COMPACT_MEMO_BYTES", 1000):
+            for i in range(50):
+                memo.put(f"key-{i}", 11.0 + i / 100, 1)
+        with open(self.path, encoding="utf-8") as f:
+            self.assertLess(len(f.readlines()), 50)
+        reader = sizing_memo.SizingMemo(self.path)
+        self.assertEqual(reader.get("key-49")["page_height"], 11.49)
+        self.assertIsNone(reader.get("key-0"))
+
+
+if __name__ == "__main__":
+    unittest.main()
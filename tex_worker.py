@@ -0,0 +1,214 @@
+"""
+Pool of pre-started ("warm") TeX processes for repeated compiles.
+
+A TeX process cannot typeset more than one document, but most of its cost is
+paid before it reads the document: process startup, kpathsea initialization and
+loading the format. Each worker is a pdflatex process started ahead of time in
+its own scratch directory and fed a first line of '\\relax', so it loads its format
+and then blocks at TeX's '*' prompt, reading from its stdin pipe.
+
+A job is handed over by writing '\\nonstopmode\\input{<file>}' to that pipe. The
+process typesets the document and exits, its outputs are copied next to the .tex
+file, and a replacement worker is started immediately so it warms up while the
+caller is busy with something else.
+"""
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+from typing import List, Optional
+
+# Files copied into a worker's scratch directory before a job (read back by LaTeX)
+# and out of it afterwards (the job's outputs)
+JOB_INPUT_EXTENSIONS = (".aux", ".out")
+JOB_OUTPUT_EXTENSIONS = (".pdf", ".log", ".aux", ".out")
+
+# Seconds to wait for an idle worker before giving up and letting the caller fall back
+WORKER_ACQUIRE_TIMEOUT_SECONDS = 5.0
+
+
+def kill_process_group(process: subprocess.Popen) -> None:
+    """
+    Kills a process started with start_new_session=True together with anything it spawned,
+    then reaps it.
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+    process.communicate()
+
+
+class _TexWorker:
+    """One pre-started TeX process and its scratch directory."""
+
+    def __init__(self, cmd: List[str], scratch_dir: str):
+        self.scratch_dir = scratch_dir
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=scratch_dir,
+            start_new_session=True  # Own process group, so a timed-out job can be killed as a whole
+        )
+        # Make TeX load its format now and then wait for the job on stdin
+        self.process.stdin.write("\\relax\n")
+        self.process.stdin.flush()
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def discard(self) -> None:
+        if self.is_alive():
+            kill_process_group(self.process)
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+
+
+class TexWorkerPool:
+    """
+    Keeps a fixed number of warm TeX processes ready to accept compile jobs.
+
+    Usage:
+        pool = TexWorkerPool(size=4, fmt_path=fmt_path)
+        if pool.start():
+            result = pool.run_pass("output/resume1.tex", "output")
+        pool.close()
+
+    run_pass() returns None whenever the pool cannot take the job, so callers can
+    fall back to a one-shot pdflatex run.
+    """
+
+    def __init__(self, size: int, engine: str = "pdflatex", fmt_path: Optional[str] = None):
+        self.size = size
+        self.engine = engine
+        self.fmt_path = fmt_path
+        self._idle: "queue.Queue[_TexWorker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._running = False
+
+    def _worker_cmd(self, scratch_dir: str) -> List[str]:
+        cmd = [
+            self.engine,
+            # Scroll mode lets TeX wait at the '*' prompt after the warm-up line;
+            # each job switches itself to nonstop mode
+            "-interaction=scrollmode",
+            f"-output-directory={scratch_dir}",
+        ]
+        if self.fmt_path:
+            cmd.append(f"-fmt={self.fmt_path}")
+        return cmd
+
+    def _spawn(self) -> bool:
+        scratch_dir = tempfile.mkdtemp(prefix="texworker-")
+        try:
+            worker = _TexWorker(self._worker_cmd(scratch_dir), scratch_dir)
+        except OSError as e:
+            print(f"Could not start TeX worker: {e}")
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+            return False
+        self._idle.put(worker)
+        return True
+
+    def start(self) -> bool:
+        """
+        Starts the pool's workers.
+        Returns:
+            True if every worker started, False otherwise (the pool is then left stopped).
+        """
+        with self._lock:
+            if self._running:
+                return True
+            self._running = True
+            for _ in range(self.size):
+                if not self._spawn():
+                    self._running = False
+                    break
+        if not self._running:
+            self.close()
+            return False
+        print(f"Started {self.size} warm TeX worker(s).")
+        return True
+
+    def _acquire(self) -> Optional[_TexWorker]:
+        while True:
+            try:
+                worker = self._idle.get(timeout=WORKER_ACQUIRE_TIMEOUT_SECONDS)
+            except queue.Empty:
+                return None
+            with self._lock:
+                if not self._running:
+                    worker.discard()
+                    return None
+                # Replace the worker right away so the replacement warms up during this job
+                self._spawn()
+            if worker.is_alive():
+                return worker
+            worker.discard()
+
+    def run_pass(self, tex_filepath: str, output_dir: str, timeout: Optional[float] = None) -> Optional[subprocess.CompletedProcess]:
+        """
+        Runs one TeX pass over tex_filepath on a warm worker.
+
+        Auxiliary files from earlier passes are copied into the worker first, and the
+        job's outputs (.pdf, .log, .aux, .out) are copied to output_dir afterwards, so
+        the result is interchangeable with a one-shot pdflatex run.
+
+        Args:
+            tex_filepath: The .tex file to typeset.
+            output_dir: Directory the outputs should end up in.
+            timeout: Seconds the pass may take; None waits indefinitely.
+
+        Returns:
+            The completed process, or None if the pool is not running or no worker
+            became available.
+
+        Raises:
+            subprocess.TimeoutExpired: If the pass exceeded timeout. The worker's process
+                group has been killed by then.
+        """
+        if not self._running:
+            return None
+        worker = self._acquire()
+        if worker is None:
+            return None
+
+        filename = os.path.splitext(os.path.basename(tex_filepath))[0]
+        try:
+            for ext in JOB_INPUT_EXTENSIONS:
+                src = os.path.join(output_dir, f"{filename}{ext}")
+                if os.path.exists(src):
+                    shutil.copy2(src, os.path.join(worker.scratch_dir, f"{filename}{ext}"))
+
+            tex_path = os.path.abspath(tex_filepath).replace(os.sep, "/")
+            try:
+                stdout, stderr = worker.process.communicate(f"\\nonstopmode\\input{{{tex_path}}}\n", timeout=timeout)
+            except subprocess.TimeoutExpired:
+                kill_process_group(worker.process)
+                raise
+
+            for ext in JOB_OUTPUT_EXTENSIONS:
+                src = os.path.join(worker.scratch_dir, f"{filename}{ext}")
+                if os.path.exists(src):
+                    shutil.copy2(src, os.path.join(output_dir, f"{filename}{ext}"))
+            return subprocess.CompletedProcess(worker.process.args, worker.process.returncode, stdout, stderr)
+        finally:
+            worker.discard()
+
+    def close(self) -> None:
+        """Stops all idle workers and removes their scratch directories."""
+        with self._lock:
+            self._running = False
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.discard()